@@ -15,6 +15,9 @@ from agent_world.systems.perception.line_of_sight import has_line_of_sight
 
 logger = logging.getLogger(__name__)
 
+# Nearest living candidates checked for line of sight before a full scan
+_TARGET_CANDIDATES = 16
+
 class ArrowShot(Ability):
     """Shoot the nearest visible target or a specified target and consume one ammo item."""
 
@@ -48,14 +51,34 @@ class ArrowShot(Ability):
                 return False
             return has_line_of_sight(caster_pos, target_pos, self.range_val)
         else: # Auto-target if no target_id
-            for ent_id in list(em.all_entities.keys()):
-                if ent_id == caster_id: continue
+            return self._nearest_target(caster_id, caster_pos, world) is not None
+
+    def _nearest_target(self, caster_id: int, caster_pos: Position, world: Any) -> Optional[int]:
+        """Return the nearest living entity in range and line of sight."""
+
+        cm = world.component_manager
+        index = getattr(world, "spatial_index", None)
+        if index is not None and hasattr(index, "k_nearest"):
+            found, _dist = index.k_nearest(
+                [(caster_pos.x, caster_pos.y)],
+                _TARGET_CANDIDATES,
+                filter=CombatSystem.living_filter(cm),
+                exclude=[caster_id],
+                max_radius=self.range_val,
+            )
+            candidates = [ent_id for ent_id in found[0].tolist() if ent_id != -1]
+            for ent_id in candidates:
                 other_pos = cm.get_component(ent_id, Position)
-                other_health = cm.get_component(ent_id, Health)
-                if other_pos and other_health and other_health.cur > 0:
-                    if has_line_of_sight(caster_pos, other_pos, self.range_val):
-                        return True # Found a potential target
-            return False
+                if other_pos is not None and has_line_of_sight(caster_pos, other_pos, self.range_val):
+                    return ent_id
+            if len(candidates) < _TARGET_CANDIDATES:
+                return None
+        for ent_id, other_pos, other_health in sorted(cm.query(Position, Health)):
+            if ent_id == caster_id: continue
+            if other_health.cur > 0:
+                if has_line_of_sight(caster_pos, other_pos, self.range_val):
+                    return ent_id
+        return None
 
 
     def execute(self, caster_id: int, world: Any, target_id: Optional[int] = None) -> None:
@@ -76,15 +99,7 @@ class ArrowShot(Ability):
         actual_target_to_attack = target_id
 
         if actual_target_to_attack is None: # Auto-select if no target_id given
-            # Basic auto-targeting: first valid entity in LOS and range
-            for ent_id in list(em.all_entities.keys()):
-                if ent_id == caster_id: continue
-                other_pos = cm.get_component(ent_id, Position)
-                other_health = cm.get_component(ent_id, Health)
-                if other_pos and other_health and other_health.cur > 0:
-                    if has_line_of_sight(caster_pos, other_pos, self.range_val):
-                        actual_target_to_attack = ent_id
-                        break
+            actual_target_to_attack = self._nearest_target(caster_id, caster_pos, world)
         
         if actual_target_to_attack is None:
             logger.warning(
@@ -21,12 +21,22 @@ def _attack_adjacent(agent_id: int, world: Any) -> Optional[str]:
     my_pos = cm.get_component(agent_id, Position)
     if my_pos is None:
         return None
-    for other_id in list(em.all_entities.keys()):
+    index = getattr(world, "spatial_index", None)
+    if index is not None and hasattr(index, "k_nearest"):
+        # Melee range is one tile, so only the nearest living neighbour matters
+        found, _dist = index.k_nearest(
+            [(my_pos.x, my_pos.y)],
+            1,
+            filter=CombatSystem.living_filter(cm),
+            exclude=[agent_id],
+            max_radius=1,
+        )
+        target = int(found[0, 0])
+        return f"USE_ABILITY MeleeStrike {target}" if target != -1 else None
+    for other_id, other_pos, other_hp in sorted(cm.query(Position, Health)):
         if other_id == agent_id:
             continue
-        other_pos = cm.get_component(other_id, Position)
-        other_hp = cm.get_component(other_id, Health)
-        if other_pos and other_hp and other_hp.cur > 0:
+        if other_hp.cur > 0:
             if CombatSystem._in_melee_range(my_pos, other_pos):
                 return f"USE_ABILITY MeleeStrike {other_id}"
     return None
@@ -6,19 +6,21 @@ from __future__ import annotations
 
 import json
 from dataclasses import asdict, is_dataclass
-from typing import Any, List, Set, Dict, Optional 
+from typing import AbstractSet, Any, List, Set, Dict, Optional 
 
 import threading
 import asyncio
 import logging
 
 from ...core.world import World
+from ...core.column_store import ColumnComponent
 from ...core.components.position import Position
 from ...core.components.health import Health 
 from ...core.components.inventory import Inventory
 from ...core.components.ai_state import AIState
 from ...core.components.role import RoleComponent
 from ...core.components.perception_cache import PerceptionCache
+from ...core.spatial.layers import AGENT_LAYER, ITEM_LAYER
 from ...systems.interaction.pickup import Tag
 from .llm_manager import LLMManager
 from ...systems.ability.ability_system import AbilitySystem
@@ -48,7 +50,7 @@ def _get_visible_goal_item(
             if visible_eid == goal_item_id and em.has_entity(visible_eid):
                 v_pos = cm.get_component(visible_eid, Position)
                 v_tag = cm.get_component(visible_eid, Tag)
-                if v_pos and v_tag and v_tag.name == "item":
+                if v_pos and v_tag and ITEM_LAYER in _layers_of(world, visible_eid, cm):
                     return {
                         "id": visible_eid,
                         "position": (v_pos.x, v_pos.y),
@@ -58,6 +60,25 @@ def _get_visible_goal_item(
     return None
 
 
+def _layers_of(world: World, entity_id: int, cm: Any) -> AbstractSet[str]:
+    """Return the spatial layers of ``entity_id``.
+
+    Falls back to deriving them from components when the world's index
+    keeps no agent layer, i.e. no :class:`LayerBinding` maintains it.
+    """
+    index = getattr(world, "spatial_index", None)
+    if index is not None and hasattr(index, "has_layer") and index.has_layer(AGENT_LAYER):
+        return index.layers_of(entity_id)
+    layers: Set[str] = set()
+    tag = cm.get_component(entity_id, Tag)
+    if tag is not None:
+        layers.add(tag.name)
+    health = cm.get_component(entity_id, Health)
+    if cm.get_component(entity_id, AIState) is not None and (health is None or health.cur > 0):
+        layers.add(AGENT_LAYER)
+    return layers
+
+
 def _detect_blocking_obstacle(
     agent_pos: Position, goal_pos: Position
 ) -> Optional[tuple[tuple[int, int], str]]:
@@ -104,6 +125,7 @@ def _normalize(obj: Any) -> Any:
             except TypeError: # pragma: no cover
                 if hasattr(obj, "__dict__"): return {str(k): _normalize(v) for k, v in vars(obj).items() if not str(k).startswith("_")}
                 return f"<UnserializableDataclass id:{obj_id} type:{type(obj).__name__}>"
+        elif isinstance(obj, ColumnComponent): return obj.as_dict()
         elif isinstance(obj, dict): return {str(k): _normalize(v) for k, v in obj.items()}
         elif isinstance(obj, (list, tuple, set)): return [_normalize(v) for v in list(obj)]
         elif isinstance(obj, World): return {"type": "WorldSummary", "size": obj.size, "current_tick": obj.time_manager.tick_counter if obj.time_manager else -1}
@@ -274,10 +296,10 @@ Your Action to address the CRITICAL SITUATION:"""
             if not em.has_entity(visible_eid): continue
             entity_info: Dict[str, Any] = {"id": visible_eid}
             v_pos = cm.get_component(visible_eid, Position); v_health = cm.get_component(visible_eid, Health)
-            v_aistate_comp = cm.get_component(visible_eid, AIState); v_tag = cm.get_component(visible_eid, Tag)
+            v_layers = _layers_of(world, visible_eid, cm); v_tag = cm.get_component(visible_eid, Tag)
             if v_pos: entity_info["position"] = f"({v_pos.x}, {v_pos.y})"
             if v_health: entity_info["health"] = f"{v_health.cur}/{v_health.max}"
-            if v_aistate_comp: entity_info["type"] = "npc"
+            if AGENT_LAYER in v_layers: entity_info["type"] = "npc"
             if v_tag: entity_info["type"] = "item"; entity_info["tag_name"] = v_tag.name 
             if "type" not in entity_info: entity_info["type"] = "unknown_entity"
             visible_entities_and_items_info_standard.append(entity_info)
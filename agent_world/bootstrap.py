@@ -0,0 +1,233 @@
+"""World construction shared by the GUI entry point and headless runs.
+
+Nothing here imports pygame or the GUI package, so
+:mod:`agent_world.run` can build a world on machines without a display.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import logging
+
+from dotenv import load_dotenv
+
+from .config import load_config
+from .core.world import World
+from .core.entity_manager import EntityManager
+from .core.component_manager import ComponentManager
+from .core.time_manager import TimeManager
+from .systems.ai.actions import ActionQueue
+from .core.systems_manager import SystemsManager
+from .systems.movement.physics_system import PhysicsSystem
+from .systems.movement.movement_system import MovementSystem
+from .systems.movement.pathfinding import OBSTACLES, set_path_search
+from .systems.movement.hierarchical import HIERARCHY_MIN_SIZE, HierarchicalPathfinder
+from .systems.perception.perception_system import PerceptionSystem as VisibilityPerceptionSystem
+from .systems.ai.perception_system import EventPerceptionSystem
+from .systems.combat.combat_system import CombatSystem
+from .systems.interaction.pickup import PickupSystem, Tag
+from .systems.interaction.trading import TradingSystem
+from .systems.interaction.stealing import StealingSystem
+from .systems.interaction.crafting import CraftingSystem
+from .systems.ability.ability_system import AbilitySystem
+from .systems.ai.ai_reasoning_system import AIReasoningSystem, RawActionCollector
+from .systems.ai.behavior_tree_system import BehaviorTreeSystem
+from .ai.behaviors.creature_bt import build_creature_tree
+from .ai.angel.system import get_angel_system
+
+try:
+    from .systems.ai.action_execution_system import ActionExecutionSystem
+except ImportError:
+    ActionExecutionSystem = None # Should not happen with correct file structure
+
+from .ai.llm.llm_manager import LLMManager
+from .persistence.save_load import load_world
+from .core.spatial.spatial_index import SpatialGrid
+from .core.spatial.cell_tuning import CellSizeTuner
+from .core.spatial.layers import AGENT_LAYER, ITEM_LAYER, LayerBinding, is_alive
+from .core.components.ai_state import AIState
+from .core.components.position import position_arrays
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAVE_PATH = Path("saves/world_state.json.gz")
+
+
+def bootstrap(config_path: str | Path = Path("config.yaml")) -> World:
+    env_path = Path(".env")
+    if env_path.exists(): load_dotenv(env_path)
+
+    actual_config_path = Path(config_path)
+    cfg = load_config(actual_config_path)
+
+    size = cfg.world.size
+    tick_rate = cfg.world.tick_rate
+    paused_timeout = cfg.world.paused_for_angel_timeout_seconds
+
+    world = World(size)
+    world.paused_for_angel_timeout_seconds = paused_timeout
+    logger.info("[Bootstrap] Angel pause timeout set to %ss", paused_timeout)
+    # Pools are sized for the configured entity cap up front
+    world.entity_manager = EntityManager(max_entities=cfg.world.max_entities)
+    world.component_manager = ComponentManager(capacity=cfg.world.max_entities)
+    world.time_manager = TimeManager(tick_rate)
+    world.spatial_index = SpatialGrid(cell_size=cfg.world.spatial_cell_size)
+    # Size the obstacle bitmap to the map so searches never have to grow it
+    OBSTACLES.resize(size)
+    # Large maps answer a_star through the cluster hierarchy
+    cluster_size = cfg.world.path_cluster_size
+    if cluster_size and max(size) >= HIERARCHY_MIN_SIZE:
+        world.path_hierarchy = HierarchicalPathfinder(OBSTACLES, size, cluster_size)
+        set_path_search(world.path_hierarchy.path)
+        logger.info("[Bootstrap] Hierarchical pathfinding with %s-tile clusters", cluster_size)
+    else:
+        world.path_hierarchy = None
+        set_path_search(None)
+    # Tagged entities land in a layer named after the tag, living AI agents in "agent"
+    world.spatial_layers = LayerBinding(
+        world.spatial_index,
+        {Tag: lambda tag: tag.name, AIState: lambda _state: AGENT_LAYER},
+        layers=(ITEM_LAYER, AGENT_LAYER),
+        guards={AGENT_LAYER: is_alive},
+    )
+    world.spatial_layers.bind(world.component_manager)
+
+    world.action_queue = ActionQueue()
+    logger.info("[Bootstrap] world.action_queue initialized: %s", world.action_queue is not None)
+    world.raw_actions_with_actor = RawActionCollector(world.action_queue)
+    world.fps_enabled = False
+    world.gui_enabled = True # GUI enabled by default
+
+    llm_api_key = os.getenv("OPENROUTER_API_KEY")
+    llm_model = os.getenv("OPENROUTER_MODEL")
+    llm = LLMManager(
+        api_key=llm_api_key,
+        model=llm_model,
+        llm_config=cfg.llm,
+    )
+    logger.info(
+        "[Bootstrap] LLM decision model: %s, Angel model: %s",
+        llm.agent_decision_model,
+        llm.angel_generation_model,
+    )
+
+    paths_cfg = cfg.paths
+    if paths_cfg:
+        world.paths = paths_cfg
+        logger.info("[Bootstrap] Custom paths configuration loaded")
+    world.llm_manager_instance = llm
+    if llm.mode == "live" and world.llm_manager_instance and not llm.offline:
+        world.llm_manager_instance.start_processing_loop(world)
+
+
+    world.systems_manager = SystemsManager(max_workers=cfg.world.system_workers)
+    sm = world.systems_manager
+    physics_sys = PhysicsSystem(world) # Renamed to avoid conflict with Physics component
+    movement_sys = MovementSystem(world) # Renamed
+    perception_cfg = getattr(cfg, "perception", {}) or {}
+    view_radius = int(perception_cfg.get("view_radius", 10))
+    perception_sys = VisibilityPerceptionSystem(world, view_radius=view_radius)
+    event_perception_sys = EventPerceptionSystem(world)
+    combat_sys = CombatSystem(world)  # Renamed
+    pickup_sys = PickupSystem(world) # Renamed
+    trading_sys = TradingSystem(world) # Renamed
+    stealing_sys = StealingSystem(world) # Renamed
+    crafting_sys = CraftingSystem(world)  # Renamed
+    ability_sys = AbilitySystem(world) # Renamed
+    ai_reasoning_sys = AIReasoningSystem(world, world.llm_manager_instance, world.raw_actions_with_actor) # Renamed
+
+    sm.register(physics_sys)
+    sm.register(movement_sys)
+    behavior_tree_system = BehaviorTreeSystem(world)
+    behavior_tree_system.register_tree("creature", build_creature_tree())
+    sm.register(behavior_tree_system)
+    world.behavior_tree_system_instance = behavior_tree_system
+    sm.register(perception_sys)
+    sm.register(event_perception_sys)
+    sm.register(combat_sys)
+    world.combat_system_instance = combat_sys
+    sm.register(pickup_sys)
+    sm.register(trading_sys)
+    sm.register(stealing_sys)
+    sm.register(crafting_sys)
+    sm.register(ability_sys) # AbilitySystem needs to be registered
+    if not hasattr(world, "ability_system_instance"):
+        world.ability_system_instance = ability_sys
+    angel_system = get_angel_system(world)
+    sm.register(angel_system)
+    sm.register(ai_reasoning_sys)
+
+    if cfg.world.spatial_autotune:
+        # Perception issues the bulk of the radius queries
+        cell_tuner = CellSizeTuner(world, radii=(view_radius,))
+        sm.register(cell_tuner)
+        world.cell_size_tuner = cell_tuner
+
+    if ActionExecutionSystem is not None:
+        action_execution_system_instance = ActionExecutionSystem(world, world.action_queue, combat_sys)
+        sm.register(action_execution_system_instance)
+    else:
+        logger.critical("[Bootstrap] ActionExecutionSystem is None after import attempt.")
+
+    for system in list(sm):
+        interval = cfg.world.system_intervals.get(type(system).__name__)
+        if interval:
+            sm.set_schedule(system, interval)
+            logger.info("[Bootstrap] %s runs every %s ticks", type(system).__name__, interval)
+
+
+    world.generate_resources(seed=12345)
+    logger.info("[Bootstrap] Generated resources on the map.")
+
+    return world
+
+
+def load_or_bootstrap(
+    save_path: str | Path = DEFAULT_SAVE_PATH,
+    config_path: str | Path = Path("config.yaml"),
+) -> World:
+    path = Path(save_path)
+    actual_config_path = Path(config_path)
+    if not actual_config_path.is_file():
+        project_root_config = Path(__file__).resolve().parents[1] / "config.yaml"
+        if project_root_config.is_file(): actual_config_path = project_root_config
+    
+    world_shell = bootstrap(actual_config_path) 
+
+    if path.is_file():
+        logger.info("Save file found at %s. Attempting to load state.", path)
+        try:
+            loaded_world_from_file = load_world(path)
+            
+            max_entities = world_shell.entity_manager.max_entities
+            loaded_world_from_file.entity_manager.set_max_entities(max_entities)
+            loaded_world_from_file.component_manager.set_capacity(max_entities)
+            world_shell.set_managers(
+                loaded_world_from_file.entity_manager, loaded_world_from_file.component_manager
+            )
+            world_shell.tile_map = loaded_world_from_file.tile_map
+            layers = getattr(world_shell, "spatial_layers", None)
+            if layers is not None:
+                layers.bind(world_shell.component_manager)
+            if loaded_world_from_file.time_manager:
+                 world_shell.time_manager.tick_counter = loaded_world_from_file.time_manager.tick_counter
+            if hasattr(loaded_world_from_file, 'gui_enabled'):
+                world_shell.gui_enabled = loaded_world_from_file.gui_enabled
+                logger.info("[Load] GUI enabled state loaded from save: %s", world_shell.gui_enabled)
+            
+            if world_shell.component_manager:
+                world_shell.spatial_index.rebuild(*position_arrays(world_shell.component_manager))
+            else:
+                world_shell.spatial_index.rebuild([], [], [])
+            
+            logger.info("Successfully loaded state from %s into world structure.", path)
+            return world_shell
+        except Exception as exc:
+            logger.error("Error loading world from %s: %s. Using freshly bootstrapped world.", path, exc)
+            return world_shell
+    else:
+        return world_shell
+
+
+__all__ = ["bootstrap", "load_or_bootstrap", "DEFAULT_SAVE_PATH"]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -20,6 +20,12 @@ class WorldConfig:
     tick_rate: float = 10.0
     max_entities: int = 8000
     paused_for_angel_timeout_seconds: int = 60
+    system_workers: int = 1
+    spatial_cell_size: int = 1
+    spatial_autotune: bool = True
+    path_cluster_size: int = 32
+    # System class name -> run every N ticks; systems not listed run each tick
+    system_intervals: Dict[str, int] = field(default_factory=dict)
 
 
 @dataclass
@@ -52,6 +58,14 @@ def _parse_config(data: dict[str, Any]) -> Config:
         paused_for_angel_timeout_seconds=int(
             world_data.get("paused_for_angel_timeout_seconds", 60)
         ),
+        system_workers=int(world_data.get("system_workers", 1)),
+        spatial_cell_size=int(world_data.get("spatial_cell_size", 1)),
+        spatial_autotune=bool(world_data.get("spatial_autotune", True)),
+        path_cluster_size=int(world_data.get("path_cluster_size", 32)),
+        system_intervals={
+            str(name): int(every)
+            for name, every in (world_data.get("system_intervals") or {}).items()
+        },
     )
 
     llm_data = data.get("llm", {})
@@ -0,0 +1,189 @@
+"""Struct-of-arrays storage for small numeric components.
+
+Components deriving from :class:`ColumnComponent` keep their fields in
+contiguous NumPy arrays owned by a :class:`ColumnStore` once attached to a
+:class:`~agent_world.core.component_manager.ComponentManager`. The component
+instance itself becomes a light view onto its row, so attribute access such
+as ``phys.vx`` keeps working while systems may operate on whole columns.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, ClassVar, Dict, List, Tuple
+
+import numpy as np
+
+
+def _column_property(index: int, name: str) -> property:
+    def fget(self: "ColumnComponent") -> Any:
+        store = self._store
+        if store is None:
+            return self._slot[index]
+        return store._columns[name][self._slot].item()
+
+    def fset(self: "ColumnComponent", value: Any) -> None:
+        store = self._store
+        if store is None:
+            self._slot[index] = self._coerce(index, value)
+        else:
+            row = self._slot
+            store._columns[name][row] = value
+            if store.on_write is not None:
+                store.on_write(int(store._entities[row]))
+
+    return property(fget, fset)
+
+
+class ColumnComponent:
+    """Base class for components stored column-wise.
+
+    Subclasses list their fields in ``_fields`` and the matching NumPy dtypes
+    in ``_dtypes``. Detached instances hold their values locally; attached
+    instances read and write their store row. ``_slot`` is the row index
+    while attached and the list of local values otherwise, which keeps each
+    view at two slots.
+    """
+
+    __slots__ = ("_store", "_slot")
+
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _dtypes: ClassVar[Tuple[Any, ...]] = ()
+    # Hashing follows dataclass semantics for mutable components.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for index, name in enumerate(cls._fields):
+            setattr(cls, name, _column_property(index, name))
+
+    def __init__(self, *values: Any) -> None:
+        self._store: ColumnStore | None = None
+        self._slot: Any = [self._coerce(i, v) for i, v in enumerate(values)]
+
+    @classmethod
+    def _coerce(cls, index: int, value: Any) -> Any:
+        """Convert ``value`` the way its column would store it."""
+        return np.dtype(cls._dtypes[index]).type(value).item()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the field values as plain Python objects."""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def _snapshot(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._snapshot() == other._snapshot()  # type: ignore[attr-defined]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return (type(self), self._snapshot())
+
+
+class ColumnStore:
+    """Contiguous NumPy columns holding every instance of one component class.
+
+    Row ``i`` belongs to ``entity_ids()[i]``. Removing a row moves the last
+    row into its place, so the first ``size`` entries of each column are
+    always exactly the live components. Rows are only reachable through
+    their views; there is no per-entity lookup table.
+    """
+
+    def __init__(self, component_cls: type, capacity: int = 64) -> None:
+        self.component_cls = component_cls
+        self.size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in zip(component_cls._fields, component_cls._dtypes)
+        }
+        self._entities = np.zeros(capacity, dtype=np.int64)
+        self._views: List[ColumnComponent] = []
+        # Called with the entity id after a write through a view. Bulk
+        # column writes bypass it and must be reported by the writer.
+        self.on_write: Callable[[int], None] | None = None
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+    def column(self, name: str) -> np.ndarray:
+        """Return a writable view of the live values of field ``name``."""
+        return self._columns[name][: self.size]
+
+    def entity_ids(self) -> np.ndarray:
+        """Return the entity id owning each live row."""
+        return self._entities[: self.size]
+
+    def row_of(self, view: ColumnComponent) -> int | None:
+        """Return the row backing ``view``, or ``None`` if stored elsewhere."""
+        if view._store is not self:
+            return None
+        return view._slot
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ------------------------------------------------------------------
+    # Membership
+    # ------------------------------------------------------------------
+    def attach(self, entity_id: int, view: ColumnComponent) -> None:
+        """Move ``view``'s values into a new row owned by ``entity_id``."""
+        if view._store is not None:
+            view._store.release(view)
+        row = self.size
+        if row == len(self._entities):
+            self._grow()
+        for name, value in zip(view._fields, view._slot):
+            self._columns[name][row] = value
+        self._entities[row] = entity_id
+        self._views.append(view)
+        self.size = row + 1
+        view._store = self
+        view._slot = row
+
+    def release(self, view: ColumnComponent) -> None:
+        """Detach ``view`` from its row, keeping its current values."""
+        if view._store is not self:
+            return
+        row = view._slot
+        view._store = None
+        view._slot = [self._columns[name][row].item() for name in view._fields]
+
+        last = self.size - 1
+        if row != last:
+            moved = self._views[last]
+            for column in self._columns.values():
+                column[row] = column[last]
+            self._entities[row] = self._entities[last]
+            self._views[row] = moved
+            moved._slot = row
+        self._views.pop()
+        self.size = last
+
+    def release_all(self) -> None:
+        """Detach every view, leaving the store empty."""
+        while self._views:
+            self.release(self._views[-1])
+
+    def reserve(self, capacity: int) -> None:
+        """Make room for at least ``capacity`` rows without further growth."""
+        if capacity > len(self._entities):
+            self._grow(capacity)
+
+    def _grow(self, capacity: int | None = None) -> None:
+        if capacity is None:
+            capacity = max(1, len(self._entities)) * 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            self._columns[name] = grown
+        grown_ids = np.zeros(capacity, dtype=np.int64)
+        grown_ids[: self.size] = self._entities[: self.size]
+        self._entities = grown_ids
+
+
+__all__ = ["ColumnComponent", "ColumnStore"]
@@ -0,0 +1,154 @@
+"""Deferred structural changes for systems."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterable, Iterator, Tuple, Type
+
+# Operation codes stored in the queue
+_CREATE = "create"
+_DESTROY = "destroy"
+_ADD = "add"
+_REMOVE = "remove"
+
+
+class CommandBuffer:
+    """Queue entity creation/destruction and component add/remove operations.
+
+    Systems record structural changes here instead of applying them while
+    iterating component queries. :class:`~agent_world.core.systems_manager.SystemsManager`
+    flushes the buffer after each system, applying operations in the order
+    they were queued. Systems running on worker threads record into
+    per-thread queues (see :meth:`capture`) which the manager merges in a
+    fixed order; ids for entities created there are assigned during the
+    merge, so they do not depend on thread timing.
+    """
+
+    def __init__(self, world: Any) -> None:
+        self.world = world
+        self._ops: Deque[Tuple[str, int, Any]] = deque()
+        self._local = threading.local()
+
+    def _queue(self) -> Deque[Tuple[str, int, Any]]:
+        ops = getattr(self._local, "ops", None)
+        return self._ops if ops is None else ops
+
+    # ------------------------------------------------------------------
+    # Recording API
+    # ------------------------------------------------------------------
+    def create_entity(self, *components: Any) -> int:
+        """Return an id for an entity created with ``components`` on flush.
+
+        Inside :meth:`capture` the id is a provisional negative number, valid
+        only for further calls on this buffer from the same system; the real
+        id is reserved when the captured queue is merged by :meth:`extend`.
+        """
+
+        ops = getattr(self._local, "ops", None)
+        if ops is None:
+            entity_id = self.world.entity_manager.reserve_entity()
+            self._ops.append((_CREATE, entity_id, components))
+            return entity_id
+        self._local.provisional -= 1
+        entity_id = self._local.provisional
+        ops.append((_CREATE, entity_id, components))
+        return entity_id
+
+    def destroy_entity(self, entity_id: int) -> None:
+        """Destroy ``entity_id`` on flush."""
+
+        self._queue().append((_DESTROY, entity_id, None))
+
+    def add_component(self, entity_id: int, component: Any) -> None:
+        """Attach ``component`` to ``entity_id`` on flush."""
+
+        self._queue().append((_ADD, entity_id, component))
+
+    def remove_component(self, entity_id: int, component_cls: Type[Any]) -> None:
+        """Detach ``component_cls`` from ``entity_id`` on flush."""
+
+        self._queue().append((_REMOVE, entity_id, component_cls))
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    @contextmanager
+    def capture(self) -> Iterator[Deque[Tuple[str, int, Any]]]:
+        """Record operations made on this thread into a private queue.
+
+        The yielded queue is handed back to :meth:`extend` once the caller
+        decides where its operations belong in the shared order.
+        """
+
+        previous = getattr(self._local, "ops", None), getattr(self._local, "provisional", 0)
+        ops: Deque[Tuple[str, int, Any]] = deque()
+        self._local.ops = ops
+        self._local.provisional = 0
+        try:
+            yield ops
+        finally:
+            self._local.ops, self._local.provisional = previous
+
+    def extend(self, ops: Iterable[Tuple[str, int, Any]]) -> None:
+        """Queue operations previously recorded under :meth:`capture`.
+
+        Provisional ids from :meth:`create_entity` are replaced by ids
+        reserved now, so creations are numbered in the order queues are
+        merged.
+        """
+
+        em = self.world.entity_manager
+        assigned: Dict[int, int] = {}
+        for op, entity_id, payload in ops:
+            if entity_id < 0:
+                if op == _CREATE:
+                    assigned[entity_id] = em.reserve_entity()
+                entity_id = assigned[entity_id]
+            self._ops.append((op, entity_id, payload))
+
+    # ------------------------------------------------------------------
+    # Application
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """Apply every queued operation in order and return how many ran.
+
+        Operations queued while flushing (e.g. by component hooks) are applied
+        in the same flush. Adds targeting an entity that no longer exists are
+        dropped rather than resurrecting it.
+        """
+
+        em = self.world.entity_manager
+        cm = self.world.component_manager
+        applied = 0
+        while self._ops:
+            op, entity_id, payload = self._ops.popleft()
+            applied += 1
+            if op == _CREATE:
+                em.create_entity(entity_id)
+                for component in payload:
+                    cm.add_component(entity_id, component)
+            elif op == _DESTROY:
+                em.destroy_entity(entity_id)
+            elif op == _ADD:
+                if em is None or em.has_entity(entity_id):
+                    cm.add_component(entity_id, payload)
+            elif op == _REMOVE:
+                cm.remove_component(entity_id, payload)
+        return applied
+
+    def clear(self) -> None:
+        """Drop queued operations without applying them.
+
+        Ids reserved by pending creations are released.
+        """
+
+        em = self.world.entity_manager
+        for op, entity_id, _payload in self._ops:
+            if op == _CREATE and em is not None:
+                em.destroy_entity(entity_id)
+        self._ops.clear()
+
+
+__all__ = ["CommandBuffer"]
@@ -1,19 +1,101 @@
 # Component Manager for ECS-style storage.
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Optional, Type, TypeVar
+from collections import deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Type, TypeVar
+
+from .column_store import ColumnComponent, ColumnStore
 
 T = TypeVar("T")
 
+# Callback signature for on_added/on_removed hooks: (entity_id, component)
+ComponentHook = Callable[[int, Any], None]
+
+# Number of ticks of change history kept for changed_since()
+DEFAULT_CHANGE_HISTORY = 64
+
+
+class _Archetype:
+    """Table of entities sharing exactly the same set of component names.
+
+    Components are stored column-wise so that ``columns[name][row]`` is the
+    component of ``entities[row]``. Rows are removed by swapping in the last
+    row, keeping every column dense.
+    """
+
+    __slots__ = ("key", "entities", "rows", "columns", "version")
+
+    def __init__(self, key: FrozenSet[str]) -> None:
+        self.key = key
+        # Bumped whenever rows are added or removed
+        self.version = 0
+        self.entities: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.columns: Dict[str, List[Any]] = {name: [] for name in key}
+
+    def append(self, entity_id: int, comps: Dict[str, Any]) -> None:
+        """Add ``entity_id`` using the matching entries of ``comps``."""
+        self.version += 1
+        self.rows[entity_id] = len(self.entities)
+        self.entities.append(entity_id)
+        for name, column in self.columns.items():
+            column.append(comps[name])
+
+    def remove(self, entity_id: int) -> None:
+        """Drop ``entity_id`` from the table."""
+        self.version += 1
+        row = self.rows.pop(entity_id)
+        last = len(self.entities) - 1
+        if row != last:
+            moved = self.entities[last]
+            self.entities[row] = moved
+            self.rows[moved] = row
+            for column in self.columns.values():
+                column[row] = column[last]
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+
+    def set(self, entity_id: int, name: str, component: Any) -> None:
+        """Replace the ``name`` component of ``entity_id`` in place."""
+        self.columns[name][self.rows[entity_id]] = component
+
 
 class ComponentManager:
     """Track components attached to entities and registered component classes."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        change_history: int = DEFAULT_CHANGE_HISTORY,
+        capacity: int | None = None,
+    ) -> None:
+        # Initial row capacity of column stores, e.g. ``max_entities``
+        self._capacity = capacity
+        # Entity manager sharing the component store, see bind_entity_manager
+        self._entity_manager: Any = None
         # Maps component class name to the class object
         self._registry: Dict[str, Type[Any]] = {}
         # Maps entity id to {component name: component instance}
         self._components: Dict[int, Dict[str, Any]] = {}
+        # Archetype tables keyed by the set of component names they hold
+        self._archetypes: Dict[FrozenSet[str], _Archetype] = {}
+        self._entity_archetype: Dict[int, _Archetype] = {}
+        # Cached archetype lists for previously issued queries
+        self._query_cache: Dict[FrozenSet[str], List[_Archetype]] = {}
+        # Reverse index: component name -> ids of entities owning it
+        self._entities_by_type: Dict[str, Set[int]] = {}
+        # Struct-of-arrays storage for ColumnComponent subclasses
+        self._column_stores: Dict[str, ColumnStore] = {}
+        # Hooks fired after a component is attached to / detached from an entity
+        self._added_hooks: Dict[str, List[ComponentHook]] = {}
+        self._removed_hooks: Dict[str, List[ComponentHook]] = {}
+        # Change feed: ids changed in the running tick, per component name,
+        # plus the sets of the most recent finished ticks.
+        self._pending_changes: Dict[str, Set[int]] = {}
+        self._change_history: Deque[Tuple[int, Dict[str, Set[int]]]] = deque()
+        self._change_history_len = change_history
+        # Tick of the newest history entry dropped so far, if any
+        self._evicted_tick: Optional[int] = None
 
     # ------------------------------------------------------------------
     # Registration API
@@ -32,17 +114,128 @@ class ComponentManager:
         self._registry.pop(name, None)
         # Unregistration hooks would be triggered here in future.
 
+    # ------------------------------------------------------------------
+    # Archetype helpers
+    # ------------------------------------------------------------------
+    def _archetype_for(self, key: FrozenSet[str]) -> _Archetype:
+        """Return the archetype table for ``key``, creating it if needed."""
+        arch = self._archetypes.get(key)
+        if arch is None:
+            arch = _Archetype(key)
+            self._archetypes[key] = arch
+            for query_key, matches in self._query_cache.items():
+                if query_key <= key:
+                    matches.append(arch)
+        return arch
+
+    def _reset_indexes(self) -> None:
+        """Drop archetype tables and per-type sets."""
+        self._archetypes.clear()
+        self._entity_archetype.clear()
+        self._query_cache.clear()
+        self._entities_by_type.clear()
+        for store in self._column_stores.values():
+            store.release_all()
+
+    def _attach_column(self, entity_id: int, name: str, component: Any) -> None:
+        """Place a column component's values into this manager's store."""
+        store = self._column_stores.get(name)
+        if store is None:
+            if self._capacity:
+                store = ColumnStore(type(component), capacity=self._capacity)
+            else:
+                store = ColumnStore(type(component))
+            store.on_write = lambda eid, name=name: self._note_change(name, eid)
+            self._column_stores[name] = store
+        store.attach(entity_id, component)
+
+    def _release_column(self, component: Any) -> None:
+        """Detach ``component`` from its column store, keeping its values."""
+        if isinstance(component, ColumnComponent) and component._store is not None:
+            component._store.release(component)
+
+    def _index_entity(self, entity_id: int, comps: Dict[str, Any]) -> None:
+        """Index components that were placed in the store directly."""
+        for name, comp in comps.items():
+            if name not in self._registry:
+                self.register_component(type(comp))
+            self._entities_by_type.setdefault(name, set()).add(entity_id)
+            if isinstance(comp, ColumnComponent):
+                self._attach_column(entity_id, name, comp)
+        self._move_entity(entity_id, comps)
+
+    def _move_entity(self, entity_id: int, comps: Dict[str, Any]) -> None:
+        """Re-file ``entity_id`` under the archetype matching ``comps``."""
+        old = self._entity_archetype.pop(entity_id, None)
+        if old is not None:
+            old.remove(entity_id)
+        if comps:
+            arch = self._archetype_for(frozenset(comps))
+            arch.append(entity_id, comps)
+            self._entity_archetype[entity_id] = arch
+
+    # ------------------------------------------------------------------
+    # Entity store binding
+    # ------------------------------------------------------------------
+    def bind_entity_manager(self, entity_manager: Any) -> None:
+        """Share ``entity_manager``'s entity store as the component store.
+
+        Afterwards each component lives in exactly one mapping, visible
+        through both managers, and ``entity_manager.destroy_entity`` clears
+        this manager's indexes. Components already held by either side are
+        kept; on conflict the ones attached here win. From then on
+        :meth:`add_component` ignores ids that are not alive.
+        """
+        store = entity_manager._entity_components
+        if store is self._components and entity_manager._component_manager is self:
+            return
+        if store is not self._components:
+            own = self._components
+            self._reset_indexes()
+            self._components = store
+            for entity_id, comps in store.items():
+                self._index_entity(entity_id, comps)
+            for entity_id, comps in own.items():
+                self._components.setdefault(entity_id, {})
+                for comp in comps.values():
+                    self.add_component(entity_id, comp)
+        entity_manager._component_manager = self
+        self._entity_manager = entity_manager
+
     # ------------------------------------------------------------------
     # Component access API
     # ------------------------------------------------------------------
     def add_component(self, entity_id: int, component: Any) -> None:
-        """Attach a component instance to an entity."""
+        """Attach a component instance to an entity.
+
+        With an entity manager bound, destroyed or never created ids are
+        ignored, as queued adds are, so they cannot come back to life.
+        """
+        if self._entity_manager is not None and entity_id not in self._components:
+            return
         name = type(component).__name__
         if name not in self._registry:
             # Auto-register unknown component classes
             self.register_component(type(component))
-        self._components.setdefault(entity_id, {})[name] = component
-        # Future hook: on_component_added(entity_id, component)
+        comps = self._components.setdefault(entity_id, {})
+        replacing = name in comps
+        previous = comps.get(name)
+        if isinstance(component, ColumnComponent) and previous is not component:
+            self._release_column(previous)
+            self._attach_column(entity_id, name, component)
+        comps[name] = component
+        arch = self._entity_archetype.get(entity_id)
+        if replacing and arch is not None:
+            arch.set(entity_id, name, component)
+        else:
+            self._move_entity(entity_id, comps)
+        if not replacing:
+            self._entities_by_type.setdefault(name, set()).add(entity_id)
+        self._note_change(name, entity_id)
+        if previous is not component:
+            if replacing:
+                self._fire(self._removed_hooks, name, entity_id, previous)
+            self._fire(self._added_hooks, name, entity_id, component)
 
     def get_component(self, entity_id: int, component_cls: Type[T]) -> Optional[T]:
         """Return a component of the given class for an entity, if present."""
@@ -56,10 +249,191 @@ class ComponentManager:
         comps = self._components.get(entity_id)
         if not comps:
             return None
-        comp = comps.pop(component_cls.__name__, None)
-        # Future hook: on_component_removed(entity_id, comp)
+        name = component_cls.__name__
+        comp = comps.pop(name, None)
+        if comp is not None:
+            self._release_column(comp)
+            self._move_entity(entity_id, comps)
+            ids = self._entities_by_type.get(name)
+            if ids is not None:
+                ids.discard(entity_id)
+            self._note_change(name, entity_id)
+            self._fire(self._removed_hooks, name, entity_id, comp)
         return comp  # type: ignore[return-value]
 
+    def remove_entity(self, entity_id: int) -> None:
+        """Drop ``entity_id`` and all of its components from the store."""
+        comps = self._components.pop(entity_id, None)
+        if comps is None:
+            return
+        arch = self._entity_archetype.pop(entity_id, None)
+        if arch is not None:
+            arch.remove(entity_id)
+        for name, comp in comps.items():
+            self._release_column(comp)
+            ids = self._entities_by_type.get(name)
+            if ids is not None:
+                ids.discard(entity_id)
+            self._note_change(name, entity_id)
+        for name, comp in comps.items():
+            self._fire(self._removed_hooks, name, entity_id, comp)
+
     def components_for_entity(self, entity_id: int) -> Iterable[Any]:
         """Iterate over all components attached to an entity."""
         return self._components.get(entity_id, {}).values()
+
+    # ------------------------------------------------------------------
+    # Change tracking API
+    # ------------------------------------------------------------------
+    def on_added(self, component_cls: Type[Any], callback: ComponentHook) -> None:
+        """Call ``callback(entity_id, component)`` after ``component_cls`` is attached.
+
+        Replacing a component counts as removing the old instance and adding
+        the new one.
+        """
+        self._added_hooks.setdefault(component_cls.__name__, []).append(callback)
+
+    def on_removed(self, component_cls: Type[Any], callback: ComponentHook) -> None:
+        """Call ``callback(entity_id, component)`` after ``component_cls`` is detached."""
+        self._removed_hooks.setdefault(component_cls.__name__, []).append(callback)
+
+    def remove_hook(self, callback: ComponentHook) -> None:
+        """Unregister ``callback`` from every added/removed hook list."""
+        for hooks in (self._added_hooks, self._removed_hooks):
+            for callbacks in hooks.values():
+                while callback in callbacks:
+                    callbacks.remove(callback)
+
+    def mark_changed(self, entity_id: int, component_cls: Type[Any]) -> None:
+        """Record an in-place mutation of ``entity_id``'s ``component_cls``.
+
+        Adds, removals and attribute writes on column components are recorded
+        automatically; other components mutated in place need this call.
+        """
+        self._note_change(component_cls.__name__, entity_id)
+
+    def mark_changed_many(self, component_cls: Type[Any], entity_ids: Iterable[int]) -> None:
+        """Record in-place mutations for every id in ``entity_ids``."""
+        self._pending_changes.setdefault(component_cls.__name__, set()).update(entity_ids)
+
+    def end_tick(self, tick: int) -> None:
+        """Close the change window of ``tick``; later changes belong to the next tick."""
+        if not self._pending_changes:
+            return
+        self._change_history.append((tick, self._pending_changes))
+        self._pending_changes = {}
+        while len(self._change_history) > self._change_history_len:
+            self._evicted_tick = self._change_history.popleft()[0]
+
+    def changed_since(self, component_cls: Type[Any], tick: int) -> Optional[Set[int]]:
+        """Return ids whose ``component_cls`` changed after ``tick`` ended.
+
+        Changes made in the running tick are included, and so are entities
+        that lost the component. ``None`` means the retained history no
+        longer reaches back to ``tick`` and the caller should recompute from
+        scratch.
+        """
+        if self._evicted_tick is not None and tick < self._evicted_tick:
+            return None
+        name = component_cls.__name__
+        result = set(self._pending_changes.get(name, ()))
+        for change_tick, changes in reversed(self._change_history):
+            if change_tick <= tick:
+                break
+            ids = changes.get(name)
+            if ids:
+                result |= ids
+        return result
+
+    def _note_change(self, name: str, entity_id: int) -> None:
+        ids = self._pending_changes.get(name)
+        if ids is None:
+            ids = self._pending_changes[name] = set()
+        ids.add(entity_id)
+
+    @staticmethod
+    def _fire(
+        hooks: Dict[str, List[ComponentHook]], name: str, entity_id: int, component: Any
+    ) -> None:
+        for callback in hooks.get(name, ()):
+            callback(entity_id, component)
+
+    # ------------------------------------------------------------------
+    # Column storage
+    # ------------------------------------------------------------------
+    def set_capacity(self, capacity: int | None) -> None:
+        """Pre-size column stores for ``capacity`` entities, e.g. ``max_entities``."""
+        self._capacity = capacity
+        if capacity:
+            for store in self._column_stores.values():
+                store.reserve(capacity)
+
+    def columns(self, component_cls: Type[Any]) -> Optional[ColumnStore]:
+        """Return the column store backing ``component_cls``, if any.
+
+        Only :class:`ColumnComponent` subclasses are stored column-wise; the
+        store appears once the first instance is attached.
+        """
+        return self._column_stores.get(component_cls.__name__)
+
+    # ------------------------------------------------------------------
+    # Query API
+    # ------------------------------------------------------------------
+    def entities_with(self, *component_types: Type[Any]) -> Set[int]:
+        """Return ids of entities owning every one of ``component_types``.
+
+        The per-type sets are intersected smallest first, so the cost is
+        bounded by the rarest requested component. The result is a new set
+        that callers may keep or mutate.
+        """
+        sets: List[Set[int]] = []
+        for cls in component_types:
+            ids = self._entities_by_type.get(cls.__name__)
+            if not ids:
+                return set()
+            sets.append(ids)
+        if not sets:
+            return set()
+        sets.sort(key=len)
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def query(self, *component_types: Type[Any]) -> Iterator[Tuple[Any, ...]]:
+        """Yield ``(entity_id, comp1, comp2, ...)`` for entities owning all types.
+
+        Only archetypes whose component set covers ``component_types`` are
+        visited, so entities lacking any requested component cost nothing.
+        Rows are read in place without copying, so structural changes must
+        not happen while iterating: queue them on ``world.command_buffer``.
+        Adding or removing components that moves an entity into or out of a
+        visited archetype raises ``RuntimeError``.
+
+        Rows come in archetype row order, which removals reshuffle. Where
+        processing order matters, sort them: ``sorted(cm.query(...))``
+        orders by entity id, the first field of each row.
+        """
+        names = [cls.__name__ for cls in component_types]
+        key = frozenset(names)
+        matches = self._query_cache.get(key)
+        if matches is None:
+            matches = [arch for k, arch in self._archetypes.items() if key <= k]
+            self._query_cache[key] = matches
+        return self._iter_rows(matches, names)
+
+    @staticmethod
+    def _iter_rows(matches: List[_Archetype], names: List[str]) -> Iterator[Tuple[Any, ...]]:
+        for arch in matches:
+            if not arch.entities:
+                continue
+            version = arch.version
+            for row in zip(arch.entities, *(arch.columns[n] for n in names)):
+                yield row
+                if arch.version != version:
+                    raise RuntimeError(
+                        "Archetype changed during query iteration; "
+                        "queue structural changes on the command buffer"
+                    )
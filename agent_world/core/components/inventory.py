@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import Any, List
 
 
-@dataclass
+@dataclass(slots=True)
 class Inventory:
     """Container for carrying items."""
 
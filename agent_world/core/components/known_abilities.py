@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class KnownAbilitiesComponent:
     """Simple list of ability class names available to an entity."""
 
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import numpy as np
 
+from ..column_store import ColumnComponent
 
-@dataclass
-class Physics:
-    """Simple physics attributes for an entity."""
+
+class Physics(ColumnComponent):
+    """Simple physics attributes for an entity.
+
+    Stored column-wise; see :mod:`agent_world.core.column_store`.
+    """
+
+    __slots__ = ()
+    _fields = ("mass", "vx", "vy", "friction")
+    _dtypes = (np.float64, np.float64, np.float64, np.float64)
 
     mass: float
     vx: float
     vy: float
     friction: float
 
+    def __init__(self, mass: float, vx: float, vy: float, friction: float) -> None:
+        super().__init__(mass, vx, vy, friction)
+
 
 __all__ = ["Physics"]
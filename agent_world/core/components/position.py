@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Tuple
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Position:
     """Simple 2D coordinate."""
 
@@ -13,4 +16,18 @@ class Position:
     y: int
 
 
-__all__ = ["Position"]
+def position_arrays(component_manager: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(entity_ids, xs, ys)`` for every entity with a :class:`Position`.
+
+    The arrays are fresh int64 copies for vectorised consumers; writing to
+    them does not move any entity.
+    """
+    rows = [(eid, pos.x, pos.y) for eid, pos in component_manager.query(Position)]
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy()
+    table = np.array(rows, dtype=np.int64)
+    return table[:, 0], table[:, 1], table[:, 2]
+
+
+__all__ = ["Position", "position_arrays"]
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class RoleComponent:
     """Define an entity's role and related behaviour flags."""
 
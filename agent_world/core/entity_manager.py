@@ -2,39 +2,247 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Deque, Dict, List, Set
+
+# Entity ids pack a dense slot index into the low bits and a generation
+# counter into the high bits. Destroying an entity bumps the generation of its
+# slot, so an id held after destruction never matches the slot's next owner.
+INDEX_BITS = 20
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+def make_entity_id(index: int, generation: int) -> int:
+    """Return the entity id for slot ``index`` at ``generation``."""
+
+    return (generation << INDEX_BITS) | index
+
+
+def entity_index(entity_id: int) -> int:
+    """Return the dense slot index encoded in ``entity_id``."""
+
+    return entity_id & INDEX_MASK
+
+
+def entity_generation(entity_id: int) -> int:
+    """Return the generation counter encoded in ``entity_id``."""
+
+    return entity_id >> INDEX_BITS
+
+
+class EntityLimitError(RuntimeError):
+    """Raised when creating an entity would exceed ``max_entities``."""
 
 
 class EntityManager:
     """Simple entity manager maintaining entity/component mappings."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_entities: int | None = None) -> None:
+        # Cap on live plus reserved entities; ``None`` means unbounded.
+        self.max_entities: int | None = max_entities
+        # Highest slot index handed out so far; slot 0 is never used.
         self._next_id: int = 0
-        # Mapping of entity_id -> component_name -> component_instance
+        # Current generation per slot index. Pre-sized for ``max_entities``
+        # slots so spawn waves do not grow it; entries past ``_next_id`` are
+        # unused.
+        self._generations: List[int] = [0] * ((max_entities or 0) + 1)
+        # Slots released by destroy_entity, reused oldest first.
+        self._free_indices: Deque[int] = deque()
+        # Mapping of entity_id -> component_name -> component_instance.
+        # Shared with the ComponentManager once bound to it.
         self._entity_components: Dict[int, Dict[str, Any]] = {}
+        self._component_manager: Any | None = None
+        # Ids handed out by reserve_entity that are not alive yet.
+        self._reserved: Set[int] = set()
+        # Slot indices this manager allocates from (see set_index_range).
+        self._first_index = 1
+        self._last_index = INDEX_MASK
+        # Destroyed ids whose slot belongs to another manager's range.
+        self._foreign_freed: List[int] = []
 
     # ------------------------------------------------------------------
     # Creation / Destruction
     # ------------------------------------------------------------------
-    def create_entity(self) -> int:
-        """Create a new entity and return its unique ID."""
+    def create_entity(self, entity_id: int | None = None) -> int:
+        """Create a new entity and return its unique ID.
+
+        Released slots are recycled before new ones are allocated, so slot
+        indices stay dense. Recycled ids carry the slot's bumped generation.
+        Passing an id obtained from :meth:`reserve_entity` brings that id to
+        life instead of allocating a new one.
+        """
 
-        self._next_id += 1
-        entity_id = self._next_id
+        if entity_id is None:
+            entity_id = self._allocate()
+        elif entity_id in self._entity_components:
+            return entity_id
+        elif entity_id in self._reserved:
+            self._reserved.discard(entity_id)
+        else:
+            raise ValueError(f"Entity id {entity_id} was not reserved")
+        if entity_id in self._entity_components:
+            # Components were attached to the id before it was allocated;
+            # drop them with their index entries so the new entity starts empty.
+            self._drop(entity_id)
         self._entity_components[entity_id] = {}
         return entity_id
 
+    def reserve_entity(self) -> int:
+        """Allocate an id without creating the entity yet.
+
+        Used for deferred creation: the id can be referenced immediately and
+        is brought to life later by ``create_entity(entity_id)``.
+        """
+
+        entity_id = self._allocate()
+        self._reserved.add(entity_id)
+        return entity_id
+
+    def remaining_capacity(self) -> int | None:
+        """Return how many more entities may be created, or ``None`` if unbounded."""
+
+        if self.max_entities is None:
+            return None
+        used = len(self._entity_components) + len(self._reserved)
+        return max(0, self.max_entities - used)
+
+    def set_max_entities(self, max_entities: int | None) -> None:
+        """Change the entity limit, pre-sizing the pools for the new limit."""
+
+        self.max_entities = max_entities
+        self._presize_generations()
+
+    def _allocate(self) -> int:
+        if self.remaining_capacity() == 0:
+            raise EntityLimitError(
+                f"Entity limit of {self.max_entities} reached"
+            )
+        if self._free_indices:
+            index = self._free_indices.popleft()
+        else:
+            if self._next_id >= self._last_index:
+                raise RuntimeError("Entity index space exhausted")
+            self._next_id += 1
+            index = self._next_id
+            self._ensure_slot(index)
+        return make_entity_id(index, self._generations[index])
+
+    def _ensure_slot(self, index: int) -> None:
+        missing = index + 1 - len(self._generations)
+        if missing > 0:
+            self._generations.extend([0] * missing)
+
     def destroy_entity(self, entity_id: int) -> None:
         """Remove ``entity_id`` and all associated components."""
 
-        self._entity_components.pop(entity_id, None)
+        if entity_id in self._reserved:
+            # Reserved but never created: just give the slot back.
+            self._reserved.discard(entity_id)
+        elif entity_id not in self._entity_components:
+            return
+        else:
+            self._drop(entity_id)
+        index = entity_index(entity_id)
+        if not self._first_index <= index <= self._last_index:
+            # The owning manager recycles the slot once told about it.
+            self._foreign_freed.append(entity_id)
+        elif index <= self._next_id:
+            self._generations[index] += 1
+            self._free_indices.append(index)
+
+    def _drop(self, entity_id: int) -> None:
+        if self._component_manager is not None:
+            self._component_manager.remove_entity(entity_id)
+        else:
+            del self._entity_components[entity_id]
+
+    # ------------------------------------------------------------------
+    # Partitioned id space
+    # ------------------------------------------------------------------
+    def set_index_range(self, first: int, last: int) -> None:
+        """Allocate new slots only from ``first..last`` (inclusive).
+
+        Managers given disjoint ranges hand out globally unique ids, so
+        entities can move between them (see :meth:`adopt` and
+        :meth:`release`). Must be called before any slot is allocated.
+        """
+
+        if not 1 <= first <= last <= INDEX_MASK:
+            raise ValueError(f"Invalid index range {first}..{last}")
+        if (
+            self._next_id != self._first_index - 1
+            or self._entity_components
+            or self._reserved
+        ):
+            raise RuntimeError("Index range must be set before allocating entities")
+        self._first_index = first
+        self._last_index = last
+        self._next_id = first - 1
+
+    def adopt(self, entity_id: int) -> int:
+        """Bring ``entity_id`` to life with its existing id.
+
+        Used for entities arriving from another manager; the id's slot is
+        not taken from this manager's free list.
+        """
+
+        if entity_id in self._entity_components:
+            return entity_id
+        if self.remaining_capacity() == 0:
+            raise EntityLimitError(f"Entity limit of {self.max_entities} reached")
+        self._entity_components[entity_id] = {}
+        return entity_id
+
+    def release(self, entity_id: int) -> None:
+        """Remove ``entity_id`` without recycling its slot.
+
+        The entity lives on elsewhere (e.g. it moved to another process),
+        so its id must stay unique.
+        """
+
+        if entity_id in self._entity_components:
+            self._drop(entity_id)
+
+    def reclaim(self, entity_id: int) -> None:
+        """Recycle the slot of ``entity_id`` after it was destroyed elsewhere."""
+
+        index = entity_index(entity_id)
+        if (
+            entity_id in self._entity_components
+            or not self._first_index <= index <= self._next_id
+            or self._generations[index] != entity_generation(entity_id)
+        ):
+            return
+        self._generations[index] += 1
+        self._free_indices.append(index)
+
+    def drain_foreign_freed(self) -> List[int]:
+        """Return and forget destroyed ids owned by another manager's range."""
+
+        freed, self._foreign_freed = self._foreign_freed, []
+        return freed
 
     # ------------------------------------------------------------------
     # Accessors
     # ------------------------------------------------------------------
     def has_entity(self, entity_id: int) -> bool:
+        """Return ``True`` if ``entity_id`` is alive.
+
+        Ids kept after their entity was destroyed (inventory entries,
+        ``Ownership.owner_id``, ``PerceptionCache.visible``) fail this check
+        even once their slot has been recycled.
+        """
         return entity_id in self._entity_components
 
+    def is_stale(self, entity_id: int) -> bool:
+        """Return ``True`` if ``entity_id``'s slot has since been destroyed."""
+
+        index = entity_index(entity_id)
+        if not self._first_index <= index <= self._next_id:
+            # Not a slot this manager allocates from
+            return False
+        return self._generations[index] != entity_generation(entity_id)
+
     def components(self, entity_id: int) -> Dict[str, Any]:
         return self._entity_components[entity_id]
 
@@ -43,3 +251,59 @@ class EntityManager:
     def all_entities(self) -> Dict[int, Dict[str, Any]]:
         return self._entity_components
 
+    # ------------------------------------------------------------------
+    # Persistence helpers
+    # ------------------------------------------------------------------
+    def allocator_state(self) -> Dict[str, Any]:
+        """Return the id allocator state as JSON-friendly data."""
+
+        return {
+            "next_id": self._next_id,
+            "generations": self._generations[1 : self._next_id + 1],
+            "free": list(self._free_indices),
+        }
+
+    def restore_allocator(self, state: Dict[str, Any] | None = None) -> None:
+        """Rebuild the id allocator after entities were loaded directly.
+
+        ``state`` comes from :meth:`allocator_state`. Without it, the
+        allocator is derived from the live ids; unused slots below the
+        highest live index are treated as destroyed once so that ids saved
+        before them cannot be handed out again.
+        """
+
+        if state is not None:
+            self._next_id = int(state.get("next_id", 0))
+            self._generations = [0] + [int(g) for g in state.get("generations", [])]
+            self._free_indices = deque(int(i) for i in state.get("free", []))
+            self._presize_generations()
+            return
+
+        live = {entity_index(eid): entity_generation(eid) for eid in self._entity_components}
+        self._next_id = max(live, default=0)
+        self._generations = [0] * (self._next_id + 1)
+        self._free_indices = deque()
+        for index in range(1, self._next_id + 1):
+            if index in live:
+                self._generations[index] = live[index]
+            else:
+                self._generations[index] = 1
+                self._free_indices.append(index)
+        self._presize_generations()
+
+    def _presize_generations(self) -> None:
+        if self.max_entities is not None:
+            missing = self.max_entities + 1 - len(self._generations)
+            if missing > 0:
+                self._generations.extend([0] * missing)
+
+
+__all__ = [
+    "EntityManager",
+    "EntityLimitError",
+    "INDEX_BITS",
+    "INDEX_MASK",
+    "make_entity_id",
+    "entity_index",
+    "entity_generation",
+]
@@ -0,0 +1,572 @@
+"""Spatially sharded simulation across worker processes.
+
+The world is cut into a ``cols`` x ``rows`` grid of rectangular shards whose
+edges fall on :class:`~agent_world.core.spatial.spatial_index.SpatialGrid`
+cell boundaries. Each shard is simulated by a :class:`ShardWorker`, normally
+in its own process, running the world's usual systems over the entities
+inside its rectangle. Every tick each worker
+
+1. adopts the entities that moved into its rectangle on the previous tick,
+2. refreshes its *ghosts*: read-only ``Position`` copies of neighbouring
+   entities within ``halo`` cells of its edge, so collision and perception
+   see across the border,
+3. runs ``SystemsManager.update`` and
+4. hands entities now outside its rectangle to their new shard, packed with
+   :func:`~agent_world.persistence.serializer.serialize`.
+
+Each shard allocates entity ids from its own slice of the index space
+(:meth:`ShardLayout.index_range`), so ids stay unique when entities migrate
+and references between entities keep working. Destroying a migrated entity
+tells the shard owning its slot to recycle it.
+"""
+
+from __future__ import annotations
+
+import logging
+import traceback
+from functools import partial
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import multiprocessing as mp
+
+import numpy as np
+
+from .components.position import Position, position_arrays
+from .entity_manager import INDEX_MASK, entity_index
+from ..persistence.serializer import deserialize, serialize
+
+logger = logging.getLogger(__name__)
+
+# Components copied into neighbouring shards' halos
+GHOST_COMPONENTS: Tuple[str, ...] = ("Position",)
+
+# ``{"id": entity id, "components": {name: serialized component}}``
+PackedEntity = Dict[str, Any]
+Bounds = Tuple[int, int, int, int]
+
+
+# ----------------------------------------------------------------------
+# Layout
+# ----------------------------------------------------------------------
+class ShardLayout:
+    """Split a ``width`` x ``height`` world into ``cols`` x ``rows`` shards.
+
+    Shard edges are multiples of ``cell_size`` so every spatial-index cell
+    belongs to exactly one shard. Shards are numbered row-major. ``halo`` is
+    the depth, in cells, of the border strip mirrored into neighbours.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cols: int,
+        rows: int,
+        cell_size: int = 1,
+        halo: int = 1,
+    ) -> None:
+        if cols < 1 or rows < 1:
+            raise ValueError("cols and rows must be at least 1")
+        if cell_size < 1:
+            raise ValueError("cell_size must be positive")
+        cells_x = -(-width // cell_size)
+        cells_y = -(-height // cell_size)
+        if cols > cells_x or rows > cells_y:
+            raise ValueError(
+                f"Cannot split {cells_x}x{cells_y} cells into {cols}x{rows} shards"
+            )
+        self.width = width
+        self.height = height
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.halo = max(0, int(halo))
+        self.x_edges = np.array(
+            [cells_x * i // cols * cell_size for i in range(cols + 1)], dtype=np.int64
+        )
+        self.y_edges = np.array(
+            [cells_y * i // rows * cell_size for i in range(rows + 1)], dtype=np.int64
+        )
+
+    @classmethod
+    def from_grid(
+        cls, grid: Any, size: Tuple[int, int], cols: int, rows: int, halo: int = 1
+    ) -> "ShardLayout":
+        """Return a layout aligned to ``grid``'s cells for a world of ``size``."""
+
+        return cls(size[0], size[1], cols, rows, cell_size=grid.cell_size, halo=halo)
+
+    @property
+    def count(self) -> int:
+        return self.cols * self.rows
+
+    def bounds(self, shard: int) -> Bounds:
+        """Return ``(x0, y0, x1, y1)`` of ``shard``; the upper edges are exclusive."""
+
+        row, col = divmod(shard, self.cols)
+        return (
+            int(self.x_edges[col]),
+            int(self.y_edges[row]),
+            int(self.x_edges[col + 1]),
+            int(self.y_edges[row + 1]),
+        )
+
+    def halo_bounds(self, shard: int) -> Bounds:
+        """Return ``shard``'s bounds grown by the halo depth on every side."""
+
+        margin = self.halo * self.cell_size
+        x0, y0, x1, y1 = self.bounds(shard)
+        return x0 - margin, y0 - margin, x1 + margin, y1 + margin
+
+    def shard_at(self, x: int, y: int) -> int:
+        """Return the shard owning ``(x, y)``; off-map points use the nearest shard."""
+
+        return int(self.shards_at(np.array([x]), np.array([y]))[0])
+
+    def shards_at(self, xs: Any, ys: Any) -> np.ndarray:
+        """Vectorised :meth:`shard_at` for whole position columns."""
+
+        cols = np.searchsorted(self.x_edges[1:-1], np.asarray(xs), side="right")
+        rows = np.searchsorted(self.y_edges[1:-1], np.asarray(ys), side="right")
+        return rows * self.cols + cols
+
+    def neighbours(self, shard: int) -> List[int]:
+        """Return the shards whose halo overlaps ``shard``'s rectangle."""
+
+        if self.halo == 0:
+            return []
+        row, col = divmod(shard, self.cols)
+        return [
+            r * self.cols + c
+            for r in range(max(0, row - 1), min(self.rows, row + 2))
+            for c in range(max(0, col - 1), min(self.cols, col + 2))
+            if (r, c) != (row, col)
+        ]
+
+    def index_range(self, shard: int) -> Tuple[int, int]:
+        """Return the inclusive entity slot range ``shard`` allocates from."""
+
+        span = INDEX_MASK // self.count
+        first = shard * span + 1
+        return first, first + span - 1
+
+    def shard_of_index(self, index: int) -> int:
+        """Return the shard whose :meth:`index_range` contains slot ``index``."""
+
+        return min((index - 1) // (INDEX_MASK // self.count), self.count - 1)
+
+
+# ----------------------------------------------------------------------
+# Entity transfer
+# ----------------------------------------------------------------------
+def pack_entity(
+    world: Any, entity_id: int, names: Optional[Iterable[str]] = None
+) -> PackedEntity:
+    """Serialise ``entity_id``'s components (only ``names`` if given)."""
+
+    comps = world.entity_manager.components(entity_id)
+    if names is not None:
+        comps = {name: comps[name] for name in names if name in comps}
+    return {
+        "id": entity_id,
+        "components": {name: serialize(comp) for name, comp in comps.items()},
+    }
+
+
+def unpack_entity(world: Any, packed: PackedEntity) -> int:
+    """Recreate a packed entity in ``world`` under its original id."""
+
+    entity_id = world.entity_manager.adopt(int(packed["id"]))
+    cm = world.component_manager
+    for data in packed["components"].values():
+        cm.add_component(entity_id, deserialize(data))
+    pos = cm.get_component(entity_id, Position)
+    index = getattr(world, "spatial_index", None)
+    if pos is not None and index is not None:
+        index.insert(entity_id, (pos.x, pos.y))
+    return entity_id
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+class ShardWorker:
+    """Simulate the entities inside one shard of ``layout``.
+
+    ``world`` is a fully bootstrapped world with no entities yet; its id
+    allocator is narrowed to the shard's :meth:`ShardLayout.index_range`.
+    """
+
+    def __init__(self, layout: ShardLayout, shard: int, world: Any) -> None:
+        self.layout = layout
+        self.shard = shard
+        self.world = world
+        self.ghosts: set[int] = set()
+        world.entity_manager.set_index_range(*layout.index_range(shard))
+
+    def spawn(self, components: Sequence[Any]) -> int:
+        """Create an entity with serialised ``components`` and return its id."""
+
+        world = self.world
+        entity_id = world.entity_manager.create_entity()
+        for data in components:
+            world.component_manager.add_component(entity_id, deserialize(data))
+        pos = world.component_manager.get_component(entity_id, Position)
+        if pos is not None and world.spatial_index is not None:
+            world.spatial_index.insert(entity_id, (pos.x, pos.y))
+        return entity_id
+
+    def step(
+        self,
+        tick: int,
+        migrants: Sequence[PackedEntity] = (),
+        ghosts: Sequence[PackedEntity] = (),
+        reclaimed: Sequence[int] = (),
+    ) -> Dict[str, Any]:
+        """Apply incoming transfers, run one tick and return outgoing ones.
+
+        The result maps ``"migrants"`` and ``"ghosts"`` to ``{shard: [packed]}``,
+        ``"freed"`` to destroyed ids owned by other shards and ``"entities"``
+        to the number of entities this shard now owns.
+        """
+
+        world = self.world
+        em = world.entity_manager
+        # Stale ghosts go first so reclaimed ids are no longer alive here
+        self._drop_ghosts()
+        for entity_id in reclaimed:
+            em.reclaim(entity_id)
+        for packed in migrants:
+            unpack_entity(world, packed)
+        for packed in ghosts:
+            entity_id = int(packed["id"])
+            if em.has_entity(entity_id):
+                continue
+            unpack_entity(world, packed)
+            self.ghosts.add(entity_id)
+
+        world.time_manager.tick_counter = tick
+        world.systems_manager.update(world, tick)
+        world.time_manager.tick_counter = tick + 1
+
+        freed = [eid for eid in em.drain_foreign_freed() if eid not in self.ghosts]
+        self.ghosts.intersection_update(em.all_entities)
+        return {
+            "migrants": self._emigrate(),
+            "ghosts": self._halo(),
+            "freed": freed,
+            "entities": len(em.all_entities) - len(self.ghosts),
+        }
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Return ``{id: {name: serialized}}`` for the entities this shard owns."""
+
+        return {
+            eid: {name: serialize(comp) for name, comp in comps.items()}
+            for eid, comps in self.world.entity_manager.all_entities.items()
+            if eid not in self.ghosts
+        }
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _drop_ghosts(self) -> None:
+        index = getattr(self.world, "spatial_index", None)
+        for entity_id in self.ghosts:
+            self.world.entity_manager.release(entity_id)
+            if index is not None:
+                index.remove(entity_id)
+        self.ghosts.clear()
+
+    def _owned_positions(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ids, xs, ys = position_arrays(self.world.component_manager)
+        if self.ghosts:
+            owned = ~np.isin(ids, np.fromiter(self.ghosts, dtype=np.int64))
+            ids, xs, ys = ids[owned], xs[owned], ys[owned]
+        return ids, xs, ys
+
+    def _emigrate(self) -> Dict[int, List[PackedEntity]]:
+        """Pack and release entities whose position left this shard."""
+
+        ids, xs, ys = self._owned_positions()
+        dest = self.layout.shards_at(xs, ys)
+        leaving = dest != self.shard
+        out: Dict[int, List[PackedEntity]] = {}
+        index = getattr(self.world, "spatial_index", None)
+        for entity_id, shard in zip(ids[leaving].tolist(), dest[leaving].tolist()):
+            out.setdefault(shard, []).append(pack_entity(self.world, entity_id))
+            self.world.entity_manager.release(entity_id)
+            if index is not None:
+                index.remove(entity_id)
+        return out
+
+    def _halo(self) -> Dict[int, List[PackedEntity]]:
+        """Pack ghosts of entities inside each neighbour's halo."""
+
+        out: Dict[int, List[PackedEntity]] = {}
+        neighbours = self.layout.neighbours(self.shard)
+        if not neighbours:
+            return out
+        ids, xs, ys = self._owned_positions()
+        for shard in neighbours:
+            x0, y0, x1, y1 = self.layout.halo_bounds(shard)
+            near = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+            if near.any():
+                out[shard] = [
+                    pack_entity(self.world, entity_id, GHOST_COMPONENTS)
+                    for entity_id in ids[near].tolist()
+                ]
+        return out
+
+
+def _worker_main(
+    conn: Connection,
+    layout: ShardLayout,
+    shard: int,
+    world_factory: Callable[[], Any],
+) -> None:
+    """Process entry point: build the shard's world and serve requests."""
+
+    try:
+        worker = ShardWorker(layout, shard, world_factory())
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+        return
+    conn.send(("ok", None))
+    while True:
+        try:
+            method, args = conn.recv()
+        except EOFError:
+            break
+        if method == "close":
+            worker.world.systems_manager.shutdown()
+            conn.send(("ok", None))
+            break
+        try:
+            conn.send(("ok", getattr(worker, method)(*args)))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+    conn.close()
+
+
+# ----------------------------------------------------------------------
+# Coordinator side
+# ----------------------------------------------------------------------
+class _LocalShard:
+    """Run a :class:`ShardWorker` in this process (useful for tests)."""
+
+    def __init__(self, layout: ShardLayout, shard: int, world_factory: Callable[[], Any]) -> None:
+        self.worker = ShardWorker(layout, shard, world_factory())
+        self._result: Any = None
+
+    def submit(self, method: str, *args: Any) -> None:
+        if method == "close":
+            self.worker.world.systems_manager.shutdown()
+            self._result = None
+        else:
+            self._result = getattr(self.worker, method)(*args)
+
+    def result(self) -> Any:
+        return self._result
+
+
+class _ProcessShard:
+    """Run a :class:`ShardWorker` in a child process over a pipe."""
+
+    def __init__(
+        self,
+        ctx: Any,
+        layout: ShardLayout,
+        shard: int,
+        world_factory: Callable[[], Any],
+    ) -> None:
+        self.shard = shard
+        self._conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child, layout, shard, world_factory),
+            name=f"shard-{shard}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def submit(self, method: str, *args: Any) -> None:
+        self._conn.send((method, args))
+
+    def result(self) -> Any:
+        try:
+            status, payload = self._conn.recv()
+        except EOFError:
+            raise RuntimeError(f"Shard {self.shard} worker exited") from None
+        if status == "error":
+            raise RuntimeError(f"Shard {self.shard} worker failed:\n{payload}")
+        return payload
+
+    def join(self) -> None:
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
+
+
+class ShardedWorld:
+    """Drive one :class:`ShardWorker` per shard of ``layout`` in lockstep.
+
+    ``world_factory`` builds an empty world for each shard; with
+    ``processes=True`` it runs in the child process and must be picklable
+    (e.g. ``functools.partial(bootstrap, "config.yaml")``).
+    """
+
+    def __init__(
+        self,
+        layout: ShardLayout,
+        world_factory: Callable[[], Any],
+        processes: bool = True,
+    ) -> None:
+        self.layout = layout
+        self.tick = 0
+        self.entity_counts: List[int] = [0] * layout.count
+        self._migrants: List[List[PackedEntity]] = [[] for _ in range(layout.count)]
+        self._ghosts: List[List[PackedEntity]] = [[] for _ in range(layout.count)]
+        self._reclaim: List[List[int]] = [[] for _ in range(layout.count)]
+        self._shards: List[Any]
+        if processes:
+            ctx = mp.get_context("spawn")
+            self._shards = [
+                _ProcessShard(ctx, layout, shard, world_factory)
+                for shard in range(layout.count)
+            ]
+            try:
+                for handle in self._shards:
+                    handle.result()
+            except Exception:
+                self.close()
+                raise
+        else:
+            self._shards = [
+                _LocalShard(layout, shard, world_factory) for shard in range(layout.count)
+            ]
+
+    @classmethod
+    def from_config(
+        cls,
+        config_path: str | Path = Path("config.yaml"),
+        cols: int = 2,
+        rows: int = 1,
+        halo: int = 1,
+        processes: bool = True,
+    ) -> "ShardedWorld":
+        """Shard a world bootstrapped from ``config_path``."""
+
+        from ..bootstrap import bootstrap
+        from ..config import load_config
+
+        cfg = load_config(Path(config_path))
+        width, height = cfg.world.size
+        layout = ShardLayout(width, height, cols, rows, halo=halo)
+        return cls(layout, partial(bootstrap, config_path), processes=processes)
+
+    # ------------------------------------------------------------------
+    # Population
+    # ------------------------------------------------------------------
+    def spawn(self, *components: Any) -> int:
+        """Create an entity in the shard containing its ``Position``.
+
+        Entities without a ``Position`` go to shard 0.
+        """
+
+        shard = 0
+        for comp in components:
+            if isinstance(comp, Position):
+                shard = self.layout.shard_at(comp.x, comp.y)
+                break
+        handle = self._shards[shard]
+        handle.submit("spawn", [serialize(comp) for comp in components])
+        entity_id = handle.result()
+        self.entity_counts[shard] += 1
+        return entity_id
+
+    # ------------------------------------------------------------------
+    # Stepping
+    # ------------------------------------------------------------------
+    def step(self, ticks: int = 1) -> None:
+        """Advance every shard by ``ticks`` ticks, exchanging borders in between."""
+
+        for _ in range(ticks):
+            count = self.layout.count
+            for shard, handle in enumerate(self._shards):
+                handle.submit(
+                    "step",
+                    self.tick,
+                    self._migrants[shard],
+                    self._ghosts[shard],
+                    self._reclaim[shard],
+                )
+            migrants: List[List[PackedEntity]] = [[] for _ in range(count)]
+            ghosts: List[List[PackedEntity]] = [[] for _ in range(count)]
+            reclaim: List[List[int]] = [[] for _ in range(count)]
+            for shard, handle in enumerate(self._shards):
+                result = handle.result()
+                for dest, packed in result["migrants"].items():
+                    migrants[dest].extend(packed)
+                for dest, packed in result["ghosts"].items():
+                    ghosts[dest].extend(packed)
+                for entity_id in result["freed"]:
+                    reclaim[self.layout.shard_of_index(entity_index(entity_id))].append(
+                        entity_id
+                    )
+                self.entity_counts[shard] = result["entities"]
+            self._migrants, self._ghosts, self._reclaim = migrants, ghosts, reclaim
+            self.tick += 1
+
+    def entity_count(self) -> int:
+        """Return the number of entities across shards, including those in transit."""
+
+        return sum(self.entity_counts) + sum(len(m) for m in self._migrants)
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Return ``{id: {name: serialized}}`` for every entity in the world."""
+
+        for handle in self._shards:
+            handle.submit("snapshot")
+        merged: Dict[int, Dict[str, Any]] = {}
+        for handle in self._shards:
+            merged.update(handle.result())
+        for pending in self._migrants:
+            for packed in pending:
+                merged[packed["id"]] = packed["components"]
+        return merged
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop every shard worker."""
+
+        for handle in self._shards:
+            try:
+                handle.submit("close")
+                handle.result()
+            except (OSError, RuntimeError) as exc:
+                logger.warning("[Shards] Worker did not close cleanly: %s", exc)
+            if isinstance(handle, _ProcessShard):
+                handle.join()
+        self._shards = []
+
+    def __enter__(self) -> "ShardedWorld":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+__all__ = [
+    "ShardLayout",
+    "ShardWorker",
+    "ShardedWorld",
+    "GHOST_COMPONENTS",
+    "pack_entity",
+    "unpack_entity",
+]
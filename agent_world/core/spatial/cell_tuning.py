@@ -0,0 +1,146 @@
+"""Pick :class:`SpatialGrid` cell sizes from query radii and entity density.
+
+A radius-``r`` query on cells of side ``c`` probes about ``(2r / c + 1)^2``
+cells and distance-checks every entity in them, about ``density * (2r +
+c)^2``. Small cells waste probes on empty dict slots; large cells check
+entities outside the radius. :func:`best_cell_size` minimises the sum over
+the registered radii and :class:`CellSizeTuner` re-buckets the grid when a
+clearly cheaper size appears.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Relative cost of probing one cell vs distance-checking one entity,
+# measured with ``agent_world.utils.benchmarks.cell_size``.
+CELL_PROBE_COST = 1.0
+ENTITY_CHECK_COST = 0.75
+# Retune only when the best size is at least this much cheaper
+DEFAULT_RETUNE_THRESHOLD = 0.25
+# Ticks between density checks
+DEFAULT_TUNE_INTERVAL = 50
+
+
+def query_cost(cell_size: int, radius: int, density: float) -> float:
+    """Return the modelled cost of one radius-``radius`` query."""
+
+    cells = (2 * radius / cell_size + 1) ** 2
+    checked = density * (2 * radius + cell_size) ** 2
+    return CELL_PROBE_COST * cells + ENTITY_CHECK_COST * checked
+
+
+def total_cost(cell_size: int, radii: Dict[int, float], density: float) -> float:
+    """Return the modelled cost of ``radii`` (``{radius: weight}``) at ``cell_size``."""
+
+    return sum(
+        weight * query_cost(cell_size, radius, density) for radius, weight in radii.items()
+    )
+
+
+def best_cell_size(radii: Dict[int, float], density: float) -> int:
+    """Return the cell size minimising :func:`total_cost`.
+
+    Sizes above ``2 * max(radii) + 1`` are never chosen: every query already
+    touches at most four cells there, so larger cells only add entity checks.
+    """
+
+    if not radii:
+        return 1
+    largest = 2 * max(radii) + 1
+    return min(range(1, largest + 1), key=lambda size: total_cost(size, radii, density))
+
+
+def observed_density(grid: Any, area: int = 0) -> float:
+    """Return the entities per tile seen around an average entity.
+
+    Cells are weighted by their own population, so a crowd in a few cells
+    counts as dense even when the rest of the map is empty. An entity does
+    not count towards its own neighbourhood; with ``area`` the map-wide
+    average is used as a floor, since cells of one tile hide how close
+    separate entities are.
+    """
+
+    counts = grid.cell_counts()
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    crowding = sum(n * (n - 1) for n in counts) / (total * grid.cell_size * grid.cell_size)
+    return max(crowding, total / area if area else 0.0)
+
+
+class CellSizeTuner:
+    """System re-sizing ``world.spatial_index`` cells as conditions drift.
+
+    Systems querying the index register their radii with
+    :meth:`register_radius`; every ``interval`` ticks the tuner estimates
+    the density and resizes the grid when the modelled cost would drop by
+    more than ``threshold``.
+    """
+
+    reads = ()
+    writes = ("spatial_index",)
+    interval = DEFAULT_TUNE_INTERVAL
+
+    def __init__(
+        self,
+        world: Any,
+        radii: Iterable[int] = (),
+        threshold: float = DEFAULT_RETUNE_THRESHOLD,
+    ) -> None:
+        self.world = world
+        self.threshold = threshold
+        # radius -> relative query frequency
+        self.radii: Dict[int, float] = {}
+        for radius in radii:
+            self.register_radius(radius)
+
+    def register_radius(self, radius: int, weight: float = 1.0) -> None:
+        """Record that ``radius`` queries are issued with relative ``weight``."""
+
+        if radius > 0:
+            self.radii[radius] = self.radii.get(radius, 0.0) + weight
+
+    def tune(self) -> Optional[int]:
+        """Resize the grid if a cheaper cell size exists; return the new size."""
+
+        grid = getattr(self.world, "spatial_index", None)
+        if grid is None or not hasattr(grid, "resize") or not self.radii:
+            return None
+        width, height = getattr(self.world, "size", (0, 0))
+        density = observed_density(grid, width * height)
+        current = grid.cell_size
+        best = best_cell_size(self.radii, density)
+        if best == current:
+            return None
+        before = total_cost(current, self.radii, density)
+        after = total_cost(best, self.radii, density)
+        if after > before * (1.0 - self.threshold):
+            return None
+        grid.resize(best)
+        logger.info(
+            "[Spatial] Cell size %s -> %s (density %.3f, modelled cost %.0f -> %.0f)",
+            current,
+            best,
+            density,
+            before,
+            after,
+        )
+        return best
+
+    def update(self, tick: int | None = None) -> None:
+        self.tune()
+
+
+__all__ = [
+    "CellSizeTuner",
+    "best_cell_size",
+    "observed_density",
+    "query_cost",
+    "total_cost",
+    "CELL_PROBE_COST",
+    "ENTITY_CHECK_COST",
+]
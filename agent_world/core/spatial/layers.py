@@ -0,0 +1,132 @@
+"""Keep :class:`SpatialGrid` layers in sync with components.
+
+A :class:`LayerBinding` maps component classes to layer names. Component
+add/remove hooks on the :class:`ComponentManager` move entities in and out
+of the matching layers, so systems can ask the spatial index for items or
+agents directly instead of filtering radius results by component.
+
+Membership that depends on component *values*, such as agents leaving
+the agent layer when they die, is expressed with per-layer guards and
+re-checked by :meth:`LayerBinding.refresh` after the value changes.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+from ..components.health import Health
+
+logger = logging.getLogger(__name__)
+
+ITEM_LAYER = "item"
+AGENT_LAYER = "agent"
+
+# Component instance -> layer name, or ``None`` for no layer
+LayerRule = Callable[[Any], Optional[str]]
+# (component manager, entity id) -> whether the entity may be in the layer
+LayerGuard = Callable[[Any, int], bool]
+
+
+class LayerBinding:
+    """Route component changes on a :class:`ComponentManager` into index layers."""
+
+    def __init__(
+        self,
+        index: Any,
+        rules: Dict[Type[Any], LayerRule],
+        layers: Iterable[str] = (),
+        guards: Optional[Dict[str, LayerGuard]] = None,
+    ) -> None:
+        self.index = index
+        self.rules = dict(rules)
+        self.guards: Dict[str, LayerGuard] = dict(guards or {})
+        # Layers that exist even while empty, so callers can rely on them
+        self.layers: Tuple[str, ...] = tuple(layers)
+        self._cm: Any = None
+        self._hooks: list[Callable[[int, Any], None]] = []
+
+    def bind(self, cm: Any) -> None:
+        """Track ``cm``, replacing any manager bound before.
+
+        Memberships are rebuilt from the components already present, which
+        is what a freshly loaded save needs.
+        """
+
+        self.unbind()
+        if not hasattr(self.index, "add_to_layer"):
+            logger.debug("[Spatial] %s has no layers", type(self.index).__name__)
+            return
+        self.index.clear_layers()
+        for layer in self.layers:
+            self.index.add_layer(layer)
+        self._cm = cm
+        for cls, rule in self.rules.items():
+            added = self._on_added(rule)
+            removed = self._on_removed(rule)
+            cm.on_added(cls, added)
+            cm.on_removed(cls, removed)
+            self._hooks.extend((added, removed))
+            for entity_id in cm.entities_with(cls):
+                added(entity_id, cm.get_component(entity_id, cls))
+
+    def unbind(self) -> None:
+        """Stop tracking the bound manager."""
+
+        if self._cm is not None:
+            for hook in self._hooks:
+                self._cm.remove_hook(hook)
+        self._cm = None
+        self._hooks = []
+
+    def refresh(self, entity_id: int) -> None:
+        """Re-check the guarded layers of ``entity_id`` after a value change."""
+
+        cm = self._cm
+        if cm is None:
+            return
+        for cls, rule in self.rules.items():
+            component = cm.get_component(entity_id, cls)
+            if component is None:
+                continue
+            layer = rule(component)
+            if layer is None or layer not in self.guards:
+                continue
+            if self.guards[layer](cm, entity_id):
+                self.index.add_to_layer(layer, entity_id)
+            else:
+                self.index.remove_from_layer(layer, entity_id)
+
+    def _admits(self, layer: str, entity_id: int) -> bool:
+        guard = self.guards.get(layer)
+        return guard is None or guard(self._cm, entity_id)
+
+    def _on_added(self, rule: LayerRule) -> Callable[[int, Any], None]:
+        index = self.index
+
+        def added(entity_id: int, component: Any) -> None:
+            layer = rule(component)
+            if layer is not None and self._admits(layer, entity_id):
+                index.add_to_layer(layer, entity_id)
+
+        return added
+
+    def _on_removed(self, rule: LayerRule) -> Callable[[int, Any], None]:
+        index = self.index
+
+        def removed(entity_id: int, component: Any) -> None:
+            layer = rule(component)
+            if layer is not None:
+                index.remove_from_layer(layer, entity_id)
+
+        return removed
+
+
+def is_alive(cm: Any, entity_id: int) -> bool:
+    """Layer guard admitting entities without ``Health`` or with ``cur > 0``."""
+
+    hp = cm.get_component(entity_id, Health)
+    return hp is None or hp.cur > 0
+
+
+__all__ = ["LayerBinding", "LayerGuard", "LayerRule", "ITEM_LAYER", "AGENT_LAYER", "is_alive"]
@@ -1,27 +1,374 @@
+"""Adaptive point quadtree with the :class:`SpatialGrid` interface."""
+
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import AbstractSet, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Entities a leaf holds before it splits
+DEFAULT_NODE_CAPACITY = 8
+# Side of the root before any entity forces it to grow
+_INITIAL_SIZE = 64
+
+_NO_OCCUPANTS: AbstractSet[int] = frozenset()
+
+
+class _Node:
+    """Square region ``[x0, x0 + size) x [y0, y0 + size)``.
+
+    Leaves keep ``{entity_id: pos}`` in ``items``; inner nodes have four
+    ``children`` ordered ``(x low, y low), (x high, y low), (x low, y high),
+    (x high, y high)``. ``count`` is the number of entities in the subtree.
+    """
+
+    __slots__ = ("x0", "y0", "size", "parent", "children", "items", "count")
 
-from .spatial_index import SpatialGrid
+    def __init__(self, x0: int, y0: int, size: int, parent: Optional["_Node"]) -> None:
+        self.x0 = x0
+        self.y0 = y0
+        self.size = size
+        self.parent = parent
+        self.children: Optional[List["_Node"]] = None
+        self.items: Optional[Dict[int, Tuple[int, int]]] = {}
+        self.count = 0
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x0 <= x < self.x0 + self.size and self.y0 <= y < self.y0 + self.size
+
+    def child_for(self, x: int, y: int) -> "_Node":
+        half = self.size >> 1
+        return self.children[(x >= self.x0 + half) + 2 * (y >= self.y0 + half)]  # type: ignore[index]
+
+    def make_children(self) -> List["_Node"]:
+        half = self.size >> 1
+        x0, y0 = self.x0, self.y0
+        self.children = [
+            _Node(x0, y0, half, self),
+            _Node(x0 + half, y0, half, self),
+            _Node(x0, y0 + half, half, self),
+            _Node(x0 + half, y0 + half, half, self),
+        ]
+        return self.children
 
 
 class Quadtree:
-    """Thin wrapper around :class:`SpatialGrid` for future optimisation."""
+    """Point quadtree that adapts to how crowded each region is.
+
+    Leaves split once they hold more than ``capacity`` entities and merge
+    back when their parent's subtree drops to half of that, so dense
+    clusters get deep, small leaves while sparse areas stay shallow. Leaves
+    never shrink below ``cell_size`` tiles; entities stacked on the same
+    tile share one leaf. The root grows to cover positions outside
+    ``bounds`` (``(x0, y0, width, height)``) as they appear.
+    """
+
+    def __init__(
+        self,
+        cell_size: int,
+        bounds: Optional[Tuple[int, int, int, int]] = None,
+        capacity: int = DEFAULT_NODE_CAPACITY,
+    ) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.cell_size = cell_size
+        self.capacity = capacity
+        self._bounds = bounds
+        self._entity_pos: Dict[int, Tuple[int, int]] = {}
+        self._leaf_of: Dict[int, _Node] = {}
+        # Exact tile -> entities standing on it, as in SpatialGrid
+        self._occupancy: Dict[Tuple[int, int], Set[int]] = {}
+        self._root = self._new_root(bounds)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _new_root(self, bounds: Optional[Tuple[int, int, int, int]]) -> _Node:
+        if bounds is None:
+            return _Node(0, 0, max(_INITIAL_SIZE, self.cell_size), None)
+        x0, y0, width, height = bounds
+        size = self.cell_size
+        while size < max(width, height, 1):
+            size <<= 1
+        return _Node(int(x0), int(y0), size, None)
+
+    def _grow(self, x: int, y: int) -> None:
+        """Double the root towards ``(x, y)`` until it contains the point."""
+        root = self._root
+        while not root.contains(x, y):
+            size = root.size
+            x0 = root.x0 - size if x < root.x0 else root.x0
+            y0 = root.y0 - size if y < root.y0 else root.y0
+            parent = _Node(x0, y0, size << 1, None)
+            parent.items = None
+            children = parent.make_children()
+            slot = (root.x0 != x0) + 2 * (root.y0 != y0)
+            root.parent = parent
+            children[slot] = root
+            parent.count = root.count
+            root = parent
+        self._root = root
 
-    def __init__(self, cell_size: int) -> None:
-        self._grid = SpatialGrid(cell_size)
+    def _place(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        """Add ``entity_id`` to the leaf containing ``pos`` and split if needed."""
+        x, y = pos
+        if not self._root.contains(x, y):
+            self._grow(x, y)
+        node = self._root
+        while node.children is not None:
+            node.count += 1
+            node = node.child_for(x, y)
+        node.count += 1
+        node.items[entity_id] = pos  # type: ignore[index]
+        self._leaf_of[entity_id] = node
+        if node.count > self.capacity:
+            self._split(node)
 
+    def _split(self, leaf: _Node) -> None:
+        pending = [leaf]
+        while pending:
+            node = pending.pop()
+            if node.count <= self.capacity or node.size <= self.cell_size or node.size < 2:
+                continue
+            items = node.items or {}
+            node.items = None
+            node.make_children()
+            for ent, pos in items.items():
+                child = node.child_for(*pos)
+                child.items[ent] = pos  # type: ignore[index]
+                child.count += 1
+                self._leaf_of[ent] = child
+            pending.extend(node.children)  # type: ignore[arg-type]
+
+    def _unplace(self, entity_id: int) -> None:
+        """Remove ``entity_id`` from its leaf and merge sparse subtrees."""
+        leaf = self._leaf_of.pop(entity_id)
+        del leaf.items[entity_id]  # type: ignore[union-attr]
+        node: Optional[_Node] = leaf
+        while node is not None:
+            node.count -= 1
+            node = node.parent
+        # Merge at half capacity so entities wobbling across a boundary do
+        # not split and merge the same node every tick.
+        target = None
+        node = leaf.parent
+        while node is not None and node.count <= self.capacity // 2:
+            target = node
+            node = node.parent
+        if target is not None:
+            self._collapse(target)
+
+    def _collapse(self, node: _Node) -> None:
+        items: Dict[int, Tuple[int, int]] = {}
+        stack = list(node.children or ())
+        while stack:
+            child = stack.pop()
+            if child.children is not None:
+                stack.extend(child.children)
+            else:
+                items.update(child.items)  # type: ignore[arg-type]
+        node.children = None
+        node.items = items
+        for ent in items:
+            self._leaf_of[ent] = node
+
+    def _occupy(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        self._occupancy.setdefault(pos, set()).add(entity_id)
+
+    def _vacate(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        occupants = self._occupancy.get(pos)
+        if occupants is not None:
+            occupants.discard(entity_id)
+            if not occupants:
+                del self._occupancy[pos]
+
+    def _build(self, ids: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Bulk load into an empty tree, partitioning whole arrays per level."""
+        if len(ids):
+            self._grow(int(xs.min()), int(ys.min()))
+            self._grow(int(xs.max()), int(ys.max()))
+        stack = [(self._root, np.arange(len(ids)))]
+        while stack:
+            node, rows = stack.pop()
+            node.count = len(rows)
+            if len(rows) <= self.capacity or node.size <= self.cell_size or node.size < 2:
+                node.children = None
+                node.items = {}
+                for ent, x, y in zip(
+                    ids[rows].tolist(), xs[rows].tolist(), ys[rows].tolist()
+                ):
+                    node.items[ent] = (x, y)
+                    self._leaf_of[ent] = node
+                continue
+            node.items = None
+            half = node.size >> 1
+            right = xs[rows] >= node.x0 + half
+            lower = ys[rows] >= node.y0 + half
+            quadrant = right + 2 * lower
+            for slot, child in enumerate(node.make_children()):
+                stack.append((child, rows[quadrant == slot]))
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
     def insert(self, entity_id: int, pos: Tuple[int, int]) -> None:
-        self._grid.insert(entity_id, pos)
+        """Insert ``entity_id`` at ``pos`` (moving it if already present)."""
+        if entity_id in self._entity_pos:
+            self.move(entity_id, pos)
+            return
+        self._entity_pos[entity_id] = pos
+        self._occupy(entity_id, pos)
+        self._place(entity_id, pos)
 
     def insert_many(self, items: List[Tuple[int, Tuple[int, int]]]) -> None:
-        self._grid.insert_many(items)
+        """Insert multiple ``(entity_id, pos)`` pairs; bulk loads an empty tree."""
+        if self._entity_pos or not items:
+            for ent, pos in items:
+                self.insert(ent, pos)
+            return
+        ids = [ent for ent, _ in items]
+        xs = [pos[0] for _, pos in items]
+        ys = [pos[1] for _, pos in items]
+        self.rebuild(ids, xs, ys)
+
+    def rebuild(
+        self, entity_ids: Sequence[int], xs: Sequence[int], ys: Sequence[int]
+    ) -> None:
+        """Replace the tree contents with ``entity_ids[i]`` at ``(xs[i], ys[i])``."""
+        ids_arr = np.asarray(entity_ids, dtype=np.int64)
+        xs_arr = np.asarray(xs, dtype=np.int64)
+        ys_arr = np.asarray(ys, dtype=np.int64)
+        self._root = self._new_root(self._bounds)
+        self._leaf_of = {}
+        self._occupancy = {}
+        self._entity_pos = dict(
+            zip(ids_arr.tolist(), zip(xs_arr.tolist(), ys_arr.tolist()))
+        )
+        for ent, pos in self._entity_pos.items():
+            self._occupy(ent, pos)
+        self._build(ids_arr, xs_arr, ys_arr)
+
+    def move(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        """Update ``entity_id``'s position, inserting it if unknown.
+
+        A move that stays inside the entity's leaf only rewrites its stored
+        position.
+        """
+        old = self._entity_pos.get(entity_id)
+        if old is None:
+            self.insert(entity_id, pos)
+            return
+        if old == pos:
+            return
+        self._entity_pos[entity_id] = pos
+        self._vacate(entity_id, old)
+        self._occupy(entity_id, pos)
+        leaf = self._leaf_of[entity_id]
+        if leaf.contains(*pos):
+            leaf.items[entity_id] = pos  # type: ignore[index]
+            return
+        self._unplace(entity_id)
+        self._place(entity_id, pos)
+
+    def move_many(self, items: List[Tuple[int, Tuple[int, int]]]) -> None:
+        """Apply :meth:`move` to multiple ``(entity_id, pos)`` pairs."""
+        for ent, pos in items:
+            self.move(ent, pos)
 
     def remove(self, entity_id: int) -> None:
-        self._grid.remove(entity_id)
+        """Remove ``entity_id`` from the tree."""
+        pos = self._entity_pos.pop(entity_id, None)
+        if pos is None:
+            return
+        self._vacate(entity_id, pos)
+        self._unplace(entity_id)
+
+    def occupants(self, pos: Tuple[int, int]) -> AbstractSet[int]:
+        """Return the entities standing exactly on tile ``pos`` (a live set)."""
+        return self._occupancy.get(pos, _NO_OCCUPANTS)
+
+    def is_occupied(self, pos: Tuple[int, int], exclude: Optional[int] = None) -> bool:
+        """Return ``True`` if any entity other than ``exclude`` stands on ``pos``."""
+        occupants = self._occupancy.get(pos)
+        if not occupants:
+            return False
+        return exclude is None or len(occupants) > 1 or exclude not in occupants
+
+    def query_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[int]:
+        """Return all entity IDs inside the inclusive rectangle."""
+        results: List[int] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if (
+                node.count == 0
+                or node.x0 > x1
+                or node.y0 > y1
+                or node.x0 + node.size <= x0
+                or node.y0 + node.size <= y0
+            ):
+                continue
+            if node.children is not None:
+                stack.extend(node.children)
+                continue
+            inside = (
+                x0 <= node.x0
+                and y0 <= node.y0
+                and node.x0 + node.size - 1 <= x1
+                and node.y0 + node.size - 1 <= y1
+            )
+            if inside:
+                results.extend(node.items)  # type: ignore[arg-type]
+            else:
+                for ent, (ex, ey) in node.items.items():  # type: ignore[union-attr]
+                    if x0 <= ex <= x1 and y0 <= ey <= y1:
+                        results.append(ent)
+        return results
 
     def query_radius(self, pos: Tuple[int, int], radius: int) -> List[int]:
-        return self._grid.query_radius(pos, radius)
+        """Return all entity IDs within ``radius`` of ``pos``."""
+        px, py = pos
+        if radius == 0:
+            return list(self._occupancy.get((px, py), ()))
+        r2 = radius * radius
+        x0, y0, x1, y1 = px - radius, py - radius, px + radius, py + radius
+        results: List[int] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if (
+                node.count == 0
+                or node.x0 > x1
+                or node.y0 > y1
+                or node.x0 + node.size <= x0
+                or node.y0 + node.size <= y0
+            ):
+                continue
+            if node.children is not None:
+                stack.extend(node.children)
+                continue
+            for ent, (ex, ey) in node.items.items():  # type: ignore[union-attr]
+                dx = ex - px
+                dy = ey - py
+                if dx * dx + dy * dy <= r2:
+                    results.append(ent)
+        return results
+
+    def depth(self) -> int:
+        """Return the number of levels below the root (0 for a single leaf)."""
+        deepest = 0
+        stack = [(self._root, 0)]
+        while stack:
+            node, level = stack.pop()
+            deepest = max(deepest, level)
+            if node.children is not None:
+                stack.extend((child, level + 1) for child in node.children)
+        return deepest
+
+    def __len__(self) -> int:
+        return len(self._entity_pos)
 
 
-__all__ = ["Quadtree"]
+__all__ = ["Quadtree", "DEFAULT_NODE_CAPACITY"]
@@ -1,10 +1,53 @@
 from __future__ import annotations
 
-from typing import Dict, List, Set, Tuple
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+_NO_OCCUPANTS: AbstractSet[int] = frozenset()
+# Cell ``(cx, cy)`` is keyed as ``cx * _KEY_STRIDE + cy`` in the sorted buckets
+_KEY_STRIDE = 1 << 32
+
+# ``filter`` argument of :meth:`SpatialGrid.k_nearest`: allowed ids or a
+# callable mapping an id array to a boolean mask.
+IdFilter = Union[Callable[[np.ndarray], np.ndarray], Sequence[int], AbstractSet[int]]
+
+
+class _Buckets:
+    """Entity ids and positions sorted by cell key, for batch queries."""
+
+    __slots__ = ("ids", "xs", "ys", "keys", "starts", "counts", "cxs", "cys", "extent")
+
+    def __init__(self, entity_pos: Dict[int, Tuple[int, int]], cell_size: int) -> None:
+        count = len(entity_pos)
+        ids = np.fromiter(entity_pos.keys(), dtype=np.int64, count=count)
+        coords = np.array(list(entity_pos.values()), dtype=np.int64).reshape(count, 2)
+        xs, ys = coords[:, 0], coords[:, 1]
+        keys = (xs // cell_size) * _KEY_STRIDE + ys // cell_size
+        order = np.argsort(keys, kind="stable")
+        self.ids, self.xs, self.ys = ids[order], xs[order], ys[order]
+        self.keys, self.starts, self.counts = np.unique(
+            keys[order], return_index=True, return_counts=True
+        )
+        # Cell coordinates of each occupied bucket
+        self.cxs = self.xs[self.starts] // cell_size
+        self.cys = self.ys[self.starts] // cell_size
+        # Bounding box of all entities, used to stop k-nearest searches
+        self.extent = (
+            (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())) if count else None
+        )
 
 
 class SpatialGrid:
-    """Simple grid-based spatial index."""
+    """Simple grid-based spatial index.
+
+    Entities can also belong to named layers (e.g. ``"item"``), each kept
+    as a grid of its own, so ``query_radius(pos, r, layer="item")`` only
+    visits items. Membership is independent of position: an entity may
+    join a layer before it is inserted and keeps its layers across
+    :meth:`remove` / :meth:`insert`. See :mod:`agent_world.core.spatial.layers`
+    for keeping layers in sync with components.
+    """
 
     def __init__(self, cell_size: int) -> None:
         if cell_size <= 0:
@@ -12,6 +55,13 @@ class SpatialGrid:
         self.cell_size = cell_size
         self._cells: Dict[Tuple[int, int], Set[int]] = {}
         self._entity_pos: Dict[int, Tuple[int, int]] = {}
+        # Exact tile -> entities standing on it, for occupants()/is_occupied()
+        self._occupancy: Dict[Tuple[int, int], Set[int]] = {}
+        # Sorted snapshot for batch queries; dropped by every change
+        self._buckets: Optional[_Buckets] = None
+        # Layer name -> grid of its members; entity -> layer names
+        self._layers: Dict[str, SpatialGrid] = {}
+        self._memberships: Dict[int, Set[str]] = {}
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -21,30 +71,147 @@ class SpatialGrid:
         x, y = pos
         return (x // self.cell_size, y // self.cell_size)
 
+    def _vacate(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        occupants = self._occupancy.get(pos)
+        if occupants is not None:
+            occupants.discard(entity_id)
+            if not occupants:
+                del self._occupancy[pos]
+
+    def _sync_layers(self, items: Any, method: str) -> None:
+        """Forward ``(entity_id, pos)`` pairs of layer members to their layers."""
+        memberships = self._memberships
+        per_layer: Dict[str, List[Tuple[int, Tuple[int, int]]]] = {}
+        for ent, pos in items:
+            for layer in memberships.get(ent, ()):
+                per_layer.setdefault(layer, []).append((ent, pos))
+        for layer, batch in per_layer.items():
+            getattr(self._layers[layer], method)(batch)
+
+    def _layer_grid(self, layer: Optional[str]) -> Optional["SpatialGrid"]:
+        if layer is None:
+            return self
+        return self._layers.get(layer)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def insert(self, entity_id: int, pos: Tuple[int, int]) -> None:
         """Insert ``entity_id`` at ``pos``."""
+        self._buckets = None
         cell = self._cell_coords(pos)
         self._cells.setdefault(cell, set()).add(entity_id)
         self._entity_pos[entity_id] = pos
+        self._occupancy.setdefault(pos, set()).add(entity_id)
+        for layer in self._memberships.get(entity_id, ()):
+            self._layers[layer].insert(entity_id, pos)
 
     def insert_many(self, items: List[Tuple[int, Tuple[int, int]]]) -> None:
         """Insert multiple ``(entity_id, pos)`` pairs in one batch."""
+        self._buckets = None
         cell_map: Dict[Tuple[int, int], List[int]] = {}
         for ent, pos in items:
             cell = self._cell_coords(pos)
             cell_map.setdefault(cell, []).append(ent)
             self._entity_pos[ent] = pos
+            self._occupancy.setdefault(pos, set()).add(ent)
         for cell, ents in cell_map.items():
             self._cells.setdefault(cell, set()).update(ents)
+        if self._memberships:
+            self._sync_layers(items, "insert_many")
+
+    def rebuild(
+        self, entity_ids: Sequence[int], xs: Sequence[int], ys: Sequence[int]
+    ) -> None:
+        """Replace the index contents with ``entity_ids[i]`` at ``(xs[i], ys[i])``.
+
+        Accepts NumPy arrays, e.g. from ``position_arrays(cm)``; cell
+        coordinates are computed for all entities at once.
+        """
+        self._buckets = None
+        xs_arr = np.asarray(xs, dtype=np.int64)
+        ys_arr = np.asarray(ys, dtype=np.int64)
+        ids = np.asarray(entity_ids, dtype=np.int64).tolist()
+        cells = zip((xs_arr // self.cell_size).tolist(), (ys_arr // self.cell_size).tolist())
+        self._cells.clear()
+        self._occupancy.clear()
+        self._entity_pos = dict(zip(ids, zip(xs_arr.tolist(), ys_arr.tolist())))
+        for ent, cell in zip(ids, cells):
+            self._cells.setdefault(cell, set()).add(ent)
+        for ent, pos in self._entity_pos.items():
+            self._occupancy.setdefault(pos, set()).add(ent)
+        for grid in self._layers.values():
+            grid.rebuild([], [], [])
+        if self._memberships:
+            self._sync_layers(self._entity_pos.items(), "insert_many")
+
+    def move(self, entity_id: int, pos: Tuple[int, int]) -> None:
+        """Update ``entity_id``'s position to ``pos``, inserting it if unknown.
+
+        The cell sets are only touched when the entity changes cell; moves
+        within a cell are a single position write.
+        """
+        old = self._entity_pos.get(entity_id)
+        if old == pos:
+            return
+        self._buckets = None
+        self._entity_pos[entity_id] = pos
+        for layer in self._memberships.get(entity_id, ()):
+            self._layers[layer].move(entity_id, pos)
+        if old is not None:
+            self._vacate(entity_id, old)
+        self._occupancy.setdefault(pos, set()).add(entity_id)
+        size = self.cell_size
+        new_cell = (pos[0] // size, pos[1] // size)
+        if old is not None:
+            old_cell = (old[0] // size, old[1] // size)
+            if old_cell == new_cell:
+                return
+            entities = self._cells.get(old_cell)
+            if entities is not None:
+                entities.discard(entity_id)
+                if not entities:
+                    del self._cells[old_cell]
+        self._cells.setdefault(new_cell, set()).add(entity_id)
+
+    def move_many(self, items: List[Tuple[int, Tuple[int, int]]]) -> None:
+        """Apply :meth:`move` to multiple ``(entity_id, pos)`` pairs."""
+        self._buckets = None
+        cells = self._cells
+        entity_pos = self._entity_pos
+        occupancy = self._occupancy
+        size = self.cell_size
+        for ent, pos in items:
+            old = entity_pos.get(ent)
+            if old == pos:
+                continue
+            entity_pos[ent] = pos
+            if old is not None:
+                self._vacate(ent, old)
+            occupancy.setdefault(pos, set()).add(ent)
+            new_cell = (pos[0] // size, pos[1] // size)
+            if old is not None:
+                old_cell = (old[0] // size, old[1] // size)
+                if old_cell == new_cell:
+                    continue
+                entities = cells.get(old_cell)
+                if entities is not None:
+                    entities.discard(ent)
+                    if not entities:
+                        del cells[old_cell]
+            cells.setdefault(new_cell, set()).add(ent)
+        if self._memberships:
+            self._sync_layers(items, "move_many")
 
     def remove(self, entity_id: int) -> None:
         """Remove ``entity_id`` from the index."""
         pos = self._entity_pos.pop(entity_id, None)
         if pos is None:
             return
+        self._buckets = None
+        self._vacate(entity_id, pos)
+        for layer in self._memberships.get(entity_id, ()):
+            self._layers[layer].remove(entity_id)
         cell = self._cell_coords(pos)
         entities = self._cells.get(cell)
         if entities is not None:
@@ -52,8 +219,95 @@ class SpatialGrid:
             if not entities:
                 self._cells.pop(cell, None)
 
-    def query_radius(self, pos: Tuple[int, int], radius: int) -> List[int]:
-        """Return all entity IDs within ``radius`` of ``pos``."""
+    def resize(self, cell_size: int) -> None:
+        """Re-bucket every entity into cells of ``cell_size``."""
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        if cell_size == self.cell_size:
+            return
+        self._buckets = None
+        self.cell_size = cell_size
+        for grid in self._layers.values():
+            grid.resize(cell_size)
+        cells: Dict[Tuple[int, int], Set[int]] = {}
+        for ent, (x, y) in self._entity_pos.items():
+            cells.setdefault((x // cell_size, y // cell_size), set()).add(ent)
+        self._cells = cells
+
+    def cell_counts(self) -> List[int]:
+        """Return how many entities each non-empty cell holds."""
+        return [len(entities) for entities in self._cells.values()]
+
+    def __len__(self) -> int:
+        return len(self._entity_pos)
+
+    # ------------------------------------------------------------------
+    # Layers
+    # ------------------------------------------------------------------
+    def add_layer(self, layer: str) -> None:
+        """Create ``layer`` (empty) if it does not exist yet."""
+        if layer not in self._layers:
+            self._layers[layer] = SpatialGrid(self.cell_size)
+
+    def has_layer(self, layer: str) -> bool:
+        return layer in self._layers
+
+    def add_to_layer(self, layer: str, entity_id: int) -> None:
+        """Make ``entity_id`` a member of ``layer``, creating the layer if needed."""
+        self.add_layer(layer)
+        members = self._memberships.setdefault(entity_id, set())
+        if layer in members:
+            return
+        members.add(layer)
+        pos = self._entity_pos.get(entity_id)
+        if pos is not None:
+            self._layers[layer].insert(entity_id, pos)
+
+    def remove_from_layer(self, layer: str, entity_id: int) -> None:
+        """Drop ``entity_id`` from ``layer``."""
+        members = self._memberships.get(entity_id)
+        if not members or layer not in members:
+            return
+        members.discard(layer)
+        if not members:
+            del self._memberships[entity_id]
+        self._layers[layer].remove(entity_id)
+
+    def clear_layers(self) -> None:
+        """Forget every layer membership (layers themselves are kept)."""
+        self._memberships.clear()
+        for grid in self._layers.values():
+            grid.rebuild([], [], [])
+
+    def layers_of(self, entity_id: int) -> AbstractSet[str]:
+        """Return the layers ``entity_id`` belongs to."""
+        return self._memberships.get(entity_id, frozenset())
+
+    def occupants(self, pos: Tuple[int, int], layer: Optional[str] = None) -> AbstractSet[int]:
+        """Return the entities standing exactly on tile ``pos``.
+
+        The set is live; copy it before inserting, moving or removing
+        entities while iterating.
+        """
+        grid = self._layer_grid(layer)
+        if grid is None:
+            return _NO_OCCUPANTS
+        return grid._occupancy.get(pos, _NO_OCCUPANTS)
+
+    def is_occupied(self, pos: Tuple[int, int], exclude: Optional[int] = None) -> bool:
+        """Return ``True`` if any entity other than ``exclude`` stands on ``pos``."""
+        occupants = self._occupancy.get(pos)
+        if not occupants:
+            return False
+        return exclude is None or len(occupants) > 1 or exclude not in occupants
+
+    def query_radius(
+        self, pos: Tuple[int, int], radius: int, layer: Optional[str] = None
+    ) -> List[int]:
+        """Return all entity IDs within ``radius`` of ``pos``, optionally in ``layer``."""
+        if layer is not None:
+            grid = self._layers.get(layer)
+            return grid.query_radius(pos, radius) if grid is not None else []
         cx_min = (pos[0] - radius) // self.cell_size
         cx_max = (pos[0] + radius) // self.cell_size
         cy_min = (pos[1] - radius) // self.cell_size
@@ -73,5 +327,166 @@ class SpatialGrid:
                         results.append(ent)
         return results
 
+    # ------------------------------------------------------------------
+    # Batch queries
+    # ------------------------------------------------------------------
+    def _sorted_buckets(self) -> _Buckets:
+        buckets = self._buckets
+        if buckets is None:
+            buckets = self._buckets = _Buckets(self._entity_pos, self.cell_size)
+        return buckets
+
+    def query_radius_many(
+        self, points: Any, radius: int, layer: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Run :meth:`query_radius` for every row of ``points`` at once.
+
+        ``points`` is an ``(n, 2)`` array of positions. Returns CSR-style
+        ``(offsets, ids)``: the hits of query ``i`` are
+        ``ids[offsets[i]:offsets[i + 1]]``. All queries are answered with
+        NumPy over a cell-sorted copy of the index, which is rebuilt on the
+        first batch query after a change.
+        """
+        if layer is not None:
+            grid = self._layers.get(layer) or SpatialGrid(self.cell_size)
+            return grid.query_radius_many(points, radius)
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        hits, queries, _dist = self._candidates(pts, radius)
+        offsets = np.zeros(len(pts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(queries, minlength=len(pts)), out=offsets[1:])
+        return offsets, hits
+
+    def k_nearest(
+        self,
+        points: Any,
+        k: int,
+        filter: Optional[IdFilter] = None,
+        exclude: Optional[Sequence[int]] = None,
+        max_radius: Optional[int] = None,
+        layer: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``k`` nearest entities to each row of ``points``.
+
+        ``filter`` limits candidates to an id collection or to ids for which
+        a vectorised predicate is true; ``exclude[i]`` is an id skipped for
+        query ``i`` (e.g. the asking entity). Returns ``(ids, dist2)`` of
+        shape ``(n, k)`` ordered by squared distance then id; missing
+        neighbours are ``-1`` with distance ``inf``. The search radius
+        doubles per round until every query has ``k`` hits, ``max_radius``
+        is reached or it spans all entities. With ``layer`` only its members
+        are considered.
+        """
+        if layer is not None:
+            grid = self._layers.get(layer) or SpatialGrid(self.cell_size)
+            return grid.k_nearest(points, k, filter, exclude, max_radius)
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        n = len(pts)
+        out_ids = np.full((n, k), -1, dtype=np.int64)
+        out_dist = np.full((n, k), np.inf)
+        buckets = self._sorted_buckets()
+        if n == 0 or k <= 0 or buckets.extent is None:
+            return out_ids, out_dist
+        skip = None if exclude is None else np.asarray(exclude, dtype=np.int64)
+        allowed = None
+        if filter is not None and not callable(filter):
+            allowed = np.fromiter(filter, dtype=np.int64)
+
+        x0, y0, x1, y1 = buckets.extent
+        span = int(
+            max(
+                np.abs(pts[:, 0] - x0).max(), np.abs(pts[:, 0] - x1).max(),
+                np.abs(pts[:, 1] - y0).max(), np.abs(pts[:, 1] - y1).max(),
+            )
+        )
+        limit = 2 * span if max_radius is None else min(max_radius, 2 * span)
+        radius = min(self.cell_size, limit)
+        pending = np.arange(n)
+        while len(pending):
+            hits, queries, dist = self._candidates(pts[pending], radius)
+            keep = np.ones(len(hits), dtype=bool)
+            if skip is not None:
+                keep &= hits != skip[pending][queries]
+            if allowed is not None:
+                keep &= np.isin(hits, allowed)
+            elif filter is not None and len(hits):
+                keep &= np.asarray(filter(hits), dtype=bool)
+            hits, queries, dist = hits[keep], queries[keep], dist[keep]
+
+            found = np.bincount(queries, minlength=len(pending))
+            final = radius >= limit
+            done = np.ones(len(pending), dtype=bool) if final else found >= k
+            take = done[queries]
+            hits, queries, dist = hits[take], queries[take], dist[take]
+            order = np.lexsort((hits, dist, queries))
+            hits, queries, dist = hits[order], queries[order], dist[order]
+            # Rank of each hit within its query; keep the first ``k``
+            starts = np.zeros(len(pending), dtype=np.int64)
+            np.cumsum(found * done, out=starts)
+            starts -= found * done
+            rank = np.arange(len(hits)) - starts[queries]
+            first = rank < k
+            rows = pending[queries[first]]
+            out_ids[rows, rank[first]] = hits[first]
+            out_dist[rows, rank[first]] = dist[first]
+
+            pending = pending[~done]
+            radius = min(radius * 2, limit)
+        return out_ids, out_dist
+
+    def _candidates(
+        self, pts: np.ndarray, radius: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(ids, query index, squared distance)`` of every hit.
+
+        Hits are grouped by query in ``pts`` order.
+        """
+        buckets = self._sorted_buckets()
+        size = self.cell_size
+        empty = np.empty(0, dtype=np.int64)
+        if len(pts) == 0 or len(buckets.ids) == 0:
+            return empty, empty, np.empty(0, dtype=np.int64)
+
+        lo = (pts - radius) // size
+        hi = (pts + radius) // size
+        width = int((hi - lo).max()) + 1
+        if width * width > len(buckets.keys):
+            # Sparse index: test each occupied cell against every query's
+            # rectangle instead of enumerating mostly empty cells
+            cxs, cys = buckets.cxs[None, :], buckets.cys[None, :]
+            query_of, cell = np.nonzero(
+                (cxs >= lo[:, 0, None]) & (cxs <= hi[:, 0, None])
+                & (cys >= lo[:, 1, None]) & (cys <= hi[:, 1, None])
+            )
+            starts = buckets.starts[cell]
+            lengths = buckets.counts[cell]
+        else:
+            # Every (query, cell) pair in the cell rectangle around each query
+            steps = np.arange(width)
+            cx = lo[:, 0, None, None] + steps[None, :, None]
+            cy = lo[:, 1, None, None] + steps[None, None, :]
+            valid = (cx <= hi[:, 0, None, None]) & (cy <= hi[:, 1, None, None])
+            query_of = np.broadcast_to(np.arange(len(pts))[:, None, None], valid.shape)[valid]
+            cell_keys = (cx * _KEY_STRIDE + cy)[valid]
+
+            slot = np.searchsorted(buckets.keys, cell_keys)
+            slot_ok = slot < len(buckets.keys)
+            slot_ok[slot_ok] &= buckets.keys[slot[slot_ok]] == cell_keys[slot_ok]
+            query_of = query_of[slot_ok]
+            starts = buckets.starts[slot[slot_ok]]
+            lengths = buckets.counts[slot[slot_ok]]
+
+        # Expand each (query, cell) pair to the entities in that cell
+        total = int(lengths.sum())
+        if total == 0:
+            return empty, empty, np.empty(0, dtype=np.int64)
+        ends = np.cumsum(lengths)
+        rows = np.arange(total) + np.repeat(starts - (ends - lengths), lengths)
+        queries = np.repeat(query_of, lengths)
+        dx = buckets.xs[rows] - pts[queries, 0]
+        dy = buckets.ys[rows] - pts[queries, 1]
+        dist = dx * dx + dy * dy
+        inside = dist <= radius * radius
+        return buckets.ids[rows[inside]], queries[inside], dist[inside]
+
 
 __all__ = ["SpatialGrid"]
@@ -0,0 +1,145 @@
+"""Per-system tick timing and budget accounting."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per system
+DEFAULT_TIMING_HISTORY = 256
+# Soft per-tick budget in seconds (PROJECT_DESIGN.md)
+TICK_BUDGET = 0.1
+# Overrun records kept for reporting
+_OVERRUN_HISTORY = 32
+
+
+class _Ring:
+    """Fixed-size float ring buffer.
+
+    Samples go into a plain list, which is cheaper per append than NumPy
+    scalar stores; :meth:`samples` converts once when reporting.
+    """
+
+    __slots__ = ("values", "count", "next")
+
+    def __init__(self, size: int) -> None:
+        self.values: List[float] = [0.0] * size
+        self.count = 0
+        self.next = 0
+
+    def append(self, value: float) -> None:
+        values = self.values
+        values[self.next] = value
+        self.next = (self.next + 1) % len(values)
+        if self.count < len(values):
+            self.count += 1
+
+    def samples(self) -> np.ndarray:
+        return np.asarray(self.values[: self.count], dtype=np.float64)
+
+
+class SystemTimings:
+    """Rolling wall-time samples for each system and overrun attribution.
+
+    :class:`~agent_world.core.systems_manager.SystemsManager` appends
+    ``(name, seconds)`` to :meth:`tick_samples` after each system runs and
+    calls :meth:`end_tick` once the tick is done, which files the samples
+    into per-system rings. A tick longer than ``budget`` is logged together
+    with the system that took longest in it.
+    """
+
+    def __init__(
+        self, history: int = DEFAULT_TIMING_HISTORY, budget: float = TICK_BUDGET
+    ) -> None:
+        self.history = history
+        self.budget = budget
+        self._rings: Dict[str, _Ring] = {}
+        self._overrun_counts: Dict[str, int] = {}
+        self._tick: List[Tuple[str, float]] = []
+        self.ticks = _Ring(history)
+        # (tick, total seconds, slowest system, its seconds)
+        self.overruns: Deque[Tuple[Any, float, str, float]] = deque(maxlen=_OVERRUN_HISTORY)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def tick_samples(self) -> List[Tuple[str, float]]:
+        """Return the list collecting ``(name, seconds)`` for the running tick."""
+
+        return self._tick
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one ``seconds`` sample for system ``name`` in the current tick."""
+
+        self._tick.append((name, seconds))
+
+    def end_tick(self, tick: Any, total: float) -> None:
+        """Close the current tick, logging it if ``total`` exceeds the budget."""
+
+        self.ticks.append(total)
+        samples, self._tick = self._tick, []
+        rings = self._rings
+        for name, seconds in samples:
+            ring = rings.get(name)
+            if ring is None:
+                ring = rings[name] = _Ring(self.history)
+            ring.append(seconds)
+        if total <= self.budget or not samples:
+            return
+        name, seconds = max(samples, key=lambda sample: sample[1])
+        self._overrun_counts[name] = self._overrun_counts.get(name, 0) + 1
+        self.overruns.append((tick, total, name, seconds))
+        logger.warning(
+            "[Tick %s] Tick took %.1f ms (budget %.1f ms); slowest system %s took %.1f ms",
+            tick,
+            total * 1000,
+            self.budget * 1000,
+            name,
+            seconds * 1000,
+        )
+
+    def forget(self, name: str) -> None:
+        """Drop the samples of system ``name``."""
+
+        self._rings.pop(name, None)
+        self._overrun_counts.pop(name, None)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def report(self) -> List[Dict[str, Any]]:
+        """Return per-system statistics in milliseconds, slowest p95 first.
+
+        Each row has ``name``, ``samples``, ``mean_ms``, ``p50_ms``,
+        ``p95_ms``, ``p99_ms``, ``max_ms`` and ``overruns`` (ticks over
+        budget in which the system was the slowest).
+        """
+
+        rows: List[Dict[str, Any]] = []
+        for name, ring in self._rings.items():
+            samples = ring.samples()
+            if not len(samples):
+                continue
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99)) * 1000
+            rows.append(
+                {
+                    "name": name,
+                    "samples": int(len(samples)),
+                    "mean_ms": float(samples.mean() * 1000),
+                    "p50_ms": float(p50),
+                    "p95_ms": float(p95),
+                    "p99_ms": float(p99),
+                    "max_ms": float(samples.max() * 1000),
+                    "overruns": self._overrun_counts.get(name, 0),
+                }
+            )
+        rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return rows
+
+
+__all__ = ["SystemTimings", "DEFAULT_TIMING_HISTORY", "TICK_BUDGET"]
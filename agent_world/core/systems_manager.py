@@ -2,18 +2,63 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from math import gcd
+from time import perf_counter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 import inspect
 
-from agent_world.systems.movement.movement_system import MovementSystem
-from agent_world.systems.movement.physics_system import PhysicsSystem
+from .system_timing import SystemTimings
+
+# A system's declared ``(reads, writes)`` sets; ``None`` means undeclared.
+Access = Optional[Tuple[FrozenSet[Any], FrozenSet[Any]]]
+# Bound ``update``, its trailing argument count, interval, phase and name
+PlanEntry = Tuple[Callable[..., Any], int, int, int, str]
 
 
 class SystemsManager:
-    """Maintain an ordered list of systems and tick them sequentially."""
+    """Maintain an ordered list of systems and tick them.
+
+    Systems may declare what they touch with class attributes:
+
+    ``reads`` / ``writes``
+        Component classes (or resource names such as ``"spatial_index"``)
+        the system reads or mutates. Structural changes count as writes and
+        must go through ``world.command_buffer``. Systems that declare
+        neither are exclusive and never overlap with another system.
+    ``after``
+        System classes that must run before this one, e.g.
+        ``MovementSystem.after = (PhysicsSystem,)``.
+    ``interval`` / ``phase``
+        Run only on ticks where ``(tick - phase) % interval == 0``. Without
+        a ``phase`` the manager picks the offset that overlaps least with
+        other periodic systems, spreading them across ticks.
+
+    Registration order is kept except where ``after`` requires otherwise.
+    With ``max_workers > 1``, consecutive systems whose declarations do not
+    conflict run concurrently on a thread pool. Their command buffer
+    operations are applied in registration order once the whole group has
+    finished, so results match a sequential tick.
 
-    def __init__(self) -> None:
+    Every run is timed into :attr:`timings`, which reports per-system
+    percentiles and names the slowest system of each tick over budget.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
         self._systems: List[Any] = []
+        # Bound ``update`` methods paired with how many trailing tick
+        # arguments each one accepts; rebuilt on (un)registration only.
+        self._plan: List[PlanEntry] = []
+        # Groups of plan indices that may run together, in execution order
+        self._stages: List[List[int]] = []
+        self._planned: List[Any] = []
+        # id(system) -> (interval, phase)
+        self._schedules: Dict[int, Tuple[int, int]] = {}
+        # Tick used when ``update`` is called without one
+        self._ticks = 0
+        self.max_workers = max(1, int(max_workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self.timings = SystemTimings()
 
     # ------------------------------------------------------------------
     # Registration API
@@ -21,39 +66,151 @@ class SystemsManager:
     def register(self, system: Any) -> None:
         """Add ``system`` to the update list if not already present.
 
-        Ensures that :class:`PhysicsSystem` always runs before
-        :class:`MovementSystem` regardless of registration order.
+        ``system`` is appended unless ``after`` declarations require it to
+        run before an already registered system or right after one of its
+        declared predecessors.
         """
 
         if system in self._systems:
             return
 
-        if isinstance(system, PhysicsSystem):
-            for idx, s in enumerate(self._systems):
-                if isinstance(s, MovementSystem):
-                    self._systems.insert(idx, system)
-                    break
-            else:
-                self._systems.append(system)
-            return
-
-        if isinstance(system, MovementSystem):
-            for idx, s in enumerate(self._systems):
-                if isinstance(s, PhysicsSystem):
-                    # insert after existing physics system
-                    self._systems.insert(idx + 1, system)
-                    break
-            else:
-                self._systems.append(system)
-            return
+        lo, hi = 0, len(self._systems)
+        for idx, other in enumerate(self._systems):
+            if _runs_after(system, other):
+                lo = max(lo, idx + 1)
+            if _runs_after(other, system):
+                hi = min(hi, idx)
+        if lo > hi:
+            raise ValueError(
+                f"Cannot order {type(system).__name__}: conflicting 'after' declarations"
+            )
 
-        self._systems.append(system)
+        if hi < len(self._systems):
+            self._systems.insert(hi, system)
+        elif lo > 0:
+            self._systems.insert(lo, system)
+        else:
+            self._systems.append(system)
+        self._schedules[id(system)] = self._resolve_schedule(
+            system, getattr(system, "interval", 1), getattr(system, "phase", None)
+        )
+        self._rebuild_plan()
 
     def unregister(self, system: Any) -> None:
         """Remove ``system`` if currently registered."""
 
         if system in self._systems:
             self._systems.remove(system)
+            self._schedules.pop(id(system), None)
+            self._rebuild_plan()
+            name = type(system).__name__
+            if not any(type(s).__name__ == name for s in self._systems):
+                self.timings.forget(name)
+
+    # ------------------------------------------------------------------
+    # Update frequency
+    # ------------------------------------------------------------------
+    def set_schedule(self, system: Any, interval: int, phase: int | None = None) -> None:
+        """Run ``system`` every ``interval`` ticks at ``phase``.
+
+        ``phase`` defaults to the least crowded offset.
+        """
+
+        if system not in self._systems:
+            raise ValueError(f"{type(system).__name__} is not registered")
+        self._schedules[id(system)] = self._resolve_schedule(system, interval, phase)
+        self._rebuild_plan()
+
+    def schedule(self) -> List[Dict[str, Any]]:
+        """Return ``name``, ``interval``, ``phase`` and ``stage`` per system."""
+
+        stage_of = {
+            id(system): index
+            for index, stage in enumerate(self.stages())
+            for system in stage
+        }
+        rows: List[Dict[str, Any]] = []
+        for system in self._systems:
+            interval, phase = self._schedules[id(system)]
+            rows.append(
+                {
+                    "name": type(system).__name__,
+                    "interval": interval,
+                    "phase": phase,
+                    "stage": stage_of.get(id(system)),
+                }
+            )
+        return rows
+
+    def _resolve_schedule(
+        self, system: Any, interval: int, phase: int | None
+    ) -> Tuple[int, int]:
+        interval = int(interval)
+        if interval < 1:
+            raise ValueError(
+                f"{type(system).__name__}: interval must be at least 1, got {interval}"
+            )
+        if phase is not None:
+            return interval, int(phase) % interval
+        if interval == 1:
+            return 1, 0
+        # Two periodic systems share ticks when their phases agree modulo
+        # the gcd of their intervals; choose the phase hitting fewest others.
+        others = [
+            sched
+            for key, sched in self._schedules.items()
+            if key != id(system) and sched[0] > 1
+        ]
+
+        def load(candidate: int) -> int:
+            return sum(
+                (candidate - other_phase) % gcd(interval, other_interval) == 0
+                for other_interval, other_phase in others
+            )
+
+        return interval, min(range(interval), key=load)
+
+    # ------------------------------------------------------------------
+    # Dispatch plan
+    # ------------------------------------------------------------------
+    def _rebuild_plan(self) -> None:
+        """Bind every system's ``update`` and group non-conflicting systems."""
+
+        plan: List[PlanEntry] = []
+        systems: List[Any] = []
+        for system in self._systems:
+            method = getattr(system, "update", None)
+            if callable(method):
+                interval, phase = self._schedules[id(system)]
+                plan.append(
+                    (method, _positional_arity(method), interval, phase, type(system).__name__)
+                )
+                systems.append(system)
+
+        # A system's stage follows every earlier system it conflicts with
+        # or is declared to run after.
+        access = [_access(system) for system in systems]
+        levels: List[int] = []
+        for j, system in enumerate(systems):
+            level = 0
+            for i in range(j):
+                if _conflicts(access[i], access[j]) or _runs_after(system, systems[i]):
+                    level = max(level, levels[i] + 1)
+            levels.append(level)
+        stages: List[List[int]] = [[] for _ in range(max(levels, default=-1) + 1)]
+        for index, level in enumerate(levels):
+            stages[level].append(index)
+
+        # Swap in new lists so a tick already iterating the old plan is
+        # unaffected by systems (un)registered mid-update.
+        self._plan = plan
+        self._stages = stages
+        self._planned = systems
+
+    def stages(self) -> List[List[Any]]:
+        """Return the systems grouped as they may run concurrently."""
+
+        return [[self._planned[i] for i in stage] for stage in self._stages]
 
     # ------------------------------------------------------------------
     # Tick dispatch
@@ -61,34 +218,106 @@ class SystemsManager:
     def update(self, *args: Any, **kwargs: Any) -> None:
         """Call ``update`` on each registered system in order.
 
-        The manager adapts the provided ``args`` for each system based on its
-        ``update`` method signature so that subsystems can accept varying
-        parameter counts (e.g. ``update()`` or ``update(tick)``).
+        Each system receives the trailing ``args`` its ``update`` signature
+        accepts (e.g. ``update()`` or ``update(tick)``); the argument counts
+        are resolved once at registration rather than every tick. Systems
+        not due on this tick are skipped; the tick is the last argument when
+        it is an ``int`` and an internal counter otherwise. When called as
+        ``update(world, tick)``, ``world.command_buffer`` is flushed after
+        every system, or after every concurrent group.
         """
 
-        for system in list(self._systems):
-            method = getattr(system, "update", None)
-            if not callable(method):
-                continue
-
-            sig = inspect.signature(method)
-            params = [
-                p
-                for p in sig.parameters.values()
-                if p.kind
-                in (
-                    inspect.Parameter.POSITIONAL_ONLY,
-                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                )
-            ]
-            if params and params[0].name == "self":
-                params = params[1:]
+        started = perf_counter()
+        timings = self.timings
+        record = timings.tick_samples().append
+        world = args[0] if len(args) >= 2 else None
+        buffer = getattr(world, "command_buffer", None)
+        if buffer is not None:
+            buffer.flush()
+
+        if args and isinstance(args[-1], int):
+            tick = args[-1]
+        else:
+            tick = self._ticks
+            self._ticks += 1
+
+        plan, stages = self._plan, self._stages
+        if self.max_workers == 1:
+            for method, n, interval, phase, name in plan:
+                if interval != 1 and (tick - phase) % interval:
+                    continue
+                begin = perf_counter()
+                if n == 0:
+                    method()
+                else:
+                    method(*args[-n:])
+                record((name, perf_counter() - begin))
+                # Sync point: apply structural changes queued by this system
+                if buffer is not None:
+                    buffer.flush()
+        else:
+            for stage in stages:
+                due = [
+                    plan[i]
+                    for i in stage
+                    if plan[i][2] == 1 or (tick - plan[i][3]) % plan[i][2] == 0
+                ]
+                if not due:
+                    continue
+                if len(due) == 1:
+                    method, n, _interval, _phase, name = due[0]
+                    begin = perf_counter()
+                    _invoke(method, n, args)
+                    record((name, perf_counter() - begin))
+                else:
+                    self._run_concurrently(due, args, buffer)
+                if buffer is not None:
+                    buffer.flush()
+
+        self._end_tick(args)
+        timings.end_tick(tick, perf_counter() - started)
+
+    def _run_concurrently(
+        self,
+        entries: List[PlanEntry],
+        args: Tuple[Any, ...],
+        buffer: Any,
+    ) -> None:
+        """Run ``entries`` on the pool and queue their commands in plan order."""
 
-            n = len(params)
-            if n == 0:
-                method()
-            else:
-                method(*args[-n:])
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="systems"
+            )
+        futures: List[Future[Any]] = [
+            self._executor.submit(_invoke_captured, method, n, args, buffer)
+            for method, n, _interval, _phase, _name in entries
+        ]
+        wait(futures)
+        for entry, future in zip(entries, futures):
+            # re-raises the first failure in plan order
+            ops, seconds = future.result()
+            self.timings.record(entry[4], seconds)
+            if ops:
+                buffer.extend(ops)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, if any were started."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    def _end_tick(args: tuple[Any, ...]) -> None:
+        """Close the component change window when called as ``update(world, tick)``."""
+
+        if len(args) < 2 or not isinstance(args[-1], int):
+            return
+        cm = getattr(args[0], "component_manager", None)
+        end_tick = getattr(cm, "end_tick", None)
+        if callable(end_tick):
+            end_tick(args[-1])
 
     # ------------------------------------------------------------------
     # Introspection helpers
@@ -100,4 +329,66 @@ class SystemsManager:
         return len(self._systems)
 
 
+def _invoke(method: Callable[..., Any], n: int, args: Tuple[Any, ...]) -> None:
+    if n == 0:
+        method()
+    else:
+        method(*args[-n:])
+
+
+def _invoke_captured(
+    method: Callable[..., Any], n: int, args: Tuple[Any, ...], buffer: Any
+) -> Any:
+    """Run ``method`` on a worker; return its queued commands and duration."""
+
+    begin = perf_counter()
+    if buffer is None:
+        _invoke(method, n, args)
+        return None, perf_counter() - begin
+    with buffer.capture() as ops:
+        _invoke(method, n, args)
+    return ops, perf_counter() - begin
+
+
+def _positional_arity(method: Callable[..., Any]) -> int:
+    """Return how many positional parameters ``method`` takes, excluding ``self``."""
+
+    params = [
+        p
+        for p in inspect.signature(method).parameters.values()
+        if p.kind
+        in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        )
+    ]
+    if params and params[0].name == "self":
+        params = params[1:]
+    return len(params)
+
+
+def _access(system: Any) -> Access:
+    reads = getattr(system, "reads", None)
+    writes = getattr(system, "writes", None)
+    if reads is None and writes is None:
+        return None
+    return frozenset(reads or ()), frozenset(writes or ())
+
+
+def _conflicts(a: Access, b: Access) -> bool:
+    """Return ``True`` if two systems may not run at the same time."""
+
+    if a is None or b is None:
+        return True
+    reads_a, writes_a = a
+    reads_b, writes_b = b
+    return bool(writes_a & (reads_b | writes_b) or writes_b & reads_a)
+
+
+def _runs_after(system: Any, other: Any) -> bool:
+    """Return ``True`` if ``system`` declares it must run after ``other``."""
+
+    return any(isinstance(other, cls) for cls in getattr(system, "after", ()))
+
+
 __all__ = ["SystemsManager"]
@@ -0,0 +1,184 @@
+"""Compact typed storage for the world's tile map."""
+
+from __future__ import annotations
+
+import base64
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# Kind id reserved for empty tiles
+EMPTY = 0
+# Largest kind id representable in the uint8 layer
+_MAX_KIND = int(np.iinfo(np.uint8).max)
+
+
+class TileGrid:
+    """Tile map stored as a ``uint8`` kind layer plus a kind lookup table.
+
+    ``layer[y, x]`` holds the kind id of each tile (``EMPTY`` for none) and
+    each kind's shared attributes (``glyph``, ``colour``...) live once in the
+    lookup table. ``grid[y][x]`` still returns a ``{"kind", ...}`` dict or
+    ``None`` so code written against the old list-of-dicts map keeps working.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.layer = np.zeros((height, width), dtype=np.uint8)
+        # kind id -> kind name / attributes; index 0 is the empty tile
+        self._kinds: List[Optional[str]] = [None]
+        self._attrs: List[Dict[str, Any]] = [{}]
+        self._ids: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Kind table
+    # ------------------------------------------------------------------
+    def register_kind(self, kind: str, **attrs: Any) -> int:
+        """Return the id of ``kind``, adding it with ``attrs`` if unknown."""
+        kind_id = self._ids.get(kind)
+        if kind_id is not None:
+            return kind_id
+        kind_id = len(self._kinds)
+        if kind_id > _MAX_KIND:
+            raise ValueError(f"Too many tile kinds (max {_MAX_KIND})")
+        self._kinds.append(kind)
+        self._attrs.append(dict(attrs))
+        self._ids[kind] = kind_id
+        return kind_id
+
+    def kind_id(self, kind: str) -> Optional[int]:
+        """Return the id registered for ``kind``, if any."""
+        return self._ids.get(kind)
+
+    def kinds(self) -> List[Optional[str]]:
+        """Return kind names indexed by kind id (``None`` for empty)."""
+        return list(self._kinds)
+
+    def definitions(self) -> List[Optional[Dict[str, Any]]]:
+        """Return ``{"kind", ...}`` tile dicts indexed by kind id."""
+        return [None] + [
+            {"kind": kind, **attrs}
+            for kind, attrs in zip(self._kinds[1:], self._attrs[1:])
+        ]
+
+    # ------------------------------------------------------------------
+    # Accessors
+    # ------------------------------------------------------------------
+    def kind_at(self, x: int, y: int) -> Optional[str]:
+        """Return the kind name at ``(x, y)`` or ``None`` if empty."""
+        return self._kinds[self.layer[y, x]]
+
+    def tile_at(self, x: int, y: int) -> Optional[Dict[str, Any]]:
+        """Return a fresh ``{"kind", ...}`` dict for ``(x, y)`` or ``None``."""
+        kind_id = int(self.layer[y, x])
+        if kind_id == EMPTY:
+            return None
+        return {"kind": self._kinds[kind_id], **self._attrs[kind_id]}
+
+    def set_kind(self, x: int, y: int, kind: Optional[str]) -> None:
+        """Set ``(x, y)`` to a registered ``kind``; ``None`` clears the tile."""
+        if kind is None:
+            self.layer[y, x] = EMPTY
+            return
+        kind_id = self._ids.get(kind)
+        if kind_id is None:
+            raise ValueError(f"Unknown tile kind: {kind}")
+        self.layer[y, x] = kind_id
+
+    def set_tile(self, x: int, y: int, tile: Optional[Dict[str, Any]]) -> None:
+        """Store a ``{"kind", ...}`` dict, registering its kind if needed."""
+        if not tile:
+            self.layer[y, x] = EMPTY
+            return
+        attrs = {k: v for k, v in tile.items() if k != "kind"}
+        self.layer[y, x] = self.register_kind(str(tile["kind"]), **attrs)
+
+    def count(self, kind: str, x0: int, y0: int, x1: int, y1: int) -> int:
+        """Return how many tiles of ``kind`` lie in the inclusive rectangle."""
+        kind_id = self._ids.get(kind)
+        if kind_id is None:
+            return 0
+        x0, y0 = max(0, x0), max(0, y0)
+        window = self.layer[y0 : y1 + 1, x0 : x1 + 1]
+        return int(np.count_nonzero(window == kind_id))
+
+    # ------------------------------------------------------------------
+    # ``tile_map[y][x]`` compatibility
+    # ------------------------------------------------------------------
+    def __getitem__(self, y: int) -> "_TileRow":
+        if not -self.height <= y < self.height:
+            raise IndexError("tile row out of range")
+        return _TileRow(self, y % self.height)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator["_TileRow"]:
+        for y in range(self.height):
+            yield _TileRow(self, y)
+
+    # ------------------------------------------------------------------
+    # Persistence helpers
+    # ------------------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        """Return JSON-friendly data; the layer is zlib-compressed base64."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "kinds": [
+                {"kind": kind, **attrs}
+                for kind, attrs in zip(self._kinds[1:], self._attrs[1:])
+            ],
+            "layer": base64.b64encode(zlib.compress(self.layer.tobytes())).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TileGrid":
+        """Rebuild a grid from :meth:`to_dict` output."""
+        grid = cls(int(data["width"]), int(data["height"]))
+        for entry in data.get("kinds", []):
+            attrs = {k: v for k, v in entry.items() if k != "kind"}
+            grid.register_kind(str(entry["kind"]), **attrs)
+        raw = zlib.decompress(base64.b64decode(data["layer"]))
+        grid.layer = np.frombuffer(raw, dtype=np.uint8).reshape(grid.height, grid.width).copy()
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "TileGrid":
+        """Build a grid from a legacy list of rows of tile dicts or ``None``."""
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            for x, tile in enumerate(row):
+                if tile:
+                    grid.set_tile(x, y, tile)
+        return grid
+
+
+class _TileRow:
+    """Row proxy returned by ``TileGrid[y]``."""
+
+    __slots__ = ("_grid", "_y")
+
+    def __init__(self, grid: TileGrid, y: int) -> None:
+        self._grid = grid
+        self._y = y
+
+    def __getitem__(self, x: int) -> Optional[Dict[str, Any]]:
+        return self._grid.tile_at(x, self._y)
+
+    def __setitem__(self, x: int, tile: Optional[Dict[str, Any]]) -> None:
+        self._grid.set_tile(x, self._y, tile)
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __iter__(self) -> Iterator[Optional[Dict[str, Any]]]:
+        for x in range(self._grid.width):
+            yield self._grid.tile_at(x, self._y)
+
+
+__all__ = ["TileGrid", "EMPTY"]
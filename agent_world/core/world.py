@@ -3,11 +3,15 @@
 
 from __future__ import annotations
 
-from typing import Any, List, Tuple, TYPE_CHECKING, Optional
+from typing import Any, List, Sequence, Tuple, TYPE_CHECKING, Optional
 import asyncio
 import threading
 
+import numpy as np
+
 from ..utils.asset_generation import noise
+from .command_buffer import CommandBuffer
+from .tile_grid import TileGrid
 
 if TYPE_CHECKING:
     from ..systems.ai.actions import ActionQueue  # Forward reference for type hint
@@ -21,9 +25,8 @@ class World:
     def __init__(self, size: Tuple[int, int]):
         self.size: Tuple[int, int] = size
         width, height = size
-        self.tile_map: List[List[Any]] = [
-            [None for _ in range(width)] for _ in range(height)
-        ]
+        # Resource tiles; ``tile_map`` is kept as a list-style alias
+        self.tiles: TileGrid = TileGrid(width, height)
 
         # These managers will be populated during the bootstrapping phase.
         self.entity_manager: Any | None = None # More specific types can be added if available
@@ -31,6 +34,8 @@ class World:
         self.systems_manager: Any | None = None
         self.time_manager: Any | None = None
         self.spatial_index: Any | None = None
+        # Structural changes queued by systems, flushed by the systems manager
+        self.command_buffer: CommandBuffer = CommandBuffer(self)
 
         # For action processing
         self.action_queue: ActionQueue | None = None
@@ -60,6 +65,63 @@ class World:
             "wood": {"glyph": "W", "colour": "green"},
             "herbs": {"glyph": "H", "colour": "magenta"},
         }
+        for kind, attrs in self._resource_defs.items():
+            self.tiles.register_kind(kind, **attrs)
+
+    # ------------------------------------------------------------------
+    # Tile map
+    # ------------------------------------------------------------------
+    @property
+    def tile_map(self) -> TileGrid:
+        """Compatibility view of :attr:`tiles` supporting ``tile_map[y][x]``."""
+        return self.tiles
+
+    @tile_map.setter
+    def tile_map(self, value: TileGrid | Sequence[Sequence[Any]]) -> None:
+        grid = value if isinstance(value, TileGrid) else TileGrid.from_rows(value)
+        # Loaded maps only know the kinds they contain; spawning needs them all
+        for kind, attrs in self._resource_defs.items():
+            grid.register_kind(kind, **attrs)
+        self.tiles = grid
+
+    # ------------------------------------------------------------------
+    # Manager wiring
+    # ------------------------------------------------------------------
+    @property
+    def entity_manager(self) -> Any | None:
+        return self._entity_manager
+
+    @entity_manager.setter
+    def entity_manager(self, manager: Any | None) -> None:
+        self._entity_manager = manager
+        self._link_managers()
+
+    @property
+    def component_manager(self) -> Any | None:
+        return self._component_manager
+
+    @component_manager.setter
+    def component_manager(self, manager: Any | None) -> None:
+        self._component_manager = manager
+        self._link_managers()
+
+    def set_managers(self, entity_manager: Any | None, component_manager: Any | None) -> None:
+        """Install both managers, then link them once.
+
+        Assigning them one at a time would briefly bind the new entity
+        store to the old component manager, which moves its column data.
+        """
+        self._entity_manager = entity_manager
+        self._component_manager = component_manager
+        self._link_managers()
+
+    def _link_managers(self) -> None:
+        """Make the entity and component managers share one entity store."""
+        em = getattr(self, "_entity_manager", None)
+        cm = getattr(self, "_component_manager", None)
+        if em is None or cm is None or not hasattr(cm, "bind_entity_manager"):
+            return
+        cm.bind_entity_manager(em)
 
     # ------------------------------------------------------------------
     # Entity operations
@@ -98,19 +160,14 @@ class World:
         if not (0 <= x < self.size[0] and 0 <= y < self.size[1]):
             return
 
-        tile = {"kind": kind}
-        tile.update(self._resource_defs[kind])
-        self.tile_map[y][x] = tile
+        self.tiles.set_kind(x, y, kind)
 
     def generate_resources(self, seed: int | None = None) -> None:
-        """Populate ``tile_map`` with resource nodes using white-noise."""
-
-        data = noise.white_noise(self.size[0], self.size[1], seed=seed)
-        for y, row in enumerate(data):
-            for x, value in enumerate(row):
-                if value >= 0.98:
-                    self.spawn_resource("ore", x, y)
-                elif value >= 0.95:
-                    self.spawn_resource("wood", x, y)
-                elif value >= 0.9:
-                    self.spawn_resource("herbs", x, y)
\ No newline at end of file
+        """Populate ``tiles`` with resource nodes using white-noise."""
+
+        values = np.asarray(
+            noise.white_noise(self.size[0], self.size[1], seed=seed), dtype=float
+        )
+        # Ascending thresholds so rarer kinds overwrite common ones
+        for kind, threshold in (("herbs", 0.9), ("wood", 0.95), ("ore", 0.98)):
+            self.tiles.layer[values >= threshold] = self.tiles.kind_id(kind)
\ No newline at end of file
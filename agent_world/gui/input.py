@@ -53,6 +53,8 @@ def handle_events(world: Any, renderer: Any, queue: ActionQueue, state: Dict[str
                 world.fps_enabled = fps_enabled_now 
             elif ev.key == pygame.K_r:
                 commands.reload_abilities(world)
+            elif ev.key == pygame.K_t:
+                commands.systems(world, ["overlay"])
             
             elif ev.key == pygame.K_LEFT or ev.key == pygame.K_a:
                 renderer.pan_camera(-pan_speed_pixels, 0) # <<<<<<< Pass screen pixel delta
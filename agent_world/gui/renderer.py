@@ -25,6 +25,7 @@ TILE_COLOR_MAP = {
 }
 DEFAULT_TILE_GLYPH_COLOR = (200, 200, 200)
 ENTITY_OUTLINE_COLOR = (255, 100, 100) # A distinct color for entity outlines
+SYSTEM_OVERLAY_ROWS = 8 # Systems listed by the timing overlay
 
 class Renderer:
     """Minimal renderer dispatching drawing to a :class:`Window`."""
@@ -118,10 +119,12 @@ class Renderer:
         return world_x, world_y
 
     def _render_tiles(self, world: Any):
-        if not self.window or not hasattr(world, 'tile_map') or not hasattr(world, 'size'):
+        if not self.window or not hasattr(world, 'tiles') or not hasattr(world, 'size'):
             return
 
-        tile_map = world.tile_map
+        # Kind ids index straight into the per-kind tile definitions
+        tile_layer = world.tiles.layer
+        tile_defs = world.tiles.definitions()
         world_width, world_height = world.size
         
         screen_w_world = self.window.size[0] / self.zoom
@@ -138,10 +141,11 @@ class Renderer:
 
         for wy in range(min_vis_wy, max_vis_wy + 1): # Inclusive max for ceil
             if not (0 <= wy < world_height): continue
+            kind_row = tile_layer[wy].tolist()
             for wx in range(min_vis_wx, max_vis_wx + 1): # Inclusive max for ceil
                 if not (0 <= wx < world_width): continue
 
-                tile_data = tile_map[wy][wx] 
+                tile_data = tile_defs[kind_row[wx]]
                 screen_x, screen_y = self.world_to_screen(float(wx), float(wy))
 
                 color = TILE_COLOR_MAP["default"]
@@ -179,11 +183,7 @@ class Renderer:
 
         entity_render_details = [] # For debug
 
-        for entity_id in list(em.all_entities.keys()):
-            pos = cm.get_component(entity_id, Position)
-            if pos is None:
-                continue
-
+        for entity_id, pos in cm.query(Position):
             try:
                 # Get the base PIL image for the sprite, with an outline
                 base_sprite_pil = sprite_gen.get_sprite(entity_id, outline_colour=ENTITY_OUTLINE_COLOR)
@@ -233,4 +233,22 @@ class Renderer:
         cam_text = f"Cam({self.camera_world_x:.1f},{self.camera_world_y:.1f}) Zoom:{self.zoom:.2f} Ents:{num_entities} Tick:{current_tick}"
         self.window.draw_text(cam_text, 5, 25, (200,200,200))
 
+        if getattr(world, "systems_overlay", False):
+            self._render_system_timings(world)
+
+    def _render_system_timings(self, world: Any) -> None:
+        """Draw the slowest systems' p50/p95/p99 below the status line."""
+        timings = getattr(getattr(world, "systems_manager", None), "timings", None)
+        if timings is None:
+            return
+        y = 45
+        for row in timings.report()[:SYSTEM_OVERLAY_ROWS]:
+            colour = (255, 120, 120) if row["overruns"] else (200, 200, 200)
+            text = (
+                f"{row['name']}: {row['p50_ms']:.1f}/{row['p95_ms']:.1f}/"
+                f"{row['p99_ms']:.1f} ms"
+            )
+            self.window.draw_text(text, 5, y, colour)
+            y += 18
+
 __all__ = ["Renderer"]
\ No newline at end of file
@@ -16,6 +16,7 @@ ANGEL_ACTION = "ANGEL_ACTION"
 COMBAT_ATTACK = "COMBAT_ATTACK"
 COMBAT_DEATH = "COMBAT_DEATH"
 CRAFT = "CRAFT"
+ENTITY_LIMIT = "ENTITY_LIMIT"
 
 
 def _log_retention_bytes() -> int:
@@ -61,6 +62,23 @@ def append_event(
         fh.write(json.dumps(event, ensure_ascii=False) + "\n")
 
 
+def world_event_log_path(world: Any) -> Path:
+    """Return ``world.persistent_event_log_path``, defaulting it if unset."""
+
+    dest = getattr(world, "persistent_event_log_path", None)
+    if dest is None:
+        dest = Path("persistent_events.log")
+        setattr(world, "persistent_event_log_path", dest)
+    return dest
+
+
+def append_world_event(world: Any, event_type: str, data: Any) -> None:
+    """Append an event to ``world``'s persistent log at the current tick."""
+
+    tick = getattr(getattr(world, "time_manager", None), "tick_counter", 0)
+    append_event(world_event_log_path(world), tick, event_type, data)
+
+
 def iter_events(path: str | Path) -> Iterator[Dict[str, Any]]:
     """Yield events from ``path`` in the order they were logged."""
 
@@ -96,11 +114,14 @@ class EventLog:
 __all__ = [
     "EventLog",
     "append_event",
+    "append_world_event",
     "iter_events",
+    "world_event_log_path",
     "LLM_REQUEST",
     "LLM_RESPONSE",
     "ANGEL_ACTION",
     "COMBAT_ATTACK",
     "COMBAT_DEATH",
     "CRAFT",
+    "ENTITY_LIMIT",
 ]
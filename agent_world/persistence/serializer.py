@@ -6,6 +6,7 @@ import importlib
 from dataclasses import asdict, is_dataclass
 from typing import Any, Dict
 
+from ..core.column_store import ColumnComponent
 # Import components so their classes are discoverable during deserialisation.
 from ..core.components.known_abilities import KnownAbilitiesComponent  # noqa: F401
 from ..core.components.role import RoleComponent                       # noqa: F401
@@ -25,6 +26,10 @@ def serialize(obj: Any) -> Any:
         data = {k: serialize(v) for k, v in asdict(obj).items()}
         data["__class__"] = _class_path(obj)
         return data
+    if isinstance(obj, ColumnComponent):
+        data = obj.as_dict()
+        data["__class__"] = _class_path(obj)
+        return data
     if isinstance(obj, dict):
         return {str(k): serialize(v) for k, v in obj.items()}
     if isinstance(obj, (list, tuple)):
@@ -37,11 +42,11 @@ def deserialize(data: Any) -> Any:
 
     if isinstance(data, dict):
         if "__class__" in data:
-            class_path = data.pop("__class__")
-            module_name, cls_name = class_path.rsplit(".", 1)
+            module_name, cls_name = data["__class__"].rsplit(".", 1)
             module = importlib.import_module(module_name)
             cls = getattr(module, cls_name)
-            kwargs = {k: deserialize(v) for k, v in data.items()}
+            # ``data`` is left untouched so payloads can be applied twice
+            kwargs = {k: deserialize(v) for k, v in data.items() if k != "__class__"}
             return cls(**kwargs)
         return {k: deserialize(v) for k, v in data.items()}
     if isinstance(data, list):
@@ -59,12 +64,15 @@ def world_to_dict(world: "World") -> Dict[str, Any]:
 
     tick = world.time_manager.tick_counter if world.time_manager else 0
 
-    return {
+    data = {
         "size": list(world.size),
-        "tile_map": serialize(world.tile_map),
+        "tile_map": world.tiles.to_dict(),
         "entities": entities,
         "tick_counter": tick,
     }
+    if world.entity_manager is not None:
+        data["entity_allocator"] = world.entity_manager.allocator_state()
+    return data
 
 
 def world_from_dict(data: Dict[str, Any]) -> "World":
@@ -74,27 +82,28 @@ def world_from_dict(data: Dict[str, Any]) -> "World":
     from agent_world.core.entity_manager import EntityManager
     from agent_world.core.component_manager import ComponentManager
     from agent_world.core.time_manager import TimeManager
+    from agent_world.core.tile_grid import TileGrid
 
     world = World(tuple(data.get("size", (10, 10))))
 
-    world.tile_map = deserialize(data.get("tile_map", []))
+    tile_data = data.get("tile_map")
+    if isinstance(tile_data, dict):
+        world.tile_map = TileGrid.from_dict(tile_data)
+    elif tile_data:
+        # Saves written before the compact grid stored a list of tile rows.
+        world.tile_map = deserialize(tile_data)
 
     em = EntityManager()
+    cm = ComponentManager()
+    cm.bind_entity_manager(em)
     entities_data = data.get("entities", {})
-    max_id = 0
     for eid_str, comps in entities_data.items():
         eid = int(eid_str)
-        max_id = max(max_id, eid)
-        em._entity_components[eid] = {
-            name: deserialize(val) for name, val in comps.items()
-        }
-    em._next_id = max_id
+        em._entity_components[eid] = {}
+        for val in comps.values():
+            cm.add_component(eid, deserialize(val))
+    em.restore_allocator(data.get("entity_allocator"))
     world.entity_manager = em
-
-    cm = ComponentManager()
-    for eid, comps in em._entity_components.items():
-        for comp in comps.values():
-            cm.add_component(eid, comp)
     world.component_manager = cm
 
     tm = TimeManager()
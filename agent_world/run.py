@@ -0,0 +1,183 @@
+"""Fast-forward runner stepping the simulation without wall-clock pacing.
+
+``python -m agent_world.run --ticks 100000 --headless`` builds a world from
+``config.yaml`` and calls ``SystemsManager.update`` back to back, then
+reports ticks per second and the per-system timing breakdown. With
+``--headless`` neither pygame nor :mod:`agent_world.gui` is imported, so it
+runs on CI machines without a display.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence
+
+from .bootstrap import bootstrap, load_or_bootstrap
+
+logger = logging.getLogger(__name__)
+
+
+def run_ticks(
+    world: Any,
+    ticks: int,
+    on_tick: Callable[[Any], None] | None = None,
+    report_every: int = 0,
+) -> Dict[str, Any]:
+    """Advance ``world`` by ``ticks`` ticks as fast as possible.
+
+    ``on_tick`` is called after every tick (e.g. to render). Returns the
+    tick count, elapsed seconds, ticks per second and the systems' timing
+    report.
+    """
+
+    sm = world.systems_manager
+    tm = world.time_manager
+    angel = getattr(world, "angel_system_instance", None)
+    done = 0
+    start = time.perf_counter()
+    angel_pause_start: float | None = None
+    while done < ticks:
+        if world.paused_for_angel:
+            # Angel requests finish on their own time; honour the same
+            # timeout as the interactive loop rather than waiting forever.
+            now = time.perf_counter()
+            if angel_pause_start is None:
+                angel_pause_start = now
+            if angel is not None:
+                angel.process_pending_requests()
+            timeout = world.paused_for_angel_timeout_seconds
+            if timeout > 0 and now - angel_pause_start > timeout:
+                logger.warning("[Run] Angel pause exceeded %ss; resuming.", timeout)
+                world.paused_for_angel = False
+            if world.paused_for_angel:
+                time.sleep(0.001)
+                continue
+        angel_pause_start = None
+
+        sm.update(world, tm.tick_counter)
+        tm.tick_counter += 1
+        done += 1
+        if on_tick is not None:
+            on_tick(world)
+        if report_every and done % report_every == 0:
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "[Run] %s/%s ticks, %.1f ticks/s", done, ticks, done / elapsed if elapsed else 0.0
+            )
+
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": done,
+        "seconds": elapsed,
+        "ticks_per_sec": done / elapsed if elapsed > 0 else float("inf"),
+        "systems": sm.timings.report(),
+    }
+
+
+def populate(world: Any, npcs: int, seed: int = 0) -> int:
+    """Spawn ``npcs`` NPCs at seeded random positions; return how many spawned."""
+
+    from .utils.cli import commands
+
+    rng = random.Random(seed)
+    width, height = world.size
+    spawned = 0
+    for _ in range(npcs):
+        x, y = rng.randrange(width), rng.randrange(height)
+        if commands.spawn(world, "npc", str(x), str(y)) is not None:
+            spawned += 1
+    return spawned
+
+
+def _gui_callback(world: Any) -> Callable[[Any], None]:
+    """Return an ``on_tick`` hook drawing each tick; imports pygame lazily."""
+
+    import pygame
+
+    from .gui.renderer import Renderer
+
+    pygame.init()
+    pygame.font.init()
+    renderer = Renderer()
+    renderer.set_camera_center(world.size[0] / 2, world.size[1] / 2)
+
+    def draw(w: Any) -> None:
+        pygame.event.pump()
+        if renderer.window is None:
+            return
+        renderer.window.clear((30, 30, 30))
+        renderer.update(w)
+        renderer.window.refresh()
+
+    return draw
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks to simulate")
+    parser.add_argument(
+        "--headless", action="store_true", help="never import pygame or the GUI"
+    )
+    parser.add_argument("--config", type=Path, default=Path("config.yaml"))
+    parser.add_argument(
+        "--load", type=Path, default=None, help="start from a save file"
+    )
+    parser.add_argument(
+        "--scenario", default=None, help="scenario to set up, e.g. default_pickup"
+    )
+    parser.add_argument(
+        "--npcs", type=int, default=0, help="spawn this many NPCs (seeded)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --npcs")
+    parser.add_argument(
+        "--report-every", type=int, default=0, help="log progress every N ticks"
+    )
+    parser.add_argument(
+        "--json", type=Path, default=None, help="write the results to this file"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger(__name__).setLevel(logging.INFO)
+
+    if args.load is not None:
+        world = load_or_bootstrap(args.load, args.config)
+    else:
+        world = bootstrap(args.config)
+    # Set-up failures must not leak the systems manager's worker pool either
+    try:
+        world.gui_enabled = not args.headless
+        if args.scenario:
+            from .utils.cli import commands
+
+            commands.scenario(world, args.scenario)
+        if args.npcs:
+            populate(world, args.npcs, args.seed)
+        on_tick = None if args.headless else _gui_callback(world)
+        result = run_ticks(world, args.ticks, on_tick, args.report_every)
+    finally:
+        world.systems_manager.shutdown()
+
+    print(
+        f"{result['ticks']} ticks in {result['seconds']:.2f} s "
+        f"({result['ticks_per_sec']:.1f} ticks/s)"
+    )
+    print(f"{'system':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in result["systems"]:
+        print(
+            f"{row['name']:<24} {row['p50_ms']:>8.3f} "
+            f"{row['p95_ms']:>8.3f} {row['p99_ms']:>8.3f}"
+        )
+    if args.json is not None:
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual entry point
+    main()
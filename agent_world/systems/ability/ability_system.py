@@ -28,6 +28,11 @@ GLOBAL_ABILITY_EVENT_QUEUE: List[AbilityUseEvent] = []
 class AbilitySystem:
     """Load, hot-reload and execute ability modules."""
 
+    # Rescanning the ability directories is too costly for every tick.
+    # Cooldowns are checked against the world tick in use(), so they do
+    # not depend on how often update() runs.
+    interval = 5
+
     def __init__(
         self,
         world: Any,
@@ -179,9 +184,13 @@ class AbilitySystem:
     # ------------------------------------------------------------------
     # Update loop
     # ------------------------------------------------------------------
-    def update(self) -> None: # Called by SystemsManager
-        """Hot-reload modified abilities and advance cooldowns."""
-        self.cooldowns.tick()
+    def update(self, tick: Optional[int] = None) -> None: # Called by SystemsManager
+        """Hot-reload modified abilities and drop expired cooldowns."""
+        if tick is None:
+            self.cooldowns.tick()
+        else:
+            self.cooldowns.advance_to(tick)
+            self.cooldowns.prune()
         self._load_all() # This will scan for new/modified files
 
     # ------------------------------------------------------------------
@@ -194,6 +203,9 @@ class AbilitySystem:
             logger.warning(f"Agent {caster_id} tried to use unknown ability: '{ability_name}'")
             return False
         
+        tm = getattr(self.world, "time_manager", None)
+        if tm is not None:
+            self.cooldowns.advance_to(tm.tick_counter)
         if not self.cooldowns.available(caster_id, ability_name):
             logger.debug(f"Ability '{ability_name}' on cooldown for agent {caster_id}.")
             return False
@@ -210,7 +222,6 @@ class AbilitySystem:
             ability.execute(caster_id, self.world, target_id)
             self.cooldowns.set_cooldown(caster_id, ability_name, ability.cooldown)
 
-            tm = getattr(self.world, "time_manager", None)
             tick = tm.tick_counter if tm is not None else 0
             event = AbilityUseEvent(
                 caster_id=caster_id,
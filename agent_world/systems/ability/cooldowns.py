@@ -6,11 +6,18 @@ from typing import Dict
 
 
 class CooldownManager:
-    """Track remaining cooldown ticks for entity abilities."""
+    """Track when entity abilities come off cooldown.
+
+    Each cooldown is stored as the tick it expires on, measured on the
+    manager's clock. :meth:`tick` advances the clock and prunes expired
+    entries; :meth:`advance_to` jumps it to a world tick so checks stay
+    exact however rarely pruning runs.
+    """
 
     def __init__(self) -> None:
-        # Mapping of entity -> ability -> remaining ticks
+        # Mapping of entity -> ability -> expiry tick
         self._cooldowns: Dict[int, Dict[str, int]] = {}
+        self.now = 0
 
     # ------------------------------------------------------------------
     # Public API
@@ -20,23 +27,33 @@ class CooldownManager:
 
         if ticks <= 0:
             return
-        self._cooldowns.setdefault(entity_id, {})[ability] = ticks
+        self._cooldowns.setdefault(entity_id, {})[ability] = self.now + ticks
 
     def available(self, entity_id: int, ability: str) -> bool:
         """Return ``True`` if ``ability`` is not on cooldown for ``entity_id``."""
 
-        return self._cooldowns.get(entity_id, {}).get(ability, 0) <= 0
+        return self._cooldowns.get(entity_id, {}).get(ability, self.now) <= self.now
+
+    def advance_to(self, tick: int) -> None:
+        """Move the clock forward to ``tick``; earlier ticks are ignored."""
+
+        if tick > self.now:
+            self.now = tick
+
+    def tick(self, ticks: int = 1) -> None:
+        """Advance the clock by ``ticks`` ticks and drop expired cooldowns."""
+
+        self.now += ticks
+        self.prune()
 
-    def tick(self) -> None:
-        """Advance all cooldown timers by one tick."""
+    def prune(self) -> None:
+        """Forget cooldowns that have expired."""
 
+        now = self.now
         remove_entities: list[int] = []
         for ent, cds in self._cooldowns.items():
-            remove_abilities = [name for name, t in cds.items() if t - 1 <= 0]
-            for name in remove_abilities:
-                cds.pop(name, None)
-            for name in list(cds.keys()):
-                cds[name] -= 1
+            for name in [name for name, end in cds.items() if end <= now]:
+                del cds[name]
             if not cds:
                 remove_entities.append(ent)
         for ent in remove_entities:
@@ -11,9 +11,14 @@ logger = logging.getLogger(__name__)
 COOLDOWN_TICKS = 10 # How many ticks an agent waits after an LLM action before requesting another
 
 from ...core.components.ai_state import AIState
+from ...core.components.health import Health
+from ...core.components.inventory import Inventory
+from ...core.components.perception_cache import PerceptionCache
+from ...core.components.position import Position
 from ...ai.llm.prompt_builder import build_prompt
 from ...ai.llm.llm_manager import LLMManager
 from ...core.components.role import RoleComponent
+from ..interaction.pickup import Tag
 from .behavior_tree import BehaviorTree, build_fallback_tree
 from .actions import parse_action_string, ActionQueue
 
@@ -46,6 +51,16 @@ PROMPT_ID_PATTERN = re.compile(r"^[a-f0-9]{32}$")
 class AIReasoningSystem:
     """Query the LLM for each agent and queue resulting actions."""
 
+    # Prompt inputs (nearby entities come from the spatial index's layers),
+    # plus the agent state and action outputs it updates. Fallback trees
+    # may path with ``a_star``, whose misses fill the shared path cache.
+    # Declared so the wait on LLM I/O can overlap other systems.
+    reads = (
+        Position, Health, Inventory, RoleComponent, PerceptionCache, Tag,
+        "abilities", "obstacles", "spatial_index",
+    )
+    writes = (AIState, "raw_actions", "action_queue", "llm", "path_cache")
+
     def __init__(
         self,
         world: Any,
@@ -72,15 +87,10 @@ class AIReasoningSystem:
         ]):
             return
 
-        em = self.world.entity_manager
         cm = self.world.component_manager
         tm = self.world.time_manager
         
-        for entity_id in list(em.all_entities.keys()):
-            ai_comp = cm.get_component(entity_id, AIState)
-            if ai_comp is None:
-                continue
-
+        for entity_id, ai_comp in sorted(cm.query(AIState)):
             role_comp = cm.get_component(entity_id, RoleComponent)
             if role_comp and not role_comp.uses_llm:
                 if self.behavior_tree:
@@ -30,9 +30,7 @@ class BehaviorTreeSystem:
         if em is None or cm is None or out is None:
             return
 
-        for entity_id in list(em.all_entities.keys()):
-            if cm.get_component(entity_id, AIState) is None:
-                continue
+        for entity_id in sorted(cm.entities_with(AIState)):
             role_comp = cm.get_component(entity_id, RoleComponent)
             role = role_comp.role_name if role_comp else None
             tree = self.role_trees.get(role, self.default_tree)
@@ -26,7 +26,6 @@ class EventPerceptionSystem:
         if self.world.entity_manager is None or self.world.component_manager is None:
             return
 
-        em = self.world.entity_manager
         cm = self.world.component_manager
         new_events = self.event_queue[self._last_index :]
         self._last_index = len(self.event_queue)
@@ -35,10 +34,8 @@ class EventPerceptionSystem:
             relevant = {event.caster_id}
             if event.target_id is not None:
                 relevant.add(event.target_id)
-            for entity_id in list(em.all_entities.keys()):
+            for entity_id in sorted(cm.entities_with(PerceptionCache)):
                 cache = cm.get_component(entity_id, PerceptionCache)
-                if cache is None:
-                    continue
                 if not any(eid in cache.visible for eid in relevant):
                     continue
                 log = cm.get_component(entity_id, EventLog)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import random
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
+
+import numpy as np
 
 from ...core.components.position import Position
 from ...core.components.health import Health
@@ -33,6 +35,19 @@ class CombatSystem:
         dy = a.y - b.y
         return dx * dx + dy * dy <= 1
 
+    @staticmethod
+    def living_filter(cm: Any) -> Callable[[np.ndarray], np.ndarray]:
+        """Return a ``k_nearest`` filter keeping ids with ``Health.cur > 0``."""
+
+        def alive(ids: np.ndarray) -> np.ndarray:
+            mask = np.zeros(len(ids), dtype=bool)
+            for i, entity_id in enumerate(ids.tolist()):
+                hp = cm.get_component(entity_id, Health)
+                mask[i] = hp is not None and hp.cur > 0
+            return mask
+
+        return alive
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -96,9 +111,14 @@ class CombatSystem:
             data["dodged"] = True
         append_event(dest, tick_val, COMBAT_ATTACK, data)
 
+        cm.mark_changed(target, Health)
         if hp.cur <= 0:
             death_data = {"entity": target, "killer": attacker}
             append_event(dest, tick_val, COMBAT_DEATH, death_data)
+            # The dead leave guarded layers such as the agent layer
+            layers = getattr(self.world, "spatial_layers", None)
+            if layers is not None:
+                layers.refresh(target)
         return True
 
 
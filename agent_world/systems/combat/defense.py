@@ -8,7 +8,7 @@ from typing import Dict
 from .damage_types import DamageType
 
 
-@dataclass
+@dataclass(slots=True)
 class Defense:
     """Per-damage-type armor and dodge chances."""
 
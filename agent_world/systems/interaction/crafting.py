@@ -8,7 +8,7 @@ from typing import Any, Dict, List
 
 from ...core.components.inventory import Inventory
 from ...core.components.ownership import Ownership
-from ...persistence.event_log import append_event, CRAFT
+from ...persistence.event_log import append_world_event, CRAFT, ENTITY_LIMIT
 
 
 class CraftingSystem:
@@ -64,6 +64,20 @@ class CraftingSystem:
         if inv is None or len(inv.items) < recipe["inputs"]:
             return False
 
+        remaining = em.remaining_capacity()
+        if remaining is not None and remaining < recipe["outputs"]:
+            # Backpressure: refuse rather than consume inputs for lost outputs
+            self._append_event(
+                ENTITY_LIMIT,
+                {
+                    "entity": entity_id,
+                    "recipe": recipe_id,
+                    "requested": recipe["outputs"],
+                    "remaining": remaining,
+                },
+            )
+            return False
+
         consumed: List[int] = [inv.items.pop(0) for _ in range(recipe["inputs"])]
         produced: List[int] = []
         for _ in range(recipe["outputs"]):
@@ -72,21 +86,17 @@ class CraftingSystem:
             inv.items.append(item_id)
             produced.append(item_id)
 
-        dest = getattr(self.world, "persistent_event_log_path", None)
-        if dest is None:
-            dest = Path("persistent_events.log")
-            setattr(self.world, "persistent_event_log_path", dest)
-
-        tick = getattr(getattr(self.world, "time_manager", None), "tick_counter", 0)
-
         data = {
             "entity": entity_id,
             "recipe": recipe_id,
             "consumed": consumed,
             "produced": produced,
         }
-        append_event(dest, tick, CRAFT, data)
+        self._append_event(CRAFT, data)
         return True
 
+    def _append_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        append_world_event(self.world, event_type, data)
+
 
 __all__ = ["CraftingSystem"]
@@ -8,9 +8,10 @@ from typing import Any
 from ...core.components.position import Position
 from ...core.components.inventory import Inventory
 from ...core.components.ownership import Ownership
+from ...core.spatial.layers import ITEM_LAYER
 
 
-@dataclass
+@dataclass(slots=True)
 class Tag:
     """Simple tag component used for categorising entities."""
 
@@ -36,25 +37,30 @@ class PickupSystem:
         ):
             return
 
-        em = self.world.entity_manager
         cm = self.world.component_manager
         index = self.world.spatial_index
+        commands = self.world.command_buffer
+        # With an item layer the index hands back items only
+        has_layer = getattr(index, "has_layer", None)
+        layer = ITEM_LAYER if has_layer is not None and has_layer(ITEM_LAYER) else None
 
-        # Iterate over actors that can carry items
-        for entity_id in list(em.all_entities.keys()):
-            pos = cm.get_component(entity_id, Position)
-            inv = cm.get_component(entity_id, Inventory)
-            if pos is None or inv is None:
-                continue
-
+        # Iterate over actors that can carry items; lower ids pick up first
+        for entity_id, pos, inv in sorted(cm.query(Position, Inventory)):
             # Look for items occupying the same position
-            for other_id in index.query_radius((pos.x, pos.y), 0):
+            # Copied: picked-up items are removed from the index below
+            occupants = (
+                index.occupants((pos.x, pos.y), layer=layer)
+                if layer is not None
+                else index.occupants((pos.x, pos.y))
+            )
+            for other_id in tuple(occupants):
                 if other_id == entity_id:
                     continue
 
-                tag = cm.get_component(other_id, Tag)
-                if tag is None or tag.name != "item":
-                    continue
+                if layer is None:
+                    tag = cm.get_component(other_id, Tag)
+                    if tag is None or tag.name != "item":
+                        continue
 
                 if len(inv.items) >= inv.capacity:
                     continue
@@ -62,12 +68,13 @@ class PickupSystem:
                 # Copy or assign ownership to the item
                 ownership = cm.get_component(other_id, Ownership)
                 if ownership is None:
-                    cm.add_component(other_id, Ownership(owner_id=entity_id))
+                    commands.add_component(other_id, Ownership(owner_id=entity_id))
                 else:
                     ownership.owner_id = entity_id
 
+                # The item stays alive as an owned inventory entry but
+                # leaves the map.
                 inv.items.append(other_id)
-                em.destroy_entity(other_id)
-                cm.remove_component(other_id, Position)
-                cm.remove_component(other_id, Tag)
+                commands.remove_component(other_id, Position)
+                commands.remove_component(other_id, Tag)
                 index.remove(other_id)
@@ -37,26 +37,16 @@ class StealingSystem:
         if em is None or cm is None:
             return
 
-        entities = list(em.all_entities.keys())
-        for thief_id in entities:
-            pos_t = cm.get_component(thief_id, Position)
-            inv_t = cm.get_component(thief_id, Inventory)
-            if pos_t is None or inv_t is None:
-                continue
+        # In id order, so the thief and victim do not depend on row order
+        carriers = sorted(cm.query(Position, Inventory))
+        for thief_id, pos_t, inv_t in carriers:
             if len(inv_t.items) >= inv_t.capacity:
                 continue
 
-            for victim_id in entities:
+            for victim_id, pos_v, inv_v in carriers:
                 if victim_id == thief_id:
                     continue
-                pos_v = cm.get_component(victim_id, Position)
-                inv_v = cm.get_component(victim_id, Inventory)
-                if (
-                    pos_v is None
-                    or inv_v is None
-                    or not inv_v.items
-                    or (pos_v.x, pos_v.y) != (pos_t.x, pos_t.y)
-                ):
+                if not inv_v.items or (pos_v.x, pos_v.y) != (pos_t.x, pos_t.y):
                     continue
 
                 inv_t.items.append(inv_v.items.pop(0))
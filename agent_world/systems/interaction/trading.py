@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Tuple
 
+from ...core.spatial.layers import ITEM_LAYER
 from .pickup import Tag
 
 # ----------------------------------------------------------------------
@@ -21,24 +22,10 @@ BASE_VALUES: Dict[str, int] = {
 def _count_resources(world: Any, kind: str, pos: Tuple[int, int], radius: int) -> int:
     """Return number of resource tiles of ``kind`` within ``radius`` of ``pos``."""
 
-    tile_map = getattr(world, "tile_map", None)
-    if not tile_map:
+    tiles = getattr(world, "tiles", None)
+    if tiles is None:
         return 0
-
-    width = len(tile_map[0])
-    height = len(tile_map)
-    x0 = max(0, pos[0] - radius)
-    x1 = min(width - 1, pos[0] + radius)
-    y0 = max(0, pos[1] - radius)
-    y1 = min(height - 1, pos[1] + radius)
-
-    count = 0
-    for y in range(y0, y1 + 1):
-        for x in range(x0, x1 + 1):
-            tile = tile_map[y][x]
-            if tile and tile.get("kind") == kind:
-                count += 1
-    return count
+    return tiles.count(kind, pos[0] - radius, pos[1] - radius, pos[0] + radius, pos[1] + radius)
 
 
 def _count_items(world: Any, pos: Tuple[int, int], radius: int) -> int:
@@ -49,6 +36,10 @@ def _count_items(world: Any, pos: Tuple[int, int], radius: int) -> int:
     if spatial is None or cm is None:
         return 0
 
+    has_layer = getattr(spatial, "has_layer", None)
+    if has_layer is not None and has_layer(ITEM_LAYER):
+        return len(spatial.query_radius(pos, radius, layer=ITEM_LAYER))
+
     count = 0
     for ent in spatial.query_radius(pos, radius):
         tag = cm.get_component(ent, Tag)
@@ -106,23 +97,19 @@ class TradingSystem:
         if em is None or cm is None:
             return
 
-        entities = list(em.all_entities.keys())
-
-        for i, a in enumerate(entities):
-            pos_a = cm.get_component(a, Position)
-            inv_a = cm.get_component(a, Inventory)
-            if pos_a is None or inv_a is None or not inv_a.items:
+        # Each unordered pair is visited once: ``b`` only after ``a`` was seen.
+        # In id order, so the lower id of a pair always initiates.
+        traders = sorted(cm.query(Position, Inventory))
+        seen: set[int] = set()
+        for a, pos_a, inv_a in traders:
+            seen.add(a)
+            if not inv_a.items:
                 continue
 
-            for b in entities[i + 1 :]:
-                pos_b = cm.get_component(b, Position)
-                inv_b = cm.get_component(b, Inventory)
-                if (
-                    pos_b is None
-                    or inv_b is None
-                    or not inv_b.items
-                    or (pos_a.x, pos_a.y) != (pos_b.x, pos_b.y)
-                ):
+            for b, pos_b, inv_b in traders:
+                if b in seen:
+                    continue
+                if not inv_b.items or (pos_a.x, pos_a.y) != (pos_b.x, pos_b.y):
                     continue
 
                 item_a = inv_a.items.pop(0)
@@ -0,0 +1,410 @@
+"""Hierarchical pathfinding (HPA*) over an :class:`ObstacleGrid`.
+
+The map is cut into square clusters. Wherever two neighbouring clusters
+share a run of walkable border tiles they are linked by one or two
+entrances. Entrance tiles form an abstract graph whose edges are single
+steps across a border and shortest distances inside a cluster. A query
+searches that graph and then refines each hop with a search confined to
+one cluster, so the cost grows with the clusters crossed rather than the
+tiles in between, and an unreachable goal floods entrances, not tiles.
+
+Intra-cluster distances are computed the first time a search reaches a
+cluster. Obstacle changes re-scan only the borders of the clusters they
+touch and mark those clusters and their neighbours for recomputation.
+"""
+
+from __future__ import annotations
+
+import logging
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .pathfinding import Coord, ObstacleGrid
+
+logger = logging.getLogger(__name__)
+
+Cluster = Tuple[int, int]
+Border = Tuple[Cluster, Cluster]
+
+DEFAULT_CLUSTER_SIZE = 32
+# Worlds smaller than this on both sides search the tile grid directly
+HIERARCHY_MIN_SIZE = 256
+# Border runs at least this long get an entrance at each end
+ENTRANCE_SPLIT = 6
+
+
+def _runs(free: np.ndarray) -> Iterable[Tuple[int, int]]:
+    """Yield ``[start, end)`` of the runs of ``True`` in ``free``."""
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], free.astype(np.int8), [0]))))
+    return zip(edges[::2].tolist(), edges[1::2].tolist())
+
+
+def _distance(a: Coord, b: Coord) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class _ClusterMap:
+    """Walkability of one cluster as a flat bytearray with a wall border."""
+
+    __slots__ = ("cells", "stride", "ox", "oy")
+
+    def __init__(self, grid: ObstacleGrid, rect: Tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = rect
+        blocked = np.ones((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+        blocked[1:-1, 1:-1] = grid.window(x0, y0, x1, y1)
+        self.cells = bytearray(blocked.tobytes())
+        self.stride = x1 - x0 + 2
+        self.ox = x0 - 1
+        self.oy = y0 - 1
+
+    def index(self, node: Coord) -> int:
+        return (node[1] - self.oy) * self.stride + (node[0] - self.ox)
+
+    def coord(self, index: int) -> Coord:
+        y, x = divmod(index, self.stride)
+        return (x + self.ox, y + self.oy)
+
+    def bfs(
+        self, source: Coord, targets: Iterable[Coord], parents: bool = False
+    ) -> Tuple[Dict[Coord, int], Optional[List[int]]]:
+        """Return distances from ``source`` to the reachable ``targets``.
+
+        Stops once every target is found. With ``parents`` the predecessor
+        array is returned too, for :meth:`path`.
+        """
+
+        cells = self.cells
+        stride = self.stride
+        wanted = {self.index(node): node for node in targets}
+        dist = [-1] * len(cells)
+        parent = [-1] * len(cells) if parents else None
+        start = self.index(source)
+        dist[start] = 0
+        found: Dict[Coord, int] = {}
+        if start in wanted:
+            found[wanted[start]] = 0
+        frontier = [start]
+        depth = 0
+        while frontier and len(found) < len(wanted):
+            depth += 1
+            nxt_frontier = []
+            for current in frontier:
+                for nxt in (current + 1, current - 1, current + stride, current - stride):
+                    if cells[nxt] or dist[nxt] != -1:
+                        continue
+                    dist[nxt] = depth
+                    if parent is not None:
+                        parent[nxt] = current
+                    nxt_frontier.append(nxt)
+                    if nxt in wanted:
+                        found[wanted[nxt]] = depth
+            frontier = nxt_frontier
+        return found, parent
+
+    def path(self, source: Coord, goal: Coord) -> List[Coord]:
+        """Return a shortest path from ``source`` to ``goal`` inside the cluster."""
+
+        found, parent = self.bfs(source, (goal,), parents=True)
+        if goal not in found or parent is None:
+            return []
+        index = self.index(goal)
+        path = [goal]
+        start = self.index(source)
+        while index != start:
+            index = parent[index]
+            path.append(self.coord(index))
+        path.reverse()
+        return path
+
+
+class HierarchicalPathfinder:
+    """HPA* over ``grid`` restricted to a ``(width, height)`` map.
+
+    :meth:`path` matches the :func:`~.pathfinding.a_star` signature, so it can be
+    handed to :func:`~.pathfinding.set_path_search`. Paths are valid but
+    may be a few steps longer than the shortest, since they pass through
+    entrance tiles. Endpoints off the map have no path.
+    """
+
+    def __init__(
+        self,
+        grid: ObstacleGrid,
+        size: Tuple[int, int],
+        cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    ) -> None:
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        self.grid = grid
+        self.width, self.height = size
+        self.cluster_size = cluster_size
+        self.cols = -(-self.width // cluster_size)
+        self.rows = -(-self.height // cluster_size)
+        grid.resize(size)
+        # Border -> (tile in first cluster, tile in second cluster) pairs
+        self._borders: Dict[Border, List[Tuple[Coord, Coord]]] = {}
+        self._nodes: Dict[Cluster, Set[Coord]] = {}
+        # Entrance tile -> number of transitions using it
+        self._refs: Dict[Coord, int] = {}
+        self._edges: Dict[Coord, Dict[Coord, int]] = {}
+        # Clusters whose intra-cluster edges need recomputing
+        self._dirty: Set[Cluster] = set()
+        self._version: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+    def cluster_of(self, node: Coord) -> Cluster:
+        return (node[0] // self.cluster_size, node[1] // self.cluster_size)
+
+    def rect(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Return ``(x0, y0, x1, y1)`` tile bounds of ``cluster``."""
+
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(x0 + size, self.width), min(y0 + size, self.height)
+
+    def _neighbours(self, cluster: Cluster) -> List[Cluster]:
+        cx, cy = cluster
+        return [
+            (nx, ny)
+            for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+            if 0 <= nx < self.cols and 0 <= ny < self.rows
+        ]
+
+    def _on_map(self, node: Coord) -> bool:
+        return 0 <= node[0] < self.width and 0 <= node[1] < self.height
+
+    # ------------------------------------------------------------------
+    # Abstract graph maintenance
+    # ------------------------------------------------------------------
+    def _scan(self, border: Border) -> List[Tuple[Coord, Coord]]:
+        """Return the entrance pairs across ``border``."""
+
+        (ax, ay), (bx, by) = border
+        x0, y0, x1, y1 = self.rect((ax, ay))
+        pairs: List[Tuple[Coord, Coord]] = []
+        if bx != ax:  # east border: columns x1 - 1 | x1
+            sides = self.grid.window(x1 - 1, y0, x1 + 1, y1)
+            for start, end in _runs((sides[:, 0] == 0) & (sides[:, 1] == 0)):
+                for y in self._entrances(start, end):
+                    pairs.append(((x1 - 1, y0 + y), (x1, y0 + y)))
+        else:  # south border: rows y1 - 1 | y1
+            sides = self.grid.window(x0, y1 - 1, x1, y1 + 1)
+            for start, end in _runs((sides[0] == 0) & (sides[1] == 0)):
+                for x in self._entrances(start, end):
+                    pairs.append(((x0 + x, y1 - 1), (x0 + x, y1)))
+        return pairs
+
+    @staticmethod
+    def _entrances(start: int, end: int) -> Tuple[int, ...]:
+        if end - start >= ENTRANCE_SPLIT:
+            return (start, end - 1)
+        return ((start + end - 1) // 2,)
+
+    def _link(self, node: Coord, other: Coord) -> None:
+        for tile in (node, other):
+            refs = self._refs.get(tile, 0)
+            if not refs:
+                self._nodes.setdefault(self.cluster_of(tile), set()).add(tile)
+                self._edges[tile] = {}
+            self._refs[tile] = refs + 1
+        self._edges[node][other] = 1
+        self._edges[other][node] = 1
+
+    def _unlink(self, node: Coord, other: Coord) -> None:
+        self._edges[node].pop(other, None)
+        self._edges[other].pop(node, None)
+        for tile in (node, other):
+            refs = self._refs[tile] - 1
+            if refs:
+                self._refs[tile] = refs
+                continue
+            del self._refs[tile]
+            self._nodes[self.cluster_of(tile)].discard(tile)
+            for neighbour in self._edges.pop(tile):
+                self._edges[neighbour].pop(tile, None)
+
+    def _rescan(self, clusters: Iterable[Cluster]) -> None:
+        """Re-scan every border of ``clusters`` and mark affected clusters dirty."""
+
+        borders: Set[Border] = set()
+        for cluster in clusters:
+            self._dirty.add(cluster)
+            for neighbour in self._neighbours(cluster):
+                self._dirty.add(neighbour)
+                borders.add((min(cluster, neighbour), max(cluster, neighbour)))
+        for border in borders:
+            for node, other in self._borders.pop(border, ()):
+                self._unlink(node, other)
+            pairs = self._scan(border)
+            for node, other in pairs:
+                self._link(node, other)
+            if pairs:
+                self._borders[border] = pairs
+
+    def _build(self) -> None:
+        self._borders.clear()
+        self._nodes.clear()
+        self._refs.clear()
+        self._edges.clear()
+        self._dirty.clear()
+        self._rescan((cx, cy) for cx in range(self.cols) for cy in range(self.rows))
+        logger.debug(
+            "[Path] Built %sx%s cluster hierarchy with %s entrances",
+            self.cols,
+            self.rows,
+            len(self._edges),
+        )
+
+    def sync(self) -> None:
+        """Catch up with obstacle changes made since the last query."""
+
+        version = self.grid.version
+        if version == self._version:
+            return
+        changes = None if self._version is None else self.grid.changes_since(self._version)
+        if changes is None:
+            self._build()
+        else:
+            self._rescan({self.cluster_of(node) for node, _blocked in changes if self._on_map(node)})
+        self._version = version
+
+    def precompute(self) -> None:
+        """Compute every intra-cluster distance now instead of on first use."""
+
+        self.sync()
+        for cluster in list(self._dirty):
+            self._ensure(cluster)
+
+    def _ensure(self, cluster: Cluster) -> None:
+        """Compute intra-cluster distances of ``cluster`` if they are stale."""
+
+        if cluster not in self._dirty:
+            return
+        self._dirty.discard(cluster)
+        nodes = self._nodes.get(cluster)
+        if not nodes:
+            return
+        edges = self._edges
+        for node in nodes:
+            for neighbour in [n for n in edges[node] if self.cluster_of(n) == cluster]:
+                del edges[node][neighbour]
+        cmap = _ClusterMap(self.grid, self.rect(cluster))
+        ordered = sorted(nodes)
+        for i, node in enumerate(ordered):
+            found, _parent = cmap.bfs(node, ordered[i + 1 :])
+            for other, dist in found.items():
+                edges[node][other] = dist
+                edges[other][node] = dist
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def path(self, start: Coord, goal: Coord) -> List[Coord]:
+        """Return a path from ``start`` to ``goal`` or ``[]`` if none exists."""
+
+        if start == goal:
+            return [start]
+        if not (self._on_map(start) and self._on_map(goal)):
+            return []
+        if start in self.grid or goal in self.grid:
+            return []
+        self.sync()
+
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        start_map = _ClusterMap(self.grid, self.rect(start_cluster))
+        goal_map = (
+            start_map
+            if goal_cluster == start_cluster
+            else _ClusterMap(self.grid, self.rect(goal_cluster))
+        )
+        targets = set(self._nodes.get(start_cluster, ()))
+        if goal_cluster == start_cluster:
+            targets.add(goal)
+        start_edges, _parent = start_map.bfs(start, targets)
+        goal_edges, _parent = goal_map.bfs(goal, self._nodes.get(goal_cluster, ()))
+        if goal not in start_edges and (not start_edges or not goal_edges):
+            # One end is sealed inside its cluster
+            return []
+
+        route = self._abstract_search(start, goal, start_edges, goal_edges)
+        if not route:
+            return []
+        return self._refine(route, start_map, goal_map)
+
+    def _abstract_search(
+        self,
+        start: Coord,
+        goal: Coord,
+        start_edges: Dict[Coord, int],
+        goal_edges: Dict[Coord, int],
+    ) -> List[Coord]:
+        gx, gy = goal
+        g: Dict[Coord, int] = {start: 0}
+        parent: Dict[Coord, Coord] = {}
+        open_heap = [(_distance(start, goal), 0, start)]
+        while open_heap:
+            _f, neg_g, current = heappop(open_heap)
+            cost = -neg_g
+            if current == goal:
+                route = [goal]
+                while route[-1] != start:
+                    route.append(parent[route[-1]])
+                route.reverse()
+                return route
+            if cost != g[current]:
+                continue
+            if current == start:
+                edges: Dict[Coord, int] = start_edges
+                if start in self._edges:  # starting on an entrance
+                    self._ensure(self.cluster_of(start))
+                    edges = {**self._edges[start], **start_edges}
+            else:
+                self._ensure(self.cluster_of(current))
+                edges = self._edges[current]
+            if current in goal_edges:
+                edges = {**edges, goal: goal_edges[current]}
+            for nxt, step in edges.items():
+                new_cost = cost + step
+                known = g.get(nxt)
+                if known is not None and known <= new_cost:
+                    continue
+                g[nxt] = new_cost
+                parent[nxt] = current
+                heappush(
+                    open_heap,
+                    (new_cost + abs(nxt[0] - gx) + abs(nxt[1] - gy), -new_cost, nxt),
+                )
+        return []
+
+    def _refine(
+        self, route: List[Coord], start_map: _ClusterMap, goal_map: _ClusterMap
+    ) -> List[Coord]:
+        path = [route[0]]
+        last = len(route) - 2
+        for hop, (node, nxt) in enumerate(zip(route, route[1:])):
+            if node == nxt:
+                continue
+            cluster = self.cluster_of(node)
+            if cluster != self.cluster_of(nxt):
+                path.append(nxt)  # step across a border
+                continue
+            if hop == 0:
+                cmap = start_map
+            elif hop == last:
+                cmap = goal_map
+            else:
+                cmap = _ClusterMap(self.grid, self.rect(cluster))
+            path.extend(cmap.path(node, nxt)[1:])
+        return path
+
+
+__all__ = [
+    "HierarchicalPathfinder",
+    "DEFAULT_CLUSTER_SIZE",
+    "HIERARCHY_MIN_SIZE",
+]
@@ -9,6 +9,7 @@ from typing import Any, Dict, List
 import logging
 
 from .pathfinding import is_blocked
+from .physics_system import PhysicsSystem
 
 from ...core.components.position import Position
 from ...core.components.physics import Physics
@@ -17,7 +18,7 @@ from ...core.components.ai_state import AIState # <<< ADDED for last_bt_move_fai
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Velocity:
     """Per-tick delta movement for an entity."""
     dx: int
@@ -27,6 +28,11 @@ class Velocity:
 class MovementSystem:
     """Update entity positions based on attached :class:`Physics` or :class:`Velocity`."""
 
+    reads = (Physics, Velocity, "obstacles")
+    writes = (Position, AIState, "spatial_index")
+    # Moves use the velocities PhysicsSystem settled this tick
+    after = (PhysicsSystem,)
+
     def __init__(
         self, world: Any, event_log: List[Dict[str, Any]] | None = None
     ) -> None:
@@ -47,28 +53,28 @@ class MovementSystem:
 
         batch_updates_for_spatial_index: list[tuple[int, tuple[int, int]]] = []
 
-        for entity_id in list(em.all_entities.keys()):
-            pos = cm.get_component(entity_id, Position)
-            ai_state = cm.get_component(entity_id, AIState) # Get AIState for the flag
-
-            if pos is None:
-                continue
+        # Physics takes precedence over a Velocity component on the same entity
+        movers: list[tuple[int, Position, int, int]] = [
+            (entity_id, pos, int(round(phys.vx)), int(round(phys.vy)))
+            for entity_id, pos, phys in cm.query(Position, Physics)
+        ]
+        for entity_id, pos, vel in cm.query(Position, Velocity):
+            if cm.get_component(entity_id, Physics) is None:
+                movers.append((entity_id, pos, vel.dx, vel.dy))
+        # Lower ids claim contested tiles first, whatever the row order
+        movers.sort(key=lambda mover: mover[0])
+
+        # Agents without any velocity source made no move attempt this tick
+        for entity_id, ai_state, _pos in cm.query(AIState, Position):
+            if (
+                cm.get_component(entity_id, Physics) is None
+                and cm.get_component(entity_id, Velocity) is None
+            ):
+                ai_state.last_bt_move_failed = False
 
+        for entity_id, pos, dx_intent, dy_intent in movers:
+            ai_state = cm.get_component(entity_id, AIState) # Get AIState for the flag
             original_pos_tuple = (pos.x, pos.y)
-            dx_intent, dy_intent = 0, 0
-
-            phys = cm.get_component(entity_id, Physics)
-            if phys is not None:
-                dx_intent = int(round(phys.vx))
-                dy_intent = int(round(phys.vy))
-            else:
-                vel = cm.get_component(entity_id, Velocity)
-                if vel is not None:
-                    dx_intent, dy_intent = vel.dx, vel.dy
-                else:
-                    if ai_state: # If no velocity source but has AIState, it means no move was attempted
-                        ai_state.last_bt_move_failed = False # Reset flag if no move was even tried
-                    continue
 
             if dx_intent == 0 and dy_intent == 0:
                 if ai_state: # No intent to move, so not a "failed" move
@@ -97,10 +103,9 @@ class MovementSystem:
                     new_y,
                 )
             else:
-                occupants_at_target = index.query_radius((new_x, new_y), 0)
-                is_occupied_by_other = any(occ_id != entity_id for occ_id in occupants_at_target)
-                if is_occupied_by_other:
+                if index.is_occupied((new_x, new_y), exclude=entity_id):
                     move_blocked = True
+                    occupants_at_target = sorted(index.occupants((new_x, new_y)))
                     logger.info(
                         "[Tick %s] MovementSystem: Entity %s blocked by other entity at (%s,%s). Occupants: %s",
                         tick,
@@ -131,6 +136,7 @@ class MovementSystem:
             # If all checks pass, update position
             pos.x = new_x
             pos.y = new_y
+            cm.mark_changed(entity_id, Position)
             if ai_state:  # Successful move
                 ai_state.last_bt_move_failed = False
                 logger.debug(
@@ -152,9 +158,8 @@ class MovementSystem:
                 batch_updates_for_spatial_index.append((entity_id, (pos.x, pos.y)))
 
         if batch_updates_for_spatial_index:
-            for entity_id_moved, _ in batch_updates_for_spatial_index:
-                index.remove(entity_id_moved) 
-            index.insert_many(batch_updates_for_spatial_index)
+            # Only entities that changed cell touch the cell sets
+            index.move_many(batch_updates_for_spatial_index)
 
 
 __all__ = ["Velocity", "MovementSystem"]
\ No newline at end of file
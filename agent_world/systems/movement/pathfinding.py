@@ -1,22 +1,329 @@
-"""Basic grid-based pathfinding helpers."""
+"""Basic grid-based pathfinding helpers.
+
+Obstacles live in :data:`OBSTACLES`, an :class:`ObstacleGrid` that behaves
+like a ``set`` of coordinates but stores them as a bitmap. Searches run on
+flat tile indices into that bitmap with reusable cost/parent arrays.
+:func:`a_star` answers repeated queries from :data:`PATH_CACHE` and
+searches misses with plain A* (:func:`grid_a_star`), or with Jump Point
+Search (:func:`jps`) once the map is maze-like: JPS skips runs of
+equivalent corridor tiles, but its row scans from every column tile cost
+more than they save on open ground.
+"""
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import MutableSet
 from heapq import heappop, heappush
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
 
 
 Coord = Tuple[int, int]
+PathSearch = Callable[[Coord, Coord], List[Coord]]
+
+# Width of the margin around the covered area: an inner ring, free on an
+# unsized grid so paths can go around obstacles on its edge and a wall once
+# the map size is known, then a ring of walls ending the search.
+_MARGIN = 2
+# Obstacle changes remembered for cache validation; older entries are dropped
+CHANGE_LOG_LIMIT = 4096
+DEFAULT_PATH_CACHE_SIZE = 1024
+# Blocked fraction of the map from which cache misses use :func:`jps`;
+# below it :func:`grid_a_star` is as fast or faster (see
+# ``utils/benchmarks/pathfinding.py``)
+MAZE_DENSITY = 0.35
+
+
+class ObstacleGrid(MutableSet):
+    """Set of blocked tiles backed by a bitmap.
+
+    Once :meth:`resize` (or the constructor) gives it a map size, the bitmap
+    covers exactly that map and is walled in, so searches stay on the map
+    and never grow it; obstacles added off the map are kept in a plain set.
+    Until then tiles outside the bitmap are free and it grows to cover any
+    tile added or searched from, with a free ring around it. Either way a
+    ring of sentinel walls ends every search, so none needs a bounds check.
+
+    ``version`` increases with every change. The most recent changes are
+    kept so :class:`PathCache` can tell which cached paths they affect.
+    """
+
+    def __init__(self, width: int = 0, height: int = 0) -> None:
+        self._x0 = 0
+        self._y0 = 0
+        self._x1 = 0  # exclusive
+        self._y1 = 0
+        self._count = 0
+        # ``(width, height)`` of the map, ``None`` while unbounded
+        self.size: Optional[Coord] = None
+        # Obstacles off a sized map; searches never reach them
+        self._outside: Set[Coord] = set()
+        self._allocate(0, 0, 0, 0, None)
+        self.version = 0
+        # (tile, now_blocked) for versions _log_base + 1 .. version
+        self._changes: List[Tuple[Coord, bool]] = []
+        self._log_base = 0
+        # Scratch arrays reused between searches, see ``_scratch``
+        self._g: List[int] = []
+        self._parent: List[int] = []
+        self._stamp: List[int] = []
+        self._search = 0
+        if width > 0 and height > 0:
+            self.resize((width, height))
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+    @property
+    def stride(self) -> int:
+        """Bitmap row length, including both margins."""
+
+        return self._x1 - self._x0 + 2 * _MARGIN
+
+    def _allocate(self, x0: int, y0: int, x1: int, y1: int, old: Optional[bytearray]) -> None:
+        stride = x1 - x0 + 2 * _MARGIN
+        rows = y1 - y0 + 2 * _MARGIN
+        bits = bytearray(stride * rows)
+        if old is not None:
+            old_stride = self.stride
+            width = self._x1 - self._x0
+            for y in range(self._y0, self._y1):
+                src = (y - self._y0 + _MARGIN) * old_stride + _MARGIN
+                dst = (y - y0 + _MARGIN) * stride + (self._x0 - x0) + _MARGIN
+                bits[dst : dst + width] = old[src : src + width]
+        # Sentinel walls on the outer ring, and the inner one on a sized map
+        walls = _MARGIN if self.size is not None else 1
+        for ring in range(walls):
+            bits[ring * stride : (ring + 1) * stride] = b"\x01" * stride
+            bits[(rows - ring - 1) * stride : (rows - ring) * stride] = b"\x01" * stride
+            for row in range(ring + 1, rows - ring - 1):
+                bits[row * stride + ring] = 1
+                bits[row * stride + stride - ring - 1] = 1
+        self._bits = bits
+        self._x0, self._y0, self._x1, self._y1 = x0, y0, x1, y1
+
+    def _cover(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Grow the covered area to include tiles ``[x0, x1) x [y0, y1)``."""
+
+        if x0 >= self._x0 and y0 >= self._y0 and x1 <= self._x1 and y1 <= self._y1:
+            return
+        if self._x1 > self._x0:
+            x0, y0 = min(x0, self._x0), min(y0, self._y0)
+            x1, y1 = max(x1, self._x1), max(y1, self._y1)
+        self._allocate(x0, y0, x1, y1, self._bits if self._x1 > self._x0 else None)
+
+    def resize(self, size: Coord) -> None:
+        """Bound the grid to a ``(width, height)`` map.
+
+        Existing obstacles are kept. The change log restarts, so cached
+        paths that left the new map are searched again.
+        """
+
+        size = (int(size[0]), int(size[1]))
+        if size == self.size:
+            return
+        nodes = list(self)
+        self.size = size
+        self._outside = set()
+        self._count = 0
+        self._allocate(0, 0, size[0], size[1], None)
+        for node in nodes:
+            if self.on_map(node):
+                self._bits[self.index(node)] = 1
+                self._count += 1
+            else:
+                self._outside.add(node)
+        self.version += 1
+        self._changes = []
+        self._log_base = self.version
+
+    def on_map(self, node: Coord) -> bool:
+        """Return ``True`` if searches may visit ``node``: on the map, or anywhere while unsized."""
+
+        if self.size is None:
+            return True
+        return 0 <= node[0] < self.size[0] and 0 <= node[1] < self.size[1]
+
+    def index(self, node: Coord) -> int:
+        """Return the flat bitmap index of ``node``.
+
+        An unsized grid grows to cover it; on a sized one ``node`` must be
+        on the map.
+        """
+
+        x, y = node
+        if self.size is None:
+            self._cover(x, y, x + 1, y + 1)
+        elif not self.on_map(node):
+            raise ValueError(f"{node} is off the {self.size[0]}x{self.size[1]} map")
+        return (y - self._y0 + _MARGIN) * self.stride + (x - self._x0 + _MARGIN)
+
+    def coord(self, index: int) -> Coord:
+        """Return the tile at flat bitmap ``index``."""
+
+        y, x = divmod(index, self.stride)
+        return (x - _MARGIN + self._x0, y - _MARGIN + self._y0)
+
+    def window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Return blocked flags of tiles ``[x0, x1) x [y0, y1)`` as a ``(rows, cols)`` array.
+
+        Tiles off a sized map read as blocked.
+        """
+
+        if self.size is None:
+            self._cover(x0, y0, x1, y1)
+        flags = np.ones((y1 - y0, x1 - x0), dtype=np.uint8)
+        cx0, cy0 = max(x0, self._x0), max(y0, self._y0)
+        cx1, cy1 = min(x1, self._x1), min(y1, self._y1)
+        if cx0 < cx1 and cy0 < cy1:
+            view = np.frombuffer(self._bits, dtype=np.uint8).reshape(-1, self.stride)
+            row = cy0 - self._y0 + _MARGIN
+            col = cx0 - self._x0 + _MARGIN
+            flags[cy0 - y0 : cy1 - y0, cx0 - x0 : cx1 - x0] = view[
+                row : row + cy1 - cy0, col : col + cx1 - cx0
+            ]
+        return flags
+
+    def density(self) -> float:
+        """Return the blocked fraction of the map (of the covered area while unsized)."""
+
+        area = (self._x1 - self._x0) * (self._y1 - self._y0)
+        return self._count / area if area else 0.0
+
+    def _record(self, node: Coord, blocked: bool) -> None:
+        self.version += 1
+        self._changes.append((node, blocked))
+        if len(self._changes) > CHANGE_LOG_LIMIT:
+            drop = len(self._changes) - CHANGE_LOG_LIMIT // 2
+            del self._changes[:drop]
+            self._log_base += drop
+
+    def changes_since(self, version: int) -> Optional[List[Tuple[Coord, bool]]]:
+        """Return ``(tile, now_blocked)`` changes after ``version``.
+
+        ``None`` means the log no longer reaches back that far (or the grid
+        was cleared), so anything older must be treated as stale.
+        """
+
+        if version < self._log_base:
+            return None
+        return self._changes[version - self._log_base :]
+
+    def _scratch(self) -> Tuple[List[int], List[int], List[int], int]:
+        """Return ``(g, parent, stamp, search)`` arrays for one search.
+
+        Entries are valid only where ``stamp[i] == search``, so nothing has
+        to be cleared between searches.
+        """
+
+        size = len(self._bits)
+        if len(self._stamp) != size:
+            self._g = [0] * size
+            self._parent = [-1] * size
+            self._stamp = [0] * size
+            self._search = 0
+        self._search += 1
+        return self._g, self._parent, self._stamp, self._search
+
+    # ------------------------------------------------------------------
+    # Set interface
+    # ------------------------------------------------------------------
+    def __contains__(self, node: object) -> bool:
+        try:
+            x, y = node  # type: ignore[misc]
+        except (TypeError, ValueError):
+            return False
+        if not (self._x0 <= x < self._x1 and self._y0 <= y < self._y1):
+            return (x, y) in self._outside
+        return bool(self._bits[(y - self._y0 + _MARGIN) * self.stride + (x - self._x0 + _MARGIN)])
+
+    def __iter__(self) -> Iterator[Coord]:
+        bits = self._bits
+        stride = self.stride
+        for y in range(self._y0, self._y1):
+            start = (y - self._y0 + _MARGIN) * stride + _MARGIN
+            end = start + self._x1 - self._x0
+            pos = bits.find(1, start, end)
+            while pos != -1:
+                yield (pos - start + self._x0, y)
+                pos = bits.find(1, pos + 1, end)
+        yield from list(self._outside)
+
+    def __len__(self) -> int:
+        return self._count + len(self._outside)
+
+    def add(self, node: Coord) -> None:
+        if not self.on_map(node):
+            if node in self._outside:
+                return
+            self._outside.add(node)
+        else:
+            index = self.index(node)
+            if self._bits[index]:
+                return
+            self._bits[index] = 1
+            self._count += 1
+        self._record(node, True)
+
+    def discard(self, node: Coord) -> None:
+        if node not in self:
+            return
+        if not self.on_map(node):
+            self._outside.discard(node)
+        else:
+            self._bits[self.index(node)] = 0
+            self._count -= 1
+        self._record(node, False)
+
+    def update(self, nodes: Iterable[Coord]) -> None:
+        """Add every tile in ``nodes``."""
+
+        for node in nodes:
+            self.add(node)
+
+    def clear(self) -> None:
+        """Remove every obstacle, keeping the covered area."""
+
+        self._allocate(self._x0, self._y0, self._x1, self._y1, None)
+        self._count = 0
+        self._outside = set()
+        self.version += 1
+        self._changes = []
+        self._log_base = self.version
+
+    def __repr__(self) -> str:
+        return f"ObstacleGrid({sorted(self)!r})"
+
 
 # Global obstacle coordinates used by movement and pathfinding.
-OBSTACLES: Set[Coord] = set()
+OBSTACLES = ObstacleGrid()
 
 
 def set_obstacles(obstacles: Iterable[Coord]) -> None:
-    """Replace the global obstacle set."""
+    """Replace the global obstacle set.
+
+    Only tiles that actually change are touched, so cached paths away from
+    them stay valid.
+    """
+
+    wanted = set(obstacles)
+    for node in [node for node in OBSTACLES if node not in wanted]:
+        OBSTACLES.discard(node)
+    OBSTACLES.update(wanted)
 
-    OBSTACLES.clear()
-    OBSTACLES.update(obstacles)
+
+def add_obstacle(node: Coord) -> None:
+    """Block ``node``; for abilities that raise walls."""
+
+    OBSTACLES.add(node)
+
+
+def remove_obstacle(node: Coord) -> None:
+    """Unblock ``node``; for abilities that destroy obstacles."""
+
+    OBSTACLES.discard(node)
 
 
 def clear_obstacles() -> None:
@@ -31,92 +338,392 @@ def is_blocked(node: Coord) -> bool:
     return node in OBSTACLES
 
 
-def _heuristic(a: Coord, b: Coord) -> float:
-    """Return estimated distance between two points.
+# ----------------------------------------------------------------------
+# Search
+# ----------------------------------------------------------------------
+def _straight_path(start: Coord, goal: Coord) -> List[Coord]:
+    """Return the x-then-y Manhattan path used when nothing is blocked."""
+
+    x0, y0 = start
+    x1, y1 = goal
+    path = [(x0, y0)]
+    x, y = x0, y0
+    while x != x1:
+        x += 1 if x1 > x else -1
+        path.append((x, y))
+    while y != y1:
+        y += 1 if y1 > y else -1
+        path.append((x, y))
+    return path
 
-    This uses Manhattan distance which works well for a 4-neighbour grid.
-    """
 
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+def _reconstruct(grid: ObstacleGrid, parent: List[int], goal: int) -> List[Coord]:
+    """Return the tile path ending at ``goal``, filling in straight jumps."""
+
+    stride = grid.stride
+    nodes = [goal]
+    while parent[nodes[-1]] != -1:
+        nodes.append(parent[nodes[-1]])
+    nodes.reverse()
+    path = [grid.coord(nodes[0])]
+    for prev, node in zip(nodes, nodes[1:]):
+        diff = node - prev
+        step = (1 if diff > 0 else -1) if -stride < diff < stride else (stride if diff > 0 else -stride)
+        for index in range(prev + step, node + step, step):
+            path.append(grid.coord(index))
+    return path
 
 
-def _neighbors(node: Coord) -> List[Coord]:
-    """Return the walkable cardinal neighbours of ``node``."""
+def _endpoints(grid: ObstacleGrid, start: Coord, goal: Coord) -> Optional[Tuple[int, int]]:
+    """Return flat ``(start, goal)`` indices, or ``None`` if either is blocked or off the map."""
 
-    x, y = node
-    candidates = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-    return [c for c in candidates if not is_blocked(c)]
+    if not (grid.on_map(start) and grid.on_map(goal)):
+        return None
+    # Cover both tiles before taking indices: growing shifts the layout
+    grid.index(start)
+    goal_index = grid.index(goal)
+    start_index = grid.index(start)
+    if grid._bits[start_index] or grid._bits[goal_index]:
+        return None
+    return start_index, goal_index
 
 
-def _reconstruct(came_from: Dict[Coord, Coord], current: Coord) -> List[Coord]:
-    path = [current]
-    while current in came_from:
-        current = came_from[current]
-        path.append(current)
-    path.reverse()
-    return path
+def grid_a_star(start: Coord, goal: Coord, grid: Optional[ObstacleGrid] = None) -> List[Coord]:
+    """Return the shortest 4-neighbour path from ``start`` to ``goal`` using A*.
 
+    Every reachable tile may be expanded, which on open ground is still
+    cheaper than :func:`jps`; on mazes JPS finds paths of the same length
+    with far fewer expansions.
+    """
 
-def a_star(start: Coord, goal: Coord) -> List[Coord]:
-    """Return the shortest path from ``start`` to ``goal`` using A*.
+    grid = OBSTACLES if grid is None else grid
+    if start == goal:
+        return [start]
+    ends = _endpoints(grid, start, goal)
+    if ends is None:
+        return []
+    source, target = ends
+    bits = grid._bits
+    stride = grid.stride
+    g, parent, stamp, search = grid._scratch()
+    tx, ty = target % stride, target // stride
+
+    stamp[source] = search
+    g[source] = 0
+    parent[source] = -1
+    # (f, -g, index): among equal f, deepest first
+    open_heap = [(abs(source % stride - tx) + abs(source // stride - ty), 0, source)]
+    while open_heap:
+        _f, neg_g, current = heappop(open_heap)
+        if current == target:
+            return _reconstruct(grid, parent, target)
+        cost = -neg_g
+        if cost != g[current]:
+            continue  # superseded entry
+        cost += 1
+        for nxt in (current + 1, current - 1, current + stride, current - stride):
+            if bits[nxt]:
+                continue
+            if stamp[nxt] == search and g[nxt] <= cost:
+                continue
+            stamp[nxt] = search
+            g[nxt] = cost
+            parent[nxt] = current
+            heappush(
+                open_heap,
+                (cost + abs(nxt % stride - tx) + abs(nxt // stride - ty), -cost, nxt),
+            )
+    return []
+
+
+def _jump_h(bits: bytearray, node: int, step: int, stride: int, goal: int) -> int:
+    """Scan along a row; return the next jump point or ``-1``.
 
-    With no obstacles this reduces to a straight Manhattan path but the
-    algorithm is kept general for future extension.
+    A tile is a jump point when a tile above or below it can only be
+    reached through it, because the tile behind that one is blocked.
     """
 
+    while True:
+        node += step
+        if bits[node]:
+            return -1
+        if node == goal:
+            return node
+        if (not bits[node + stride] and bits[node - step + stride]) or (
+            not bits[node - stride] and bits[node - step - stride]
+        ):
+            return node
+
+
+def _jump_v(bits: bytearray, node: int, step: int, stride: int, goal: int) -> int:
+    """Scan along a column; stop where a row scan finds a jump point."""
+
+    while True:
+        node += step
+        if bits[node]:
+            return -1
+        if node == goal:
+            return node
+        if _jump_h(bits, node, 1, stride, goal) != -1 or _jump_h(bits, node, -1, stride, goal) != -1:
+            return node
+
+
+def jps(start: Coord, goal: Coord, grid: Optional[ObstacleGrid] = None) -> List[Coord]:
+    """Return the shortest 4-neighbour path using Jump Point Search.
+
+    Paths are canonical vertical-first: columns are scanned with a row scan
+    at every tile, rows only stop where an obstacle forces a turn. Only the
+    resulting jump points enter the open list.
+    """
+
+    grid = OBSTACLES if grid is None else grid
     if start == goal:
         return [start]
+    ends = _endpoints(grid, start, goal)
+    if ends is None:
+        return []
+    source, target = ends
+    bits = grid._bits
+    stride = grid.stride
+    g, parent, stamp, search = grid._scratch()
+    tx, ty = target % stride, target // stride
+
+    stamp[source] = search
+    g[source] = 0
+    parent[source] = -1
+    open_heap = [(abs(source % stride - tx) + abs(source // stride - ty), 0, source)]
+    while open_heap:
+        _f, neg_g, current = heappop(open_heap)
+        if current == target:
+            return _reconstruct(grid, parent, target)
+        cost = -neg_g
+        if cost != g[current]:
+            continue
 
-    if not OBSTACLES:
-        x0, y0 = start
-        x1, y1 = goal
-        path = [(x0, y0)]
-        x, y = x0, y0
-        while x != x1:
-            x += 1 if x1 > x else -1
-            path.append((x, y))
-        while y != y1:
-            y += 1 if y1 > y else -1
-            path.append((x, y))
-        return path
+        prev = parent[current]
+        if prev == -1:
+            rows: Tuple[int, ...] = (1, -1)
+            cols: Tuple[int, ...] = (stride, -stride)
+        else:
+            diff = current - prev
+            if -stride < diff < stride:
+                step = 1 if diff > 0 else -1
+                rows = (step,)
+                # Turning off a row only where the tile behind is blocked
+                cols = tuple(
+                    d for d in (stride, -stride) if bits[current - step + d] and not bits[current + d]
+                )
+            else:
+                rows = (1, -1)
+                cols = (stride if diff > 0 else -stride,)
+
+        for step in rows:
+            nxt = _jump_h(bits, current, step, stride, target)
+            if nxt == -1:
+                continue
+            new_cost = cost + abs(nxt - current)
+            if stamp[nxt] == search and g[nxt] <= new_cost:
+                continue
+            stamp[nxt] = search
+            g[nxt] = new_cost
+            parent[nxt] = current
+            heappush(
+                open_heap,
+                (new_cost + abs(nxt % stride - tx) + abs(nxt // stride - ty), -new_cost, nxt),
+            )
+        for step in cols:
+            nxt = _jump_v(bits, current, step, stride, target)
+            if nxt == -1:
+                continue
+            new_cost = cost + abs(nxt - current) // stride
+            if stamp[nxt] == search and g[nxt] <= new_cost:
+                continue
+            stamp[nxt] = search
+            g[nxt] = new_cost
+            parent[nxt] = current
+            heappush(
+                open_heap,
+                (new_cost + abs(nxt % stride - tx) + abs(nxt // stride - ty), -new_cost, nxt),
+            )
+    return []
 
-    if is_blocked(start) or is_blocked(goal):
-        return []
 
-    open_set: List[Tuple[float, float, Coord]] = []
-    heappush(open_set, (_heuristic(start, goal), 0.0, start))
+# ----------------------------------------------------------------------
+# Path cache
+# ----------------------------------------------------------------------
+def _distance(a: Coord, b: Coord) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
 
-    came_from: Dict[Coord, Coord] = {}
-    g_score: Dict[Coord, float] = {start: 0.0}
-    closed: set[Coord] = set()
+class _CachedPath:
+    __slots__ = ("path", "offsets", "version")
 
-    while open_set:
-        f, g, current = heappop(open_set)
+    def __init__(self, path: List[Coord], version: int) -> None:
+        self.path = tuple(path)
+        # tile -> position along the path, for suffix lookups
+        self.offsets: Dict[Coord, int] = {node: i for i, node in enumerate(path)}
+        self.version = version
 
-        if current == goal:
-            return _reconstruct(came_from, current)
 
-        if current in closed:
-            continue
-        closed.add(current)
+class PathCache:
+    """LRU cache of path searches keyed by ``(start, goal)``.
 
-        for n in _neighbors(current):
-            tentative_g = g + 1
-            if n in closed:
+    Entries are checked against the obstacle changes made since they were
+    stored, so a change only evicts paths it can affect: a new obstacle
+    breaks the paths crossing it, a removed one only those it could
+    shorten. A query starting on any cached route to the same goal is
+    answered with the remaining part of that route.
+
+    ``search`` defaults to :func:`grid_a_star` on ``grid``, or :func:`jps`
+    while its :meth:`~ObstacleGrid.density` is at least
+    :data:`MAZE_DENSITY`. A search returning
+    near-shortest paths (see :mod:`.hierarchical`) still gets exact
+    invalidation for new obstacles; a removed one then only refreshes the
+    paths it could have shortened relative to the cached length.
+    """
+
+    def __init__(
+        self,
+        grid: Optional[ObstacleGrid] = None,
+        max_entries: int = DEFAULT_PATH_CACHE_SIZE,
+        search: Optional[PathSearch] = None,
+    ) -> None:
+        self.grid = OBSTACLES if grid is None else grid
+        self.max_entries = max_entries
+        self.search: Optional[PathSearch] = search
+        self._paths: "OrderedDict[Tuple[Coord, Coord], _CachedPath]" = OrderedDict()
+        # goal -> keys of cached paths ending there
+        self._by_goal: Dict[Coord, List[Tuple[Coord, Coord]]] = {}
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def clear(self) -> None:
+        self._paths.clear()
+        self._by_goal.clear()
+
+    def _valid(self, entry: _CachedPath) -> bool:
+        version = self.grid.version
+        if entry.version == version:
+            return True
+        changes = self.grid.changes_since(entry.version)
+        if changes is None:
+            return False
+        if not entry.path:
+            # "No path" stands until something is unblocked
+            if not all(blocked for _node, blocked in changes):
+                return False
+        else:
+            start, goal = entry.path[0], entry.path[-1]
+            length = len(entry.path) - 1
+            for node, blocked in changes:
+                if blocked:
+                    if node in entry.offsets:
+                        return False
+                elif _distance(start, node) + _distance(node, goal) < length:
+                    return False
+        entry.version = version
+        return True
+
+    def _drop(self, key: Tuple[Coord, Coord]) -> None:
+        del self._paths[key]
+        keys = self._by_goal[key[1]]
+        keys.remove(key)
+        if not keys:
+            del self._by_goal[key[1]]
+
+    def _lookup(self, start: Coord, goal: Coord) -> Optional[List[Coord]]:
+        key = (start, goal)
+        entry = self._paths.get(key)
+        if entry is not None:
+            if self._valid(entry):
+                self._paths.move_to_end(key)
+                self.hits += 1
+                return list(entry.path)
+            self._drop(key)
+        for other in list(self._by_goal.get(goal, ())):
+            entry = self._paths[other]
+            offset = entry.offsets.get(start)
+            if offset is None:
+                continue
+            if not self._valid(entry):
+                self._drop(other)
                 continue
-            if tentative_g < g_score.get(n, float("inf")):
-                came_from[n] = current
-                g_score[n] = tentative_g
-                f_score = tentative_g + _heuristic(n, goal)
-                heappush(open_set, (f_score, tentative_g, n))
+            # Every suffix of a shortest path is a shortest path
+            self._paths.move_to_end(other)
+            self.shared += 1
+            return list(entry.path[offset:])
+        return None
+
+    def path(self, start: Coord, goal: Coord) -> List[Coord]:
+        """Return the shortest path from ``start`` to ``goal``, searching on a miss."""
+
+        if start == goal:
+            return [start]
+        cached = self._lookup(start, goal)
+        if cached is not None:
+            return cached
+        self.misses += 1
+        if self.search is not None:
+            path = self.search(start, goal)
+        elif self.grid.density() >= MAZE_DENSITY:
+            path = jps(start, goal, self.grid)
+        else:
+            path = grid_a_star(start, goal, self.grid)
+        key = (start, goal)
+        self._paths[key] = _CachedPath(path, self.grid.version)
+        self._by_goal.setdefault(goal, []).append(key)
+        while len(self._paths) > self.max_entries:
+            self._drop(next(iter(self._paths)))
+        return path
 
-    # If no path is found (should not happen with no obstacles), return empty
-    return []
+
+PATH_CACHE = PathCache(OBSTACLES)
+
+
+def set_path_search(search: Optional[PathSearch]) -> None:
+    """Route :func:`a_star` cache misses through ``search`` (``None``: the default search)."""
+
+    PATH_CACHE.search = search
+    PATH_CACHE.clear()
+
+
+def a_star(start: Coord, goal: Coord) -> List[Coord]:
+    """Return the shortest path from ``start`` to ``goal`` avoiding :data:`OBSTACLES`.
+
+    Endpoints off the map set by :meth:`ObstacleGrid.resize` have no
+    path. With no obstacles this is a straight Manhattan path; otherwise it
+    comes from :data:`PATH_CACHE`, searching with :func:`grid_a_star` or
+    :func:`jps` (or whatever :func:`set_path_search` installed) on a miss.
+    Misses update the shared cache, so systems calling this declare
+    ``"path_cache"`` in their ``writes``.
+    """
+
+    if not (OBSTACLES.on_map(start) and OBSTACLES.on_map(goal)):
+        return []
+    if start == goal:
+        return [start]
+    if not OBSTACLES:
+        return _straight_path(start, goal)
+    return PATH_CACHE.path(start, goal)
 
 
 __all__ = [
     "a_star",
+    "grid_a_star",
+    "jps",
+    "ObstacleGrid",
+    "OBSTACLES",
+    "PathCache",
+    "PATH_CACHE",
+    "MAZE_DENSITY",
     "set_obstacles",
+    "set_path_search",
     "clear_obstacles",
+    "add_obstacle",
+    "remove_obstacle",
     "is_blocked",
 ]
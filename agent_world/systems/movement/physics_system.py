@@ -7,6 +7,8 @@ from __future__ import annotations
 from typing import Any, Dict, List
 import logging
 
+import numpy as np
+
 from .pathfinding import is_blocked
 from ...core.components.position import Position
 from ...core.components.physics import Physics
@@ -25,6 +27,9 @@ logger = logging.getLogger(__name__)
 class PhysicsSystem:
     """Update :class:`Physics` components from accumulated :class:`Force` values."""
 
+    reads = (Position, "obstacles")
+    writes = (Physics, Force)
+
     def __init__(
         self, world: Any, event_log: List[Dict[str, Any]] | None = None
     ) -> None:
@@ -44,67 +49,39 @@ class PhysicsSystem:
             return
 
         width, height = size
-        for entity_id in list(em.all_entities.keys()):
-            phys = cm.get_component(entity_id, Physics)
-            if phys is None:
-                continue
 
-            # Log state before applying forces
-            logger.debug(
-                "[Tick %s] PhysicsSystem: Entity %s, Vel BEFORE force processing: (%.2f,%.2f)",
-                current_tick,
-                entity_id,
-                phys.vx,
-                phys.vy,
-            )
+        commands = self.world.command_buffer
 
-            # Get the Force component (from core.components.force)
-            force_comp = cm.get_component(entity_id, Force) 
-            if force_comp is not None:
-                logger.debug(
-                    "[Tick %s] PhysicsSystem: Entity %s processing Force(%s,%s), mass=%s",
-                    current_tick,
-                    entity_id,
-                    force_comp.dx,
-                    force_comp.dy,
-                    phys.mass,
-                )
-                
-                # Apply impulse: dv = F*dt / m. Since dt=1 tick, dv = F/m.
-                # If force_comp.dx/dy are considered impulses (change in momentum), then dv = impulse / m.
-                # If force_comp.dx/dy are forces, then a_x = Fx/m, vx += a_x * dt (dt=1 tick)
-                phys.vx += force_comp.dx / phys.mass 
-                phys.vy += force_comp.dy / phys.mass
-                
-                force_comp.ttl -= 1
-                if force_comp.ttl <= 0:
-                    cm.remove_component(entity_id, Force) # Consume the force component after applying
-            
-            # Log state after forces but before collision resolution
+        # Forces are sparse, so they are applied per entity.
+        for entity_id, phys, force_comp in cm.query(Physics, Force):
             logger.debug(
-                "[Tick %s] PhysicsSystem: Entity %s, Vel AFTER force / BEFORE collision: (%.2f,%.2f)",
+                "[Tick %s] PhysicsSystem: Entity %s processing Force(%s,%s), mass=%s",
                 current_tick,
                 entity_id,
-                phys.vx,
-                phys.vy,
+                force_comp.dx,
+                force_comp.dy,
+                phys.mass,
             )
+            # Apply impulse: dv = F*dt / m with dt = 1 tick.
+            phys.vx += force_comp.dx / phys.mass
+            phys.vy += force_comp.dy / phys.mass
+
+            force_comp.ttl -= 1
+            if force_comp.ttl <= 0:
+                commands.remove_component(entity_id, Force) # Consume the force component after applying
+
+        store = cm.columns(Physics)
+        if store is None or len(store) == 0:
+            return
+
+        # Collision detection and response. Rows zeroed here skip friction.
+        collided = np.zeros(len(store), dtype=bool)
+        # In id order, so collision events do not depend on row order
+        for entity_id, pos, phys in sorted(cm.query(Position, Physics)):
+            # Tentative next position based on current velocity (dt = 1 tick)
+            next_x_int = int(round(pos.x + phys.vx)) # Movement system uses int positions
+            next_y_int = int(round(pos.y + phys.vy))
 
-            pos = cm.get_component(entity_id, Position)
-            if pos is None: # Entity might not have a position, or it's an abstract physical object
-                # Apply friction even if no position (e.g., for a projectile in abstract space)
-                phys.vx *= phys.friction 
-                phys.vy *= phys.friction
-                continue
-
-            # Collision detection and response
-            # Tentative next position based on current velocity
-            # Assuming dt = 1 tick for this calculation
-            next_x_float = pos.x + phys.vx 
-            next_y_float = pos.y + phys.vy
-            next_x_int = int(round(next_x_float)) # Movement system uses int positions
-            next_y_int = int(round(next_y_float))
-
-            collision = False
             if (
                 next_x_int < 0 or next_x_int >= width or
                 next_y_int < 0 or next_y_int >= height or
@@ -119,7 +96,7 @@ class PhysicsSystem:
                 )
                 phys.vx = 0.0
                 phys.vy = 0.0
-                collision = True
+                collided[store.row_of(phys)] = True
                 if self.event_log is not None:
                     self.event_log.append(
                         {
@@ -129,24 +106,19 @@ class PhysicsSystem:
                             "tick": current_tick
                         }
                     )
-            
-            # Apply friction after collision resolution (or if no collision)
-            if not collision: # Only apply friction if no collision zeroed velocity
-                 phys.vx *= phys.friction 
-                 phys.vy *= phys.friction
-            
-            # Clamp very small velocities to zero to prevent endless tiny movements
-            if abs(phys.vx) < 0.01: phys.vx = 0.0
-            if abs(phys.vy) < 0.01: phys.vy = 0.0
-
-            # Log final velocity after all processing
-            logger.debug(
-                "[Tick %s] PhysicsSystem: Entity %s, Vel FINAL for tick: (%.2f,%.2f)",
-                current_tick,
-                entity_id,
-                phys.vx,
-                phys.vy,
-            )
 
+        # Friction and clamping run over the whole velocity columns.
+        vx = store.column("vx")
+        vy = store.column("vy")
+        before = (vx != 0.0) | (vy != 0.0)
+        moving = ~collided
+        friction = store.column("friction")[moving]
+        vx[moving] *= friction
+        vy[moving] *= friction
+        # Clamp very small velocities to zero to prevent endless tiny movements
+        vx[np.abs(vx) < 0.01] = 0.0
+        vy[np.abs(vy) < 0.01] = 0.0
+        # Bulk writes bypass the views, so report them to the change feed.
+        cm.mark_changed_many(Physics, store.entity_ids()[before].tolist())
 
 __all__ = ["PhysicsSystem"] # Removed local Force to avoid confusion
\ No newline at end of file
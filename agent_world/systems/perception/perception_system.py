@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import List
 
+import numpy as np
+
 from agent_world.core.world import World
 from agent_world.core.components.position import Position
 from agent_world.core.components.perception_cache import PerceptionCache
@@ -13,6 +15,9 @@ from .line_of_sight import has_line_of_sight
 class PerceptionSystem:
     """Populate :class:`PerceptionCache` components each tick."""
 
+    reads = (Position, "spatial_index")
+    writes = (PerceptionCache,)
+
     def __init__(self, world: World, view_radius: int = 5) -> None:
         self.world = world
         self.view_radius = view_radius
@@ -30,19 +35,31 @@ class PerceptionSystem:
         ):
             return
 
-        em = self.world.entity_manager
         cm = self.world.component_manager
         spatial = self.world.spatial_index
 
-        for entity_id in list(em.all_entities.keys()):
-            cache = cm.get_component(entity_id, PerceptionCache)
-            if cache is None:
-                continue
-            pos = cm.get_component(entity_id, Position)
-            if pos is None:
-                continue
+        observers = [
+            (entity_id, cm.get_component(entity_id, Position))
+            for entity_id in sorted(cm.entities_with(PerceptionCache, Position))
+        ]
+        if not observers:
+            return
+
+        # One vectorised call for every observer when the index supports it
+        batch = getattr(spatial, "query_radius_many", None)
+        if batch is not None:
+            points = np.array([(pos.x, pos.y) for _eid, pos in observers], dtype=np.int64)
+            offsets, hits = batch(points, self.view_radius)
+            offsets, hits = offsets.tolist(), hits.tolist()
+            found = [hits[offsets[i] : offsets[i + 1]] for i in range(len(observers))]
+        else:
+            found = [
+                spatial.query_radius((pos.x, pos.y), self.view_radius)
+                for _eid, pos in observers
+            ]
 
-            nearby = spatial.query_radius((pos.x, pos.y), self.view_radius)
+        for (entity_id, pos), nearby in zip(observers, found):
+            cache = cm.get_component(entity_id, PerceptionCache)
             visible: List[int] = []
             for other_id in nearby:
                 if other_id == entity_id:
@@ -0,0 +1,6 @@
+"""Standalone performance benchmarks.
+
+Each module exposes ``run()`` returning the raw measurements and a ``main()``
+entry point printing them, e.g. ``python -m
+agent_world.utils.benchmarks.component_memory``.
+"""
@@ -0,0 +1,98 @@
+"""``SpatialGrid.query_radius`` cost against cell size for the default config.
+
+Places entities on the ``config.yaml`` map (100x100) and times radius
+queries at the perception ``view_radius`` (10) for a range of cell sizes,
+next to the cost predicted by :mod:`agent_world.core.spatial.cell_tuning`
+and the size :class:`~agent_world.core.spatial.cell_tuning.CellSizeTuner`
+would pick.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from ...core.spatial.cell_tuning import best_cell_size, observed_density, query_cost
+from ...core.spatial.spatial_index import SpatialGrid
+
+DEFAULT_SIZE = 100
+DEFAULT_ENTITIES = 500
+DEFAULT_RADIUS = 10
+DEFAULT_QUERIES = 2000
+REPEATS = 3
+CELL_SIZES = (1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 21)
+
+
+def run(
+    entities: int = DEFAULT_ENTITIES,
+    size: int = DEFAULT_SIZE,
+    radius: int = DEFAULT_RADIUS,
+    queries: int = DEFAULT_QUERIES,
+    cell_sizes: Sequence[int] = CELL_SIZES,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Return per-cell-size query timings and the tuner's choice."""
+
+    rng = np.random.default_rng(seed)
+    points = rng.integers(0, size, size=(entities, 2))
+    ids = np.arange(1, entities + 1)
+    centres = list(map(tuple, points[rng.integers(0, entities, size=queries)].tolist()))
+
+    grid = SpatialGrid(1)
+    grid.rebuild(ids, points[:, 0], points[:, 1])
+    density = observed_density(grid, size * size)
+
+    rows: List[Dict[str, Any]] = []
+    for cell_size in cell_sizes:
+        grid.resize(cell_size)
+        for centre in centres[:100]:
+            grid.query_radius(centre, radius)
+        # Best of a few passes to keep scheduler noise out of the table
+        elapsed = float("inf")
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            for centre in centres:
+                grid.query_radius(centre, radius)
+            elapsed = min(elapsed, time.perf_counter() - start)
+        rows.append(
+            {
+                "cell_size": cell_size,
+                "query_us": elapsed / len(centres) * 1e6,
+                "modelled": query_cost(cell_size, radius, density),
+            }
+        )
+    return {
+        "entities": entities,
+        "radius": radius,
+        "density": density,
+        "tuned": best_cell_size({radius: 1.0}, density),
+        "rows": rows,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing the table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    args = parser.parse_args(argv)
+
+    result = run(args.entities, args.size, args.radius, args.queries)
+    print(
+        f"{result['entities']} entities, radius {result['radius']}, "
+        f"density {result['density']:.3f}; tuner picks {result['tuned']}"
+    )
+    print(f"{'cell':>5} {'us/query':>9} {'modelled':>9}")
+    for row in result["rows"]:
+        mark = " <" if row["cell_size"] == result["tuned"] else ""
+        print(f"{row['cell_size']:>5} {row['query_us']:>9.2f} {row['modelled']:>9.1f}{mark}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
@@ -0,0 +1,186 @@
+"""Memory and construction-time benchmark for core components.
+
+Every component class is measured as shipped and as an equivalent plain
+``@dataclass`` carrying a per-instance ``__dict__``, which is what all core
+components used to be. Column components are measured attached to a
+:class:`~agent_world.core.column_store.ColumnStore`, so their figure covers
+the view object plus its share of the NumPy columns. A final row builds
+complete entities through the entity and component managers so store
+overhead is included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Sequence
+
+from ...core.column_store import ColumnComponent, ColumnStore
+from ...core.component_manager import ComponentManager
+from ...core.entity_manager import EntityManager
+from ...core.components.force import Force
+from ...core.components.health import Health
+from ...core.components.inventory import Inventory
+from ...core.components.ownership import Ownership
+from ...core.components.physics import Physics
+from ...core.components.position import Position
+from ...core.components.relationship import Relationship
+from ...core.components.role import RoleComponent
+
+# Entity counts reported by default: the configured ``max_entities`` and a
+# stress size an order of magnitude above it.
+DEFAULT_COUNTS = (8000, 100_000)
+
+# Factories building one instance of each component for entity ``i``.
+COMPONENT_FACTORIES: Dict[type, Callable[[int], Any]] = {
+    Position: lambda i: Position(i % 1000, i // 1000),
+    Health: lambda i: Health(cur=10, max=10),
+    Physics: lambda i: Physics(mass=1.0, vx=0.0, vy=0.0, friction=0.9),
+    Inventory: lambda i: Inventory(capacity=4),
+    Ownership: lambda i: Ownership(owner_id=i),
+    Relationship: lambda i: Relationship(faction="none", reputation=0),
+    RoleComponent: lambda i: RoleComponent(role_name="villager"),
+    Force: lambda i: Force(0.0, 0.0),
+}
+
+
+def _field_values(comp: Any) -> Dict[str, Any]:
+    if isinstance(comp, ColumnComponent):
+        return comp.as_dict()
+    return {f.name: getattr(comp, f.name) for f in dataclasses.fields(comp)}
+
+
+def _unslotted(cls: type) -> type:
+    """Return a ``__dict__``-backed dataclass with the same fields as ``cls``."""
+
+    if issubclass(cls, ColumnComponent):
+        return dataclasses.make_dataclass(
+            cls.__name__, [(name, Any) for name in cls._fields]
+        )
+    specs = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec = dataclasses.field(default=f.default)
+        elif f.default_factory is not dataclasses.MISSING:
+            spec = dataclasses.field(default_factory=f.default_factory)
+        else:
+            spec = dataclasses.field()
+        specs.append((f.name, f.type, spec))
+    return dataclasses.make_dataclass(cls.__name__, specs)
+
+
+def _measure(count: int, build: Callable[[int], Any]) -> Dict[str, float]:
+    """Return bytes per entity and construction time for ``count`` builds."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        keep: List[Any] = [build(i) for i in range(count)]
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The holding list is an artefact of the benchmark, not of the component.
+    held = after - before - keep.__sizeof__()
+    del keep
+    return {
+        "bytes_per_entity": held / count,
+        "construct_us": elapsed / count * 1e6,
+    }
+
+
+def _shipped_builder(cls: type, factory: Callable[[int], Any]) -> Callable[[int], Any]:
+    if not issubclass(cls, ColumnComponent):
+        return factory
+    store = ColumnStore(cls)
+
+    def build(i: int) -> Any:
+        comp = factory(i)
+        store.attach(i, comp)
+        return comp
+
+    return build
+
+
+def _entity_builder() -> Callable[[int], Any]:
+    em = EntityManager()
+    cm = ComponentManager()
+    cm.bind_entity_manager(em)
+
+    def build(i: int) -> int:
+        eid = em.create_entity()
+        for factory in COMPONENT_FACTORIES.values():
+            cm.add_component(eid, factory(i))
+        return eid
+
+    # Keep the managers alive while measuring; ids alone are small ints.
+    build.managers = (em, cm)  # type: ignore[attr-defined]
+    return build
+
+
+def run(counts: Sequence[int] = DEFAULT_COUNTS) -> List[Dict[str, Any]]:
+    """Measure every core component and a full entity at each of ``counts``."""
+
+    results: List[Dict[str, Any]] = []
+    for count in counts:
+        for cls, factory in COMPONENT_FACTORIES.items():
+            plain = _unslotted(cls)
+
+            def build_plain(i: int, factory=factory, plain=plain) -> Any:
+                comp = factory(i)
+                return plain(**_field_values(comp))
+
+            shipped = _measure(count, _shipped_builder(cls, factory))
+            # Only the baseline's memory is reported; its timing includes
+            # building the shipped instance it copies from.
+            baseline = _measure(count, build_plain)
+            results.append(
+                {
+                    "count": count,
+                    "component": cls.__name__,
+                    "bytes_per_entity": shipped["bytes_per_entity"],
+                    "construct_us": shipped["construct_us"],
+                    "dict_bytes_per_entity": baseline["bytes_per_entity"],
+                }
+            )
+        world = _measure(count, _entity_builder())
+        results.append(
+            {
+                "count": count,
+                "component": "<entity>",
+                "bytes_per_entity": world["bytes_per_entity"],
+                "construct_us": world["construct_us"],
+                "dict_bytes_per_entity": None,
+            }
+        )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing a results table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "counts", nargs="*", type=int, default=list(DEFAULT_COUNTS),
+        help="entity counts to measure",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'entities':>9} {'component':<14} {'bytes/ent':>10} {'dict bytes':>10} {'us/ent':>8}")
+    for row in run(args.counts):
+        baseline = row["dict_bytes_per_entity"]
+        baseline_txt = "-" if baseline is None else f"{baseline:.1f}"
+        print(
+            f"{row['count']:>9} {row['component']:<14} "
+            f"{row['bytes_per_entity']:>10.1f} {baseline_txt:>10} "
+            f"{row['construct_us']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
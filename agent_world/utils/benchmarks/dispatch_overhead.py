@@ -0,0 +1,87 @@
+"""Per-tick dispatch overhead of :class:`SystemsManager`.
+
+Registers a set of no-op systems with the mix of ``update`` signatures used
+across the repo (``update()``, ``update(tick)`` and ``update(world, tick)``)
+and times ``SystemsManager.update`` alone, so the figure is the cost of
+dispatch rather than of any system's work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Sequence
+
+from ...core.systems_manager import SystemsManager
+
+DEFAULT_SYSTEMS = 15
+DEFAULT_TICKS = 20_000
+
+
+class _NoArgs:
+    def update(self) -> None:
+        pass
+
+
+class _TickOnly:
+    def update(self, tick: int) -> None:
+        pass
+
+
+class _WorldTick:
+    def update(self, world: Any, tick: int) -> None:
+        pass
+
+
+_KINDS = (_NoArgs, _TickOnly, _WorldTick)
+
+
+def _manager(systems: int) -> SystemsManager:
+    sm = SystemsManager()
+    for i in range(systems):
+        sm.register(_KINDS[i % len(_KINDS)]())
+    return sm
+
+
+def run(
+    systems: int = DEFAULT_SYSTEMS, ticks: int = DEFAULT_TICKS
+) -> Dict[str, Any]:
+    """Return the mean time spent dispatching one tick to ``systems`` no-ops."""
+
+    sm = _manager(systems)
+    # ``object()`` has no command buffer or component manager, so only the
+    # dispatch loop itself is measured.
+    world = object()
+    for tick in range(min(ticks, 1000)):
+        sm.update(world, tick)
+
+    start = time.perf_counter()
+    for tick in range(ticks):
+        sm.update(world, tick)
+    elapsed = time.perf_counter() - start
+    return {
+        "systems": systems,
+        "ticks": ticks,
+        "us_per_tick": elapsed / ticks * 1e6,
+        "us_per_system": elapsed / (ticks * systems) * 1e6 if systems else 0.0,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing the measured overhead."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--systems", type=int, default=DEFAULT_SYSTEMS)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    args = parser.parse_args(argv)
+
+    row = run(args.systems, args.ticks)
+    print(f"{'systems':>8} {'ticks':>8} {'us/tick':>9} {'us/system':>10}")
+    print(
+        f"{row['systems']:>8} {row['ticks']:>8} "
+        f"{row['us_per_tick']:>9.2f} {row['us_per_system']:>10.3f}"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
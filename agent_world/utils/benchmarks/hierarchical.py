@@ -0,0 +1,126 @@
+"""Time :class:`HierarchicalPathfinder` against :func:`jps` on a large map.
+
+The map is random scattered obstacles. Reported per search: the first
+queries (which compute intra-cluster distances on the way), repeated
+queries, a goal sealed off by walls, and a query right after an obstacle
+change near the route. Path lengths are compared with the shortest ones
+found by :func:`jps`, which is only run on a few pairs because every
+search can cover most of the map.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ...systems.movement.hierarchical import DEFAULT_CLUSTER_SIZE, HierarchicalPathfinder
+from ...systems.movement.pathfinding import ObstacleGrid, jps
+
+Coord = Tuple[int, int]
+
+DEFAULT_SIZE = 2000
+DEFAULT_DENSITY = 0.2
+DEFAULT_QUERIES = 20
+DEFAULT_JPS_QUERIES = 3
+
+
+def _free_tile(grid: ObstacleGrid, size: int, rng: random.Random) -> Coord:
+    while True:
+        tile = (rng.randrange(size), rng.randrange(size))
+        if tile not in grid:
+            return tile
+
+
+def run(
+    size: int = DEFAULT_SIZE,
+    density: float = DEFAULT_DENSITY,
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    queries: int = DEFAULT_QUERIES,
+    jps_queries: int = DEFAULT_JPS_QUERIES,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Return timings in milliseconds per search (build in seconds)."""
+
+    blocked = np.random.default_rng(seed).random((size, size)) < density
+    ys, xs = np.nonzero(blocked)
+    grid = ObstacleGrid(size, size)
+    grid.update(zip(xs.tolist(), ys.tolist()))
+    rng = random.Random(seed)
+    pairs = [(_free_tile(grid, size, rng), _free_tile(grid, size, rng)) for _ in range(queries)]
+
+    finder = HierarchicalPathfinder(grid, (size, size), cluster_size)
+    start = time.perf_counter()
+    finder.sync()
+    build = time.perf_counter() - start
+
+    def per_query(fn: Any, batch: Sequence[Tuple[Coord, Coord]]) -> Tuple[float, List[int]]:
+        begin = time.perf_counter()
+        lengths = [len(fn(a, b)) for a, b in batch]
+        return (time.perf_counter() - begin) / max(len(batch), 1) * 1000, lengths
+
+    cold_ms, hpa_lengths = per_query(finder.path, pairs)
+    warm_ms, _lengths = per_query(finder.path, pairs)
+    jps_pairs = pairs[:jps_queries]
+    jps_ms, jps_lengths = per_query(lambda a, b: jps(a, b, grid), jps_pairs)
+
+    # Seal a goal inside four walls
+    sealed = _free_tile(grid, size, rng)
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        grid.add((sealed[0] + dx, sealed[1] + dy))
+    far = _free_tile(grid, size, rng)
+    sealed_hpa_ms, _lengths = per_query(finder.path, [(far, sealed)])
+    sealed_jps_ms, _lengths = per_query(lambda a, b: jps(a, b, grid), [(far, sealed)])
+
+    # Block a tile in the middle of a known route and ask again
+    route = finder.path(*pairs[0])
+    grid.add(route[len(route) // 2])
+    update_ms, _lengths = per_query(finder.path, pairs[:1])
+
+    overhead = [
+        (hpa - best) / best for hpa, best in zip(hpa_lengths, jps_lengths) if best > 1
+    ]
+    return {
+        "size": size,
+        "clusters": finder.cols * finder.rows,
+        "entrances": len(finder._edges),
+        "build_s": build,
+        "hpa_cold_ms": cold_ms,
+        "hpa_warm_ms": warm_ms,
+        "jps_ms": jps_ms,
+        "sealed_hpa_ms": sealed_hpa_ms,
+        "sealed_jps_ms": sealed_jps_ms,
+        "update_ms": update_ms,
+        "length_overhead": sum(overhead) / len(overhead) if overhead else 0.0,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing the timings."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY)
+    parser.add_argument("--cluster-size", type=int, default=DEFAULT_CLUSTER_SIZE)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--jps-queries", type=int, default=DEFAULT_JPS_QUERIES)
+    args = parser.parse_args(argv)
+
+    r = run(args.size, args.density, args.cluster_size, args.queries, args.jps_queries)
+    print(
+        f"{r['size']}x{r['size']}: {r['clusters']} clusters, {r['entrances']} entrances, "
+        f"built in {r['build_s']:.2f} s"
+    )
+    print(f"{'':<22} {'HPA* ms':>9} {'JPS ms':>9}")
+    print(f"{'first queries':<22} {r['hpa_cold_ms']:>9.1f} {r['jps_ms']:>9.1f}")
+    print(f"{'repeated queries':<22} {r['hpa_warm_ms']:>9.1f} {r['jps_ms']:>9.1f}")
+    print(f"{'sealed goal':<22} {r['sealed_hpa_ms']:>9.1f} {r['sealed_jps_ms']:>9.1f}")
+    print(f"{'after obstacle change':<22} {r['update_ms']:>9.1f}")
+    print(f"HPA* paths {r['length_overhead'] * 100:.1f}% longer than shortest on average")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
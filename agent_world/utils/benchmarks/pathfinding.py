@@ -0,0 +1,178 @@
+"""Time the bitmap A*/JPS search against the previous set-based A*.
+
+Mazes are carved with a randomised depth-first search, so corridors are one
+tile wide and paths between random open tiles wind across most of the map;
+``--loops`` knocks out extra walls to open alternative routes. Open maps
+scatter ``--density`` of the tiles as single obstacles, which is where plain
+A* beats JPS. Every search is checked to return a path of the same length
+as the reference.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from heapq import heappop, heappush
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+
+from ...systems.movement.pathfinding import ObstacleGrid, grid_a_star, jps
+
+Coord = Tuple[int, int]
+
+DEFAULT_SIZES = (100, 1000)
+DEFAULT_QUERIES = 5
+# Fraction of interior walls removed to add loops to the maze
+DEFAULT_LOOPS = 0.05
+# Fraction of tiles blocked on an open map
+DEFAULT_DENSITY = 0.001
+LAYOUTS = ("maze", "open")
+
+
+def maze(size: int, loops: float = DEFAULT_LOOPS, seed: int = 0) -> Set[Coord]:
+    """Return the wall tiles of a ``size`` x ``size`` maze."""
+
+    rng = random.Random(seed)
+    cells = (size - 1) // 2
+    open_tiles = {(1, 1)}
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    while stack:
+        cx, cy = stack[-1]
+        options = [
+            (cx + dx, cy + dy)
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if 0 <= cx + dx < cells and 0 <= cy + dy < cells and (cx + dx, cy + dy) not in visited
+        ]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        visited.add((nx, ny))
+        open_tiles.add((2 * nx + 1, 2 * ny + 1))
+        open_tiles.add((cx + nx + 1, cy + ny + 1))
+        stack.append((nx, ny))
+    walls = {(x, y) for x in range(size) for y in range(size) if (x, y) not in open_tiles}
+    interior = [
+        (x, y) for x, y in walls if 0 < x < size - 1 and 0 < y < size - 1 and (x + y) % 2 == 1
+    ]
+    for tile in rng.sample(interior, int(len(interior) * loops)):
+        walls.discard(tile)
+    return walls
+
+
+def open_map(size: int, density: float = DEFAULT_DENSITY, seed: int = 0) -> Set[Coord]:
+    """Return scattered obstacle tiles covering ``density`` of a ``size`` x ``size`` map."""
+
+    rng = random.Random(seed)
+    return {(x, y) for x in range(size) for y in range(size) if rng.random() < density}
+
+
+def legacy_a_star(start: Coord, goal: Coord, obstacles: Set[Coord]) -> List[Coord]:
+    """The tuple/dict A* that :mod:`pathfinding` used before the bitmap grid."""
+
+    def neighbours(node: Coord) -> List[Coord]:
+        x, y = node
+        candidates = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+        return [c for c in candidates if c not in obstacles]
+
+    def heuristic(a: Coord, b: Coord) -> float:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    open_set: List[Tuple[float, float, Coord]] = [(heuristic(start, goal), 0.0, start)]
+    came_from: Dict[Coord, Coord] = {}
+    g_score: Dict[Coord, float] = {start: 0.0}
+    closed: Set[Coord] = set()
+    while open_set:
+        _f, g, current = heappop(open_set)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            path.reverse()
+            return path
+        if current in closed:
+            continue
+        closed.add(current)
+        for n in neighbours(current):
+            tentative = g + 1
+            if n in closed:
+                continue
+            if tentative < g_score.get(n, float("inf")):
+                came_from[n] = current
+                g_score[n] = tentative
+                heappush(open_set, (tentative + heuristic(n, goal), tentative, n))
+    return []
+
+
+def _time(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    queries: int = DEFAULT_QUERIES,
+    loops: float = DEFAULT_LOOPS,
+    seed: int = 0,
+    density: float = DEFAULT_DENSITY,
+    layouts: Sequence[str] = LAYOUTS,
+) -> List[Dict[str, Any]]:
+    """Return one row per layout and map size with mean milliseconds per search."""
+
+    rows: List[Dict[str, Any]] = []
+    for layout, size in ((layout, size) for layout in layouts for size in sizes):
+        walls = maze(size, loops, seed) if layout == "maze" else open_map(size, density, seed)
+        grid = ObstacleGrid(size, size)
+        grid.update(walls)
+        rng = random.Random(seed)
+        free = [(x, y) for x in range(size) for y in range(size) if (x, y) not in walls]
+        pairs = [(rng.choice(free), rng.choice(free)) for _ in range(queries)]
+
+        totals = {"legacy": 0.0, "grid_a_star": 0.0, "jps": 0.0}
+        length = 0
+        for start, goal in pairs:
+            elapsed, reference = _time(lambda: legacy_a_star(start, goal, walls))
+            totals["legacy"] += elapsed
+            length += len(reference)
+            for name, search in (("grid_a_star", grid_a_star), ("jps", jps)):
+                elapsed, path = _time(lambda: search(start, goal, grid))
+                totals[name] += elapsed
+                if len(path) != len(reference):
+                    raise AssertionError(f"{name} path length {len(path)} != {len(reference)}")
+        rows.append(
+            {
+                "layout": layout,
+                "size": size,
+                "walls": len(walls),
+                "path_len": length / max(queries, 1),
+                **{f"{name}_ms": total / max(queries, 1) * 1000 for name, total in totals.items()},
+            }
+        )
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing the comparison table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--loops", type=float, default=DEFAULT_LOOPS)
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes, args.queries, args.loops, density=args.density, layouts=args.layouts)
+    print(f"{'layout':>6} {'size':>6} {'path':>7} {'legacy ms':>10} {'A* ms':>9} {'JPS ms':>9}")
+    for row in rows:
+        print(
+            f"{row['layout']:>6} {row['size']:>6} {row['path_len']:>7.0f} {row['legacy_ms']:>10.2f} "
+            f"{row['grid_a_star_ms']:>9.2f} {row['jps_ms']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
@@ -0,0 +1,118 @@
+"""Compare :class:`SpatialGrid` and :class:`Quadtree` on uniform and clustered crowds.
+
+The clustered case models every agent converging on one item, as in
+``DefaultPickupScenario``: positions are drawn from a tight normal
+distribution around the map centre, so thousands of entities share a
+handful of grid cells. Each index is timed on a bulk build, a tick of
+single-tile moves and a batch of ``query_radius`` calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from ...core.spatial.quadtree import Quadtree
+from ...core.spatial.spatial_index import SpatialGrid
+
+DEFAULT_ENTITIES = 5000
+DEFAULT_SIZE = 512
+DEFAULT_CELL_SIZE = 16
+DEFAULT_QUERIES = 500
+DEFAULT_RADIUS = 3
+# Standard deviation, in tiles, of the clustered distribution
+CLUSTER_SPREAD = 4.0
+
+
+def _positions(kind: str, entities: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    if kind == "uniform":
+        return rng.integers(0, size, size=(entities, 2))
+    centre = size // 2
+    points = rng.normal(centre, CLUSTER_SPREAD, size=(entities, 2)).round()
+    return np.clip(points, 0, size - 1).astype(np.int64)
+
+
+def _time(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _measure(
+    index: Any, ids: np.ndarray, points: np.ndarray, moved: np.ndarray, queries: np.ndarray,
+    radius: int,
+) -> Dict[str, float]:
+    xs, ys = points[:, 0], points[:, 1]
+    build = _time(lambda: index.rebuild(ids, xs, ys))
+    batch = list(zip(ids.tolist(), map(tuple, moved.tolist())))
+    move = _time(lambda: index.move_many(batch))
+    centres = list(map(tuple, queries.tolist()))
+    found = 0
+
+    def query() -> None:
+        nonlocal found
+        for centre in centres:
+            found += len(index.query_radius(centre, radius))
+
+    elapsed = _time(query)
+    return {
+        "build_ms": build * 1000,
+        "move_ms": move * 1000,
+        "query_us": elapsed / max(len(centres), 1) * 1e6,
+        "found": found,
+    }
+
+
+def run(
+    entities: int = DEFAULT_ENTITIES,
+    size: int = DEFAULT_SIZE,
+    cell_size: int = DEFAULT_CELL_SIZE,
+    queries: int = DEFAULT_QUERIES,
+    radius: int = DEFAULT_RADIUS,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Return one timing row per ``(distribution, index)`` pair."""
+
+    rows: List[Dict[str, Any]] = []
+    for kind in ("uniform", "clustered"):
+        rng = np.random.default_rng(seed)
+        points = _positions(kind, entities, size, rng)
+        ids = np.arange(1, entities + 1, dtype=np.int64)
+        steps = rng.integers(-1, 2, size=points.shape)
+        moved = np.clip(points + steps, 0, size - 1)
+        # Queries centred on entities so the crowded area is what gets probed
+        centres = points[rng.integers(0, entities, size=queries)]
+        for name, index in (
+            ("SpatialGrid", SpatialGrid(cell_size)),
+            ("Quadtree", Quadtree(1, bounds=(0, 0, size, size))),
+        ):
+            row = _measure(index, ids, points, moved, centres, radius)
+            rows.append({"distribution": kind, "index": name, **row})
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Command line entry point printing the comparison table."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=DEFAULT_ENTITIES)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--cell-size", type=int, default=DEFAULT_CELL_SIZE)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    parser.add_argument("--radius", type=int, default=DEFAULT_RADIUS)
+    args = parser.parse_args(argv)
+
+    rows = run(args.entities, args.size, args.cell_size, args.queries, args.radius)
+    print(f"{'distribution':<12} {'index':<12} {'build ms':>9} {'move ms':>8} {'query us':>9}")
+    for row in rows:
+        print(
+            f"{row['distribution']:<12} {row['index']:<12} {row['build_ms']:>9.2f} "
+            f"{row['move_ms']:>8.2f} {row['query_us']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    main()
@@ -21,6 +21,8 @@ import yaml
 logger = logging.getLogger(__name__)
 
 from ...persistence.save_load import save_world
+from ...persistence.event_log import append_world_event, ENTITY_LIMIT
+from ...core.entity_manager import EntityLimitError
 from ..observer import install_tick_observer, toggle_live_fps, print_fps as observer_print_fps
 
 if TYPE_CHECKING:
@@ -169,7 +171,18 @@ def spawn(world: Any, kind: str, x_str: str | None = None, y_str: str | None = N
         x = default_x
         y = default_y
 
-    ent_id = em.create_entity()
+    try:
+        ent_id = em.create_entity()
+    except EntityLimitError:
+        logger.warning(
+            "Entity limit of %s reached. Spawn of '%s' at (%s,%s) rejected.",
+            em.max_entities,
+            kind,
+            x,
+            y,
+        )
+        append_world_event(world, ENTITY_LIMIT, {"kind": kind, "pos": [x, y]})
+        return None
     cm.add_component(ent_id, Position(x, y))
     kind_lower = kind.lower()
 
@@ -357,6 +370,75 @@ def scenario(world: Any, name: str) -> None:
         logger.error("Unknown scenario: %s", name)
 
 
+def schedule(world: Any, args: list[str]) -> None:
+    """Show system update intervals, or set one: ``<system> <interval> [phase]``."""
+
+    sm = getattr(world, "systems_manager", None)
+    if sm is None or not hasattr(sm, "schedule"):
+        logger.error("SystemsManager not found in world.")
+        return
+
+    if args:
+        if len(args) < 2:
+            logger.info("Usage: /schedule [<system> <interval> [phase]]")
+            return
+        name = args[0].lower()
+        matches = [s for s in sm if type(s).__name__.lower() == name]
+        if not matches:
+            logger.error("Unknown system: %s", args[0])
+            return
+        try:
+            interval = int(args[1])
+            phase = int(args[2]) if len(args) > 2 else None
+            for system in matches:
+                sm.set_schedule(system, interval, phase)
+        except ValueError as e:
+            logger.error("Invalid schedule for %s: %s", args[0], e)
+            return
+
+    logger.info("%-24s %8s %6s %6s", "system", "interval", "phase", "stage")
+    for row in sm.schedule():
+        stage = "-" if row["stage"] is None else row["stage"]
+        logger.info(
+            "%-24s %8s %6s %6s", row["name"], row["interval"], row["phase"], stage
+        )
+
+
+def systems(world: Any, args: list[str]) -> None:
+    """Log per-system tick timings; ``/systems overlay`` toggles the GUI view."""
+
+    if args and args[0].lower() == "overlay":
+        world.systems_overlay = not getattr(world, "systems_overlay", False)
+        logger.info(
+            "System timing overlay %s.", "enabled" if world.systems_overlay else "disabled"
+        )
+        return
+
+    timings = getattr(getattr(world, "systems_manager", None), "timings", None)
+    if timings is None:
+        logger.error("SystemsManager not found in world.")
+        return
+    rows = timings.report()
+    if not rows:
+        logger.info("No system timings recorded yet.")
+        return
+    logger.info(
+        "%-24s %7s %8s %8s %8s %8s %8s",
+        "system", "samples", "p50 ms", "p95 ms", "p99 ms", "max ms", "overruns",
+    )
+    for row in rows:
+        logger.info(
+            "%-24s %7d %8.2f %8.2f %8.2f %8.2f %8d",
+            row["name"], row["samples"], row["p50_ms"], row["p95_ms"],
+            row["p99_ms"], row["max_ms"], row["overruns"],
+        )
+    for tick, total, name, seconds in timings.overruns:
+        logger.info(
+            "  overrun at tick %s: %.1f ms, %s took %.1f ms",
+            tick, total * 1000, name, seconds * 1000,
+        )
+
+
 def help_command(state: Dict[str, Any]) -> None:
     help_lines = [
         "\nAvailable commands:",
@@ -371,6 +453,8 @@ def help_command(state: Dict[str, Any]) -> None:
         "  /debug <entity_id>   - Print component data for an entity.",
         "  /follow <entity_id>  - Center camera on an entity each tick.",
         "  /scenario <name>     - Load a scenario by name (e.g., default_pickup).",
+        "  /schedule [sys n [p]]- Show system intervals/phases, or run sys every n ticks.",
+        "  /systems [overlay]   - Show per-system tick timings, or toggle the GUI overlay.",
         "  /quit                - Exit the application.\n",
     ]
     for line in help_lines:
@@ -428,6 +512,12 @@ def execute(command: str, args: list[str], world: Any, state: Dict[str, Any]) ->
     elif cmd_lower == "scenario" and args:
         scenario(world, args[0])
         # return_value remains None
+    elif cmd_lower == "schedule":
+        schedule(world, args)
+        # return_value remains None
+    elif cmd_lower == "systems":
+        systems(world, args)
+        # return_value remains None
     elif cmd_lower == "quit":
         state["running"] = False
         logger.info("Quit command received. Shutting down...")
@@ -440,5 +530,5 @@ def execute(command: str, args: list[str], world: Any, state: Dict[str, Any]) ->
 
 __all__ = [
     "pause", "step", "save", "reload_abilities", "profile", "spawn", "debug",
-    "gui", "fps", "follow", "scenario", "help_command", "execute",
+    "gui", "fps", "follow", "scenario", "schedule", "systems", "help_command", "execute",
 ]
\ No newline at end of file
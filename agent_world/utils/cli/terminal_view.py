@@ -41,7 +41,7 @@ class TerminalView:
         return self.enabled
 
     def render(self, world: Any, center: tuple[int, int] | None = None) -> None:
-        """Draw a 40×20 chunk of ``world.tile_map`` to ``stdout``."""
+        """Draw a 40×20 chunk of ``world.tiles`` to ``stdout``."""
 
         if not self.enabled:
             return
@@ -58,12 +58,14 @@ class TerminalView:
         end_x = min(world.size[0], start_x + self.width)
         end_y = min(world.size[1], start_y + self.height)
 
+        tile_defs = world.tiles.definitions()
+        window = world.tiles.layer[start_y:end_y, start_x:end_x].tolist()
+
         lines: list[str] = []
-        for y in range(start_y, end_y):
+        for kind_row in window:
             row: list[str] = []
-            for x in range(start_x, end_x):
-                tile = world.tile_map[y][x]
-                glyph, colour = _tile_to_glyph_colour(tile)
+            for kind_id in kind_row:
+                glyph, colour = _tile_to_glyph_colour(tile_defs[kind_id])
                 row.append(f"{_COLOURS.get(colour, '')}{glyph}")
             row.append(_COLOURS["reset"])
             lines.append("".join(row))
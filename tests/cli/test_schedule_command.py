@@ -0,0 +1,31 @@
+from agent_world.core.world import World
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.utils.cli import commands
+
+
+class Sweeper:
+    interval = 4
+
+    def update(self, tick):
+        pass
+
+
+def test_schedule_command_sets_interval_and_phase():
+    world = World((5, 5))
+    world.systems_manager = SystemsManager()
+    world.systems_manager.register(Sweeper())
+
+    commands.execute("schedule", ["sweeper", "3", "2"], world, {})
+
+    row = world.systems_manager.schedule()[0]
+    assert (row["name"], row["interval"], row["phase"]) == ("Sweeper", 3, 2)
+
+
+def test_schedule_command_rejects_bad_interval():
+    world = World((5, 5))
+    world.systems_manager = SystemsManager()
+    world.systems_manager.register(Sweeper())
+
+    commands.execute("schedule", ["Sweeper", "0"], world, {})
+
+    assert world.systems_manager.schedule()[0]["interval"] == 4
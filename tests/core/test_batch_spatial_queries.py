@@ -0,0 +1,131 @@
+import random
+
+import numpy as np
+
+from agent_world.ai.behaviors.creature_bt import _attack_adjacent
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.health import Health
+from agent_world.core.components.position import Position
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.core.world import World
+
+
+def _grid(cell_size, count=300, seed=1):
+    rng = random.Random(seed)
+    grid = SpatialGrid(cell_size)
+    positions = {}
+    for ent in range(1, count + 1):
+        pos = (rng.randrange(-20, 80), rng.randrange(-20, 80))
+        grid.insert(ent, pos)
+        positions[ent] = pos
+    points = np.array([(rng.randrange(-30, 90), rng.randrange(-30, 90)) for _ in range(40)])
+    return grid, positions, points
+
+
+def _brute_nearest(positions, point, k, keep=lambda ent: True, max_d2=None):
+    x, y = point
+    ranked = sorted(
+        ((px - x) ** 2 + (py - y) ** 2, ent)
+        for ent, (px, py) in positions.items()
+        if keep(ent)
+    )
+    if max_d2 is not None:
+        ranked = [item for item in ranked if item[0] <= max_d2]
+    return ranked[:k]
+
+
+def test_query_radius_many_matches_single_queries():
+    for cell_size in (1, 3, 8):
+        grid, _positions, points = _grid(cell_size)
+        for radius in (0, 1, 5, 17):
+            offsets, ids = grid.query_radius_many(points, radius)
+            assert len(offsets) == len(points) + 1
+            for i, point in enumerate(points.tolist()):
+                batch = ids[offsets[i] : offsets[i + 1]].tolist()
+                assert sorted(batch) == sorted(grid.query_radius(tuple(point), radius))
+
+
+def test_k_nearest_with_filter_and_exclude():
+    grid, positions, points = _grid(4)
+    exclude = list(range(1, len(points) + 1))
+
+    ids, dist = grid.k_nearest(points, 5, filter=lambda a: a % 2 == 0, exclude=exclude)
+
+    for i, point in enumerate(points.tolist()):
+        expected = _brute_nearest(
+            positions, point, 5, keep=lambda ent: ent % 2 == 0 and ent != exclude[i]
+        )
+        assert ids[i].tolist() == [ent for _d, ent in expected]
+        assert dist[i].tolist() == [d for d, _ent in expected]
+
+
+def test_k_nearest_pads_when_radius_limits_hits():
+    grid, positions, points = _grid(2)
+    allowed = {2, 4, 6, 8}
+
+    ids, dist = grid.k_nearest(points, 3, filter=allowed, max_radius=6)
+
+    for i, point in enumerate(points.tolist()):
+        expected = _brute_nearest(positions, point, 3, keep=allowed.__contains__, max_d2=36)
+        found = [ent for ent in ids[i].tolist() if ent != -1]
+        assert found == [ent for _d, ent in expected]
+        assert np.isinf(dist[i][len(found) :]).all()
+
+
+def test_k_nearest_on_large_sparse_map():
+    # Far apart entities on a huge map: the search radius grows to millions
+    # of cells, so only occupied cells may be visited
+    grid = SpatialGrid(1)
+    positions = {1: (0, 0), 2: (1_000_000, 1_000_000), 3: (3, 999_000)}
+    for ent, pos in positions.items():
+        grid.insert(ent, pos)
+    rng = random.Random(2)
+    points = np.array([(rng.randrange(1_000_000), rng.randrange(1_000_000)) for _ in range(20)])
+
+    ids, dist = grid.k_nearest(points, 2)
+
+    for i, point in enumerate(points):
+        expected = _brute_nearest(positions, tuple(point), 2)
+        assert ids[i].tolist() == [ent for _d2, ent in expected]
+        assert dist[i].tolist() == [d2 for d2, _ent in expected]
+    offsets, hits = grid.query_radius_many(points[:3], 2_000_000)
+    assert np.diff(offsets).tolist() == [3, 3, 3]
+
+
+def test_batch_queries_see_later_changes():
+    grid = SpatialGrid(4)
+    grid.insert(1, (0, 0))
+    assert grid.k_nearest([(0, 0)], 1)[0].tolist() == [[1]]
+
+    grid.move(1, (50, 50))
+    grid.insert(2, (1, 1))
+
+    assert grid.k_nearest([(0, 0)], 1)[0].tolist() == [[2]]
+    offsets, ids = grid.query_radius_many([(50, 50)], 0)
+    assert ids.tolist() == [1]
+
+
+def test_creature_targets_nearest_living_neighbour_via_index():
+    world = World((10, 10))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    world.spatial_index = SpatialGrid(2)
+    em, cm = world.entity_manager, world.component_manager
+
+    def spawn(pos, hp=None):
+        ent = em.create_entity()
+        cm.add_component(ent, Position(*pos))
+        if hp is not None:
+            cm.add_component(ent, Health(cur=hp, max=10))
+        world.spatial_index.insert(ent, pos)
+        return ent
+
+    creature = spawn((5, 5))
+    spawn((5, 6), hp=0)
+    target = spawn((6, 5), hp=4)
+    spawn((7, 5), hp=10)
+
+    assert _attack_adjacent(creature, world) == f"USE_ABILITY MeleeStrike {target}"
+    cm.get_component(target, Health).cur = 0
+    assert _attack_adjacent(creature, world) is None
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import yaml
+
+from agent_world.bootstrap import bootstrap
+from agent_world.core.spatial.cell_tuning import CellSizeTuner, best_cell_size
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.utils.benchmarks import cell_size as cell_size_benchmark
+
+
+def test_denser_worlds_get_smaller_cells():
+    sizes = [best_cell_size({10: 1.0}, density) for density in (0.0, 0.01, 0.1, 1.0, 10.0)]
+
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[0] == 21
+    assert sizes[-1] == 1
+    assert best_cell_size({}, 0.5) == 1
+
+
+def test_tuner_resizes_grid_without_changing_results():
+    grid = SpatialGrid(1)
+    for ent in range(1, 51):
+        grid.insert(ent, ((ent * 7) % 100, (ent * 13) % 100))
+    before = sorted(grid.query_radius((50, 50), 10))
+    world = SimpleNamespace(spatial_index=grid, size=(100, 100))
+
+    tuner = CellSizeTuner(world, radii=(10,))
+    new_size = tuner.tune()
+
+    assert new_size == grid.cell_size > 1
+    assert sorted(grid.query_radius((50, 50), 10)) == before
+    # Already optimal: nothing to do
+    assert tuner.tune() is None
+
+
+def test_tuner_ignores_small_gains():
+    grid = SpatialGrid(1)
+    grid.insert(1, (5, 5))
+    world = SimpleNamespace(spatial_index=grid, size=(100, 100))
+    tuner = CellSizeTuner(world, radii=(10,))
+    tuner.tune()
+    chosen = grid.cell_size
+
+    grid.resize(chosen - 1)
+    assert tuner.tune() is None
+    assert grid.cell_size == chosen - 1
+
+
+def test_bootstrap_registers_tuner(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump({"world": {"size": [20, 20]}, "llm": {"mode": "offline"}}))
+    world = bootstrap(path)
+    assert world.cell_size_tuner in list(world.systems_manager)
+
+    path.write_text(
+        yaml.dump(
+            {
+                "world": {"size": [20, 20], "spatial_autotune": False, "spatial_cell_size": 4},
+                "llm": {"mode": "offline"},
+            }
+        )
+    )
+    world = bootstrap(path)
+    assert world.spatial_index.cell_size == 4
+    assert not any(isinstance(s, CellSizeTuner) for s in world.systems_manager)
+
+
+def test_benchmark_reports_each_cell_size():
+    result = cell_size_benchmark.run(entities=50, queries=20, cell_sizes=(1, 4))
+
+    assert [row["cell_size"] for row in result["rows"]] == [1, 4]
+    assert result["tuned"] >= 1
@@ -0,0 +1,119 @@
+import numpy as np
+
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.position import Position, position_arrays
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.persistence.serializer import serialize, deserialize
+
+
+def test_views_read_and_write_shared_columns():
+    cm = ComponentManager()
+    for eid in (1, 2, 3):
+        cm.add_component(eid, Physics(mass=1.0, vx=float(eid), vy=eid * 10.0, friction=0.5))
+
+    store = cm.columns(Physics)
+    assert sorted(store.entity_ids().tolist()) == [1, 2, 3]
+
+    phys = cm.get_component(2, Physics)
+    phys.vx = 7.0
+    assert 7.0 in store.column("vx")
+
+    store.column("vy")[:] += 1
+    assert cm.get_component(3, Physics) == Physics(mass=1.0, vx=3.0, vy=31.0, friction=0.5)
+    assert isinstance(phys.vy, float)
+
+
+def test_removal_keeps_columns_dense_and_values_on_detached_view():
+    cm = ComponentManager()
+    for eid in range(1, 5):
+        cm.add_component(eid, Physics(mass=1.0, vx=float(eid), vy=0.0, friction=0.5))
+
+    removed = cm.remove_component(2, Physics)
+    assert removed == Physics(mass=1.0, vx=2.0, vy=0.0, friction=0.5)
+
+    store = cm.columns(Physics)
+    assert len(store) == 3
+    assert sorted(store.column("vx").tolist()) == [1.0, 3.0, 4.0]
+    for eid in (1, 3, 4):
+        assert cm.get_component(eid, Physics).vx == float(eid)
+
+    removed.vx = 9.0
+    assert 9.0 not in store.column("vx")
+
+
+def test_replacing_a_component_releases_its_row():
+    cm = ComponentManager()
+    old = Physics(mass=1.0, vx=1.0, vy=1.0, friction=0.5)
+    cm.add_component(1, old)
+    cm.add_component(1, Physics(mass=1.0, vx=4.0, vy=5.0, friction=0.5))
+
+    assert len(cm.columns(Physics)) == 1
+    assert old.vx == 1.0
+    assert cm.get_component(1, Physics).vx == 4.0
+
+
+def test_column_components_serialize_as_plain_values():
+    data = serialize(Physics(mass=2.0, vx=0.5, vy=-0.5, friction=0.9))
+    assert data["vx"] == 0.5 and type(data["vx"]) is float
+    assert deserialize(data) == Physics(mass=2.0, vx=0.5, vy=-0.5, friction=0.9)
+
+
+def test_position_stays_a_plain_slotted_component():
+    cm = ComponentManager()
+    pos = Position(1.5, 2)
+    cm.add_component(1, pos)
+
+    assert cm.columns(Position) is None
+    assert cm.get_component(1, Position).x == 1.5
+    assert not hasattr(pos, "__dict__")
+
+
+def test_spatial_grid_rebuilds_from_position_arrays():
+    cm = ComponentManager()
+    cm.add_component(1, Position(0, 0))
+    cm.add_component(2, Position(3, 4))
+    ids, xs, ys = position_arrays(cm)
+
+    grid = SpatialGrid(2)
+    grid.insert(99, (1, 1))
+    grid.rebuild(ids, xs, ys)
+
+    assert sorted(grid.query_radius((0, 0), 5)) == [1, 2]
+    assert grid.query_radius((1, 1), 0) == []
+    assert np.array_equal(np.sort(ids), [1, 2])
+    assert position_arrays(ComponentManager())[0].size == 0
+
+
+def test_physics_system_updates_velocity_columns():
+    from agent_world.core.world import World
+    from agent_world.core.entity_manager import EntityManager
+    from agent_world.core.components.force import Force
+    from agent_world.systems.movement.physics_system import PhysicsSystem
+    from agent_world.systems.movement.pathfinding import OBSTACLES
+
+    OBSTACLES.clear()
+    world = World((5, 5))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    em, cm = world.entity_manager, world.component_manager
+
+    coasting = em.create_entity()
+    cm.add_component(coasting, Position(2, 2))
+    cm.add_component(coasting, Physics(mass=1.0, vx=1.0, vy=0.0, friction=0.5))
+    pushed = em.create_entity()
+    cm.add_component(pushed, Physics(mass=2.0, vx=0.0, vy=0.0, friction=0.5))
+    cm.add_component(pushed, Force(4.0, 0.0))
+    walled = em.create_entity()
+    cm.add_component(walled, Position(4, 0))
+    cm.add_component(walled, Physics(mass=1.0, vx=1.0, vy=0.0, friction=0.5))
+
+    events = []
+    PhysicsSystem(world, events).update()
+    world.command_buffer.flush()
+
+    assert cm.get_component(coasting, Physics).vx == 0.5
+    assert cm.get_component(pushed, Physics).vx == 1.0
+    assert cm.get_component(pushed, Force) is None
+    assert cm.get_component(walled, Physics).vx == 0.0
+    assert [e["entity"] for e in events] == [walled]
@@ -0,0 +1,80 @@
+from agent_world.core.world import World
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.core.components.health import Health
+from agent_world.core.components.position import Position
+
+
+def _world():
+    world = World((5, 5))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    world.systems_manager = SystemsManager()
+    return world
+
+
+def test_operations_apply_in_order_on_flush():
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    buffer = world.command_buffer
+
+    eid = buffer.create_entity(Position(1, 1))
+    buffer.add_component(eid, Health(cur=3, max=3))
+    assert not em.has_entity(eid)
+
+    assert buffer.flush() == 2
+    assert cm.get_component(eid, Position) == Position(1, 1)
+    assert cm.get_component(eid, Health).cur == 3
+
+    buffer.destroy_entity(eid)
+    buffer.add_component(eid, Health(cur=1, max=1))
+    buffer.flush()
+    assert not em.has_entity(eid)
+    assert cm.get_component(eid, Health) is None
+
+
+def test_cleared_creations_release_their_ids():
+    world = _world()
+    em = world.entity_manager
+    reserved = world.command_buffer.create_entity()
+    world.command_buffer.clear()
+
+    assert len(world.command_buffer) == 0
+    assert em.is_stale(reserved)
+    assert em.create_entity() != reserved
+
+
+class _Despawner:
+    def __init__(self, world, seen):
+        self.world = world
+        self.seen = seen
+
+    def update(self):
+        cm = self.world.component_manager
+        for entity_id, hp in cm.query(Health):
+            if hp.cur <= 0:
+                self.world.command_buffer.destroy_entity(entity_id)
+
+
+class _Counter:
+    def __init__(self, world, seen):
+        self.world = world
+        self.seen = seen
+
+    def update(self):
+        self.seen.append(sorted(eid for eid, _ in self.world.component_manager.query(Health)))
+
+
+def test_systems_manager_flushes_between_systems():
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    for cur in (0, 5, 0):
+        cm.add_component(em.create_entity(), Health(cur=cur, max=5))
+
+    seen = []
+    world.systems_manager.register(_Despawner(world, seen))
+    world.systems_manager.register(_Counter(world, seen))
+    world.systems_manager.update(world, 0)
+
+    assert seen == [[2]]
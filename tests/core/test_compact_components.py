@@ -0,0 +1,43 @@
+import pytest
+
+from agent_world.core.column_store import ColumnComponent
+from agent_world.core.components.force import Force
+from agent_world.core.components.health import Health
+from agent_world.core.components.inventory import Inventory
+from agent_world.core.components.ownership import Ownership
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.position import Position
+from agent_world.core.components.relationship import Relationship
+from agent_world.core.components.role import RoleComponent
+from agent_world.persistence.serializer import serialize, deserialize
+from agent_world.utils.benchmarks import component_memory
+
+
+COMPONENTS = [
+    Position(1, 2),
+    Health(cur=3, max=5),
+    Physics(mass=1.0, vx=0.5, vy=0.0, friction=0.9),
+    Inventory(capacity=2, items=[7]),
+    Ownership(owner_id=4),
+    Relationship(faction="a", reputation=1),
+    RoleComponent(role_name="merchant"),
+    Force(1.0, -1.0, ttl=2),
+]
+
+
+@pytest.mark.parametrize("comp", COMPONENTS, ids=lambda c: type(c).__name__)
+def test_core_components_have_no_instance_dict(comp):
+    assert not hasattr(comp, "__dict__")
+    assert deserialize(serialize(comp)) == comp
+
+
+def test_memory_benchmark_reports_slotted_savings():
+    rows = component_memory.run([200])
+    by_name = {row["component"]: row for row in rows}
+
+    assert "<entity>" in by_name
+    for comp in COMPONENTS:
+        row = by_name[type(comp).__name__]
+        assert row["bytes_per_entity"] > 0
+        if not isinstance(comp, ColumnComponent):
+            assert row["bytes_per_entity"] < row["dict_bytes_per_entity"]
@@ -0,0 +1,84 @@
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.health import Health
+from agent_world.core.components.position import Position
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.core.world import World
+
+
+def test_added_and_removed_hooks_fire_with_components():
+    cm = ComponentManager()
+    added, removed = [], []
+    cm.on_added(Health, lambda eid, comp: added.append((eid, comp.cur)))
+    cm.on_removed(Health, lambda eid, comp: removed.append((eid, comp.cur)))
+
+    cm.add_component(1, Health(cur=5, max=5))
+    cm.add_component(1, Health(cur=3, max=5))
+    cm.add_component(1, Position(0, 0))
+    cm.remove_component(1, Health)
+
+    assert added == [(1, 5), (1, 3)]
+    assert removed == [(1, 5), (1, 3)]
+
+
+def test_remove_hook_and_entity_removal():
+    cm = ComponentManager()
+    removed = []
+    hook = lambda eid, comp: removed.append(type(comp).__name__)
+    cm.on_removed(Position, hook)
+    cm.on_removed(Health, hook)
+    cm.add_component(1, Position(0, 0))
+    cm.add_component(1, Health(cur=1, max=1))
+
+    cm.remove_entity(1)
+    assert sorted(removed) == ["Health", "Position"]
+
+    cm.remove_hook(hook)
+    cm.add_component(2, Position(0, 0))
+    cm.remove_entity(2)
+    assert len(removed) == 2
+
+
+def test_changed_since_tracks_writes_per_tick():
+    cm = ComponentManager()
+    for eid in (1, 2, 3):
+        cm.add_component(eid, Position(eid, 0))
+        cm.add_component(eid, Health(cur=1, max=1))
+    cm.end_tick(0)
+
+    cm.get_component(2, Position).x = 9
+    cm.mark_changed(2, Position)
+    cm.end_tick(1)
+    cm.remove_component(3, Position)
+    cm.get_component(1, Health).cur = 0
+    cm.mark_changed(1, Health)
+
+    assert cm.changed_since(Position, 0) == {2, 3}
+    assert cm.changed_since(Position, 1) == {3}
+    assert cm.changed_since(Health, 1) == {1}
+    assert cm.changed_since(Position, -1) == {1, 2, 3}
+
+
+def test_changed_since_reports_lost_history():
+    cm = ComponentManager(change_history=2)
+    for tick in range(4):
+        cm.add_component(tick, Position(tick, 0))
+        cm.end_tick(tick)
+
+    assert cm.changed_since(Position, 0) is None
+    assert cm.changed_since(Position, 1) == {2, 3}
+
+
+def test_systems_manager_closes_the_tick():
+    world = World((3, 3))
+    world.component_manager = ComponentManager()
+    world.systems_manager = SystemsManager()
+    world.component_manager.add_component(1, Position(0, 0))
+
+    world.systems_manager.update(world, 5)
+    world.component_manager.get_component(1, Position).y = 2
+    world.component_manager.mark_changed(1, Position)
+
+    assert world.component_manager.changed_since(Position, 4) == {1}
+    assert world.component_manager.changed_since(Position, 5) == {1}
+    world.systems_manager.update(world, 6)
+    assert world.component_manager.changed_since(Position, 6) == set()
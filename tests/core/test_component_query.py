@@ -0,0 +1,61 @@
+import pytest
+
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.position import Position
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.health import Health
+
+
+def test_query_yields_aligned_components_for_matching_entities():
+    cm = ComponentManager()
+    cm.add_component(1, Position(0, 0))
+    cm.add_component(1, Physics(mass=1.0, vx=0.0, vy=0.0, friction=0.9))
+    cm.add_component(2, Position(5, 5))
+    cm.add_component(3, Position(7, 7))
+    cm.add_component(3, Physics(mass=2.0, vx=1.0, vy=0.0, friction=0.9))
+    cm.add_component(3, Health(cur=5, max=5))
+
+    rows = {eid: (pos, phys) for eid, pos, phys in cm.query(Position, Physics)}
+
+    assert set(rows) == {1, 3}
+    for eid, (pos, phys) in rows.items():
+        assert cm.get_component(eid, Position) is pos
+        assert cm.get_component(eid, Physics) is phys
+
+
+def test_query_tracks_component_removal_and_replacement():
+    cm = ComponentManager()
+    for eid in (1, 2, 3):
+        cm.add_component(eid, Position(eid, eid))
+        cm.add_component(eid, Health(cur=eid, max=10))
+
+    cm.remove_component(1, Health)
+    replacement = Health(cur=9, max=10)
+    cm.add_component(3, replacement)
+
+    rows = {eid: hp for eid, _pos, hp in cm.query(Position, Health)}
+    assert set(rows) == {2, 3}
+    assert rows[3] is replacement
+    assert {eid for eid, _pos in cm.query(Position)} == {1, 2, 3}
+
+
+def test_query_rejects_structural_changes_while_iterating():
+    cm = ComponentManager()
+    for eid in range(1, 6):
+        cm.add_component(eid, Position(eid, 0))
+        cm.add_component(eid, Health(cur=1, max=1))
+
+    with pytest.raises(RuntimeError):
+        for eid, _pos, _hp in cm.query(Position, Health):
+            cm.remove_component(eid, Health)
+
+
+def test_query_allows_replacing_components_while_iterating():
+    cm = ComponentManager()
+    for eid in range(1, 4):
+        cm.add_component(eid, Health(cur=1, max=1))
+
+    for eid, _hp in cm.query(Health):
+        cm.add_component(eid, Health(cur=2, max=2))
+
+    assert [hp.cur for _eid, hp in cm.query(Health)] == [2, 2, 2]
@@ -0,0 +1,90 @@
+import inspect
+
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.utils.benchmarks import dispatch_overhead
+
+
+class _Recorder:
+    def __init__(self, calls, name):
+        self.calls = calls
+        self.name = name
+
+
+class _NoArgs(_Recorder):
+    def update(self):
+        self.calls.append((self.name, ()))
+
+
+class _TickOnly(_Recorder):
+    def update(self, tick):
+        self.calls.append((self.name, (tick,)))
+
+
+class _WorldTick(_Recorder):
+    def update(self, world, tick):
+        self.calls.append((self.name, (world, tick)))
+
+
+def test_systems_receive_trailing_args_in_order():
+    calls = []
+    sm = SystemsManager()
+    sm.register(_NoArgs(calls, "a"))
+    sm.register(_TickOnly(calls, "b"))
+    sm.register(_WorldTick(calls, "c"))
+
+    sm.update("w", 3)
+
+    assert calls == [("a", ()), ("b", (3,)), ("c", ("w", 3))]
+
+
+def test_signatures_are_not_inspected_per_tick(monkeypatch):
+    calls = []
+    sm = SystemsManager()
+    sm.register(_TickOnly(calls, "b"))
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("signature inspected during update")
+
+    monkeypatch.setattr(inspect, "signature", _fail)
+    sm.update("w", 1)
+    sm.update("w", 2)
+    assert calls == [("b", (1,)), ("b", (2,))]
+
+
+def test_plan_follows_register_and_unregister():
+    calls = []
+    sm = SystemsManager()
+    first = _TickOnly(calls, "first")
+    second = _TickOnly(calls, "second")
+    sm.register(first)
+    sm.register(second)
+    sm.unregister(first)
+
+    sm.update(0)
+    assert calls == [("second", (0,))]
+
+
+def test_registration_during_update_applies_next_tick():
+    calls = []
+    sm = SystemsManager()
+    late = _TickOnly(calls, "late")
+
+    class _Registrar:
+        def update(self, tick):
+            calls.append(("registrar", (tick,)))
+            sm.register(late)
+
+    sm.register(_Registrar())
+    sm.update(0)
+    sm.update(1)
+    assert calls == [
+        ("registrar", (0,)),
+        ("registrar", (1,)),
+        ("late", (1,)),
+    ]
+
+
+def test_dispatch_benchmark_runs():
+    row = dispatch_overhead.run(systems=15, ticks=50)
+    assert row["systems"] == 15
+    assert row["us_per_tick"] > 0
@@ -0,0 +1,41 @@
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.position import Position
+from agent_world.core.components.health import Health
+from agent_world.core.components.perception_cache import PerceptionCache
+
+
+def test_entities_with_intersects_component_sets():
+    cm = ComponentManager()
+    for eid in range(1, 11):
+        cm.add_component(eid, Position(eid, 0))
+    for eid in (2, 4, 6):
+        cm.add_component(eid, Health(cur=1, max=1))
+    cm.add_component(4, PerceptionCache())
+    cm.add_component(7, PerceptionCache())
+
+    assert cm.entities_with(Position) == set(range(1, 11))
+    assert cm.entities_with(Position, Health) == {2, 4, 6}
+    assert cm.entities_with(Health, PerceptionCache, Position) == {4}
+    assert cm.entities_with() == set()
+
+
+def test_entities_with_follows_add_and_remove():
+    cm = ComponentManager()
+    cm.add_component(1, Health(cur=1, max=1))
+    cm.add_component(1, Health(cur=2, max=2))
+    cm.add_component(2, Health(cur=1, max=1))
+
+    assert cm.entities_with(Health) == {1, 2}
+    cm.remove_component(1, Health)
+    assert cm.entities_with(Health) == {2}
+    assert cm.entities_with(Position) == set()
+
+
+def test_entities_with_returns_independent_set():
+    cm = ComponentManager()
+    cm.add_component(1, Health(cur=1, max=1))
+
+    result = cm.entities_with(Health)
+    result.add(99)
+
+    assert cm.entities_with(Health) == {1}
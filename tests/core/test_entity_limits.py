@@ -0,0 +1,70 @@
+import pytest
+
+from agent_world.core.world import World
+from agent_world.core.entity_manager import EntityManager, EntityLimitError
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.inventory import Inventory
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.position import Position
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.persistence.event_log import ENTITY_LIMIT
+from agent_world.systems.interaction.crafting import CraftingSystem
+from agent_world.utils.cli import commands
+
+
+def _world(max_entities):
+    world = World((10, 10))
+    world.entity_manager = EntityManager(max_entities=max_entities)
+    world.component_manager = ComponentManager(capacity=max_entities)
+    world.spatial_index = SpatialGrid(1)
+    world.persistent_event_log_path = []
+    return world
+
+
+def test_create_entity_enforces_cap_and_frees_on_destroy():
+    em = EntityManager(max_entities=2)
+    first = em.create_entity()
+    em.reserve_entity()
+    assert em.remaining_capacity() == 0
+    with pytest.raises(EntityLimitError):
+        em.create_entity()
+
+    em.destroy_entity(first)
+    assert em.remaining_capacity() == 1
+    em.create_entity()
+
+
+def test_pools_are_presized():
+    world = _world(100)
+    em, cm = world.entity_manager, world.component_manager
+    assert len(em._generations) == 101
+
+    eid = em.create_entity()
+    cm.add_component(eid, Physics(mass=1.0, vx=0.0, vy=0.0, friction=0.5))
+    assert len(cm.columns(Physics)._entities) == 100
+    assert em.allocator_state()["generations"] == [0]
+
+
+def test_spawn_is_rejected_with_event_at_cap():
+    world = _world(1)
+    assert commands.spawn(world, "item", "1", "1") is not None
+    assert commands.spawn(world, "item", "2", "2") is None
+
+    events = world.persistent_event_log_path
+    assert events[-1]["event_type"] == ENTITY_LIMIT
+    assert len(world.entity_manager.all_entities) == 1
+
+
+def test_crafting_keeps_inputs_when_outputs_do_not_fit(tmp_path):
+    recipes = tmp_path / "recipes.json"
+    recipes.write_text('{"basic": {"inputs": 1, "outputs": 2}}')
+    world = _world(3)
+    em, cm = world.entity_manager, world.component_manager
+    crafter = em.create_entity()
+    item = em.create_entity()
+    cm.add_component(crafter, Inventory(capacity=5, items=[item]))
+
+    crafting = CraftingSystem(world, recipe_path=recipes)
+    assert crafting.craft(crafter, "basic") is False
+    assert cm.get_component(crafter, Inventory).items == [item]
+    assert world.persistent_event_log_path[-1]["event_type"] == ENTITY_LIMIT
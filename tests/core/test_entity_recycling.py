@@ -0,0 +1,87 @@
+from agent_world.core.world import World
+from agent_world.core.entity_manager import (
+    EntityManager,
+    entity_generation,
+    entity_index,
+)
+from agent_world.persistence.serializer import world_from_dict, world_to_dict
+
+
+def test_destroyed_slots_are_recycled_with_new_generation():
+    em = EntityManager()
+    first = [em.create_entity() for _ in range(3)]
+    assert first == [1, 2, 3]
+
+    em.destroy_entity(first[1])
+    recycled = em.create_entity()
+
+    assert entity_index(recycled) == entity_index(first[1])
+    assert entity_generation(recycled) == 1
+    assert recycled != first[1]
+    assert em.has_entity(recycled)
+    assert not em.has_entity(first[1])
+    assert em.is_stale(first[1])
+    assert not em.is_stale(recycled)
+    # No new slot was needed
+    assert em.create_entity() == 4
+
+
+def test_destroy_ignores_unknown_and_stale_ids():
+    em = EntityManager()
+    eid = em.create_entity()
+    em.destroy_entity(eid)
+    em.destroy_entity(eid)
+    em.destroy_entity(12345)
+
+    a = em.create_entity()
+    b = em.create_entity()
+    assert entity_index(a) == entity_index(eid)
+    assert entity_index(b) == 2
+
+
+def test_allocator_state_survives_serialization():
+    world = World((3, 3))
+    world.entity_manager = EntityManager()
+    em = world.entity_manager
+    ids = [em.create_entity() for _ in range(4)]
+    em.destroy_entity(ids[0])
+    em.destroy_entity(ids[2])
+
+    restored = world_from_dict(world_to_dict(world)).entity_manager
+
+    assert set(restored.all_entities) == {ids[1], ids[3]}
+    new_ids = [restored.create_entity() for _ in range(3)]
+    assert [entity_index(e) for e in new_ids] == [1, 3, 5]
+    assert ids[0] not in new_ids and ids[2] not in new_ids
+
+
+def test_allocator_rebuilt_from_live_ids_without_state():
+    em = EntityManager()
+    em._entity_components[2] = {}
+    em._entity_components[5] = {}
+    em.restore_allocator()
+
+    new_ids = [em.create_entity() for _ in range(4)]
+    assert {entity_index(e) for e in new_ids} == {1, 3, 4, 6}
+    assert all(e not in (1, 3, 4) for e in new_ids)
+
+
+def test_allocated_id_drops_components_attached_before_creation():
+    from agent_world.core.component_manager import ComponentManager
+    from agent_world.core.components.position import Position
+
+    world = World((10, 10))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    em, cm = world.entity_manager, world.component_manager
+    cm.add_component(1, Position(3, 3))  # id 1 was never created
+
+    eid = em.create_entity()
+
+    assert eid == 1
+    assert cm.get_component(eid, Position) is None
+    assert eid not in cm.entities_with(Position)
+    assert list(cm.query(Position)) == []
+    cm.add_component(eid, Position(1, 1))
+    em.destroy_entity(eid)
+    assert not cm.entities_with(Position)
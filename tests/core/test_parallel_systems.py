@@ -0,0 +1,190 @@
+import threading
+
+import pytest
+
+from agent_world.core.world import World
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.core.components.health import Health
+from agent_world.core.components.inventory import Inventory
+from agent_world.core.components.position import Position
+from agent_world.core.spatial.cell_tuning import CellSizeTuner
+from agent_world.systems.ai.ai_reasoning_system import AIReasoningSystem
+from agent_world.systems.movement.movement_system import MovementSystem
+from agent_world.systems.movement.physics_system import PhysicsSystem
+
+
+def _world(workers=2):
+    world = World((5, 5))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    world.systems_manager = SystemsManager(max_workers=workers)
+    return world
+
+
+class _Declared:
+    reads = ()
+    writes = ()
+
+    def __init__(self, reads=(), writes=(), run=None):
+        self.reads = reads
+        self.writes = writes
+        self.run = run
+
+    def update(self, world, tick):
+        if self.run is not None:
+            self.run(world)
+
+
+class _Exclusive:
+    def update(self):
+        pass
+
+
+@pytest.mark.parametrize("physics_first", [True, False])
+def test_movement_declares_it_runs_after_physics(physics_first):
+    world = _world()
+    sm = world.systems_manager
+    physics, movement = PhysicsSystem(world), MovementSystem(world)
+    for system in ((physics, movement) if physics_first else (movement, physics)):
+        sm.register(system)
+    assert list(sm) == [physics, movement]
+
+
+def test_stages_follow_declared_conflicts():
+    sm = SystemsManager(max_workers=2)
+    a = _Declared(reads=(Position,), writes=(Health,))
+    b = _Declared(reads=(Position,), writes=("spatial_index",))
+    c = _Declared(writes=(Position,))
+    d = _Exclusive()
+    for system in (a, b, c, d):
+        sm.register(system)
+    assert sm.stages() == [[a, b], [c], [d]]
+
+
+def test_llm_reasoning_overlaps_systems_outside_its_access():
+    world = _world()
+    world.raw_actions_with_actor = []
+    sm = world.systems_manager
+    reasoning = AIReasoningSystem(world, llm=None, action_tuples_list=world.raw_actions_with_actor)
+    renderer = _Declared(reads=("gui",))
+    movement = MovementSystem(world)
+    for system in (reasoning, renderer, movement):
+        sm.register(system)
+    # Movement writes AIState, which the reasoning system also updates
+    assert sm.stages() == [[reasoning, renderer], [movement]]
+
+
+def test_llm_reasoning_never_shares_a_stage_with_index_or_path_writers():
+    world = _world()
+    world.raw_actions_with_actor = []
+    sm = world.systems_manager
+    reasoning = AIReasoningSystem(world, llm=None, action_tuples_list=world.raw_actions_with_actor)
+    tuner = CellSizeTuner(world)
+    pather = _Declared(writes=("path_cache",))
+    for system in (tuner, reasoning, pather):
+        sm.register(system)
+
+    for stage in sm.stages():
+        assert not (reasoning in stage and (tuner in stage or pather in stage))
+
+
+def test_conflicting_after_declarations_are_rejected():
+    class First:
+        def update(self):
+            pass
+
+    class Second:
+        after = (First,)
+
+        def update(self):
+            pass
+
+    First.after = (Second,)
+    sm = SystemsManager()
+    sm.register(First())
+    with pytest.raises(ValueError):
+        sm.register(Second())
+
+
+def test_independent_systems_overlap_on_the_pool():
+    world = _world()
+    barrier = threading.Barrier(2, timeout=5)
+    sm = world.systems_manager
+    sm.register(_Declared(writes=(Health,), run=lambda w: barrier.wait()))
+    sm.register(_Declared(writes=(Position,), run=lambda w: barrier.wait()))
+    # Sequential execution would break the barrier by timing out.
+    sm.update(world, 0)
+    sm.shutdown()
+
+
+def test_concurrent_commands_apply_in_registration_order():
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    target = em.create_entity()
+    order = []
+    cm.on_added(Health, lambda eid, comp: order.append("health"))
+    cm.on_added(Position, lambda eid, comp: order.append("position"))
+    later_done = threading.Event()
+
+    def first(w):
+        # Record only after the later-registered system has queued its op
+        assert later_done.wait(5)
+        w.command_buffer.add_component(target, Health(cur=1, max=1))
+
+    def second(w):
+        w.command_buffer.add_component(target, Position(1, 1))
+        later_done.set()
+
+    sm = world.systems_manager
+    sm.register(_Declared(writes=(Health,), run=first))
+    sm.register(_Declared(writes=(Position,), run=second))
+    sm.update(world, 0)
+    sm.shutdown()
+
+    assert order == ["health", "position"]
+    assert len(world.command_buffer) == 0
+
+
+def test_concurrent_creations_get_ids_in_registration_order():
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    later_done = threading.Event()
+
+    def first(w):
+        # Create only after the later-registered system has created its entity
+        assert later_done.wait(5)
+        buffer = w.command_buffer
+        eid = buffer.create_entity(Health(cur=1, max=1))
+        buffer.add_component(eid, Position(0, 0))
+
+    def second(w):
+        w.command_buffer.create_entity(Inventory(capacity=1))
+        later_done.set()
+
+    sm = world.systems_manager
+    sm.register(_Declared(writes=(Health, Position), run=first))
+    sm.register(_Declared(writes=(Inventory,), run=second))
+    sm.update(world, 0)
+    sm.shutdown()
+
+    (healthy, _hp, pos), = cm.query(Health, Position)
+    (stocked, _inv), = cm.query(Inventory)
+    assert healthy < stocked
+    assert pos == Position(0, 0)
+    assert em.has_entity(healthy) and em.has_entity(stocked)
+
+
+def test_worker_failures_propagate():
+    world = _world()
+
+    def boom(w):
+        raise KeyError("boom")
+
+    sm = world.systems_manager
+    sm.register(_Declared(writes=(Health,), run=boom))
+    sm.register(_Declared(writes=(Position,)))
+    with pytest.raises(KeyError):
+        sm.update(world, 0)
+    sm.shutdown()
@@ -0,0 +1,83 @@
+import random
+
+from agent_world.core.spatial.quadtree import Quadtree
+from agent_world.utils.benchmarks import spatial_index as spatial_benchmark
+
+
+def _within(positions, centre, radius):
+    cx, cy = centre
+    return {
+        ent
+        for ent, (x, y) in positions.items()
+        if (x - cx) ** 2 + (y - cy) ** 2 <= radius * radius
+    }
+
+
+def test_matches_brute_force_through_inserts_moves_and_removes():
+    rng = random.Random(3)
+    tree = Quadtree(1, capacity=4)
+    positions = {}
+    for ent in range(1, 301):
+        # Half of the entities crowd a 3x3 patch to force deep splits
+        if ent % 2:
+            pos = (rng.randrange(40, 43), rng.randrange(40, 43))
+        else:
+            pos = (rng.randrange(-50, 150), rng.randrange(-50, 150))
+        tree.insert(ent, pos)
+        positions[ent] = pos
+    assert tree.depth() > 3
+
+    for _ in range(5):
+        moves = []
+        for ent in rng.sample(sorted(positions), 100):
+            x, y = positions[ent]
+            pos = (x + rng.randint(-3, 3), y + rng.randint(-3, 3))
+            moves.append((ent, pos))
+            positions[ent] = pos
+        tree.move_many(moves)
+        for ent in rng.sample(sorted(positions), 20):
+            tree.remove(ent)
+            del positions[ent]
+
+        for centre in [(41, 41), (0, 0), (100, -20)] + [positions[e] for e in list(positions)[:5]]:
+            for radius in (0, 2, 15):
+                assert set(tree.query_radius(centre, radius)) == _within(positions, centre, radius)
+        assert set(tree.query_rect(35, 35, 45, 45)) == {
+            ent for ent, (x, y) in positions.items() if 35 <= x <= 45 and 35 <= y <= 45
+        }
+    assert len(tree) == len(positions)
+
+
+def test_removing_entities_merges_leaves():
+    tree = Quadtree(1, bounds=(0, 0, 64, 64), capacity=2)
+    for ent in range(1, 9):
+        tree.insert(ent, (ent, ent))
+    assert tree.depth() > 0
+
+    for ent in range(1, 9):
+        tree.remove(ent)
+
+    assert tree.depth() == 0
+    assert tree.query_rect(0, 0, 63, 63) == []
+
+
+def test_bulk_load_and_occupancy():
+    tree = Quadtree(1)
+    tree.rebuild([1, 2, 3], [5, 5, 70], [5, 5, -3])
+
+    assert set(tree.occupants((5, 5))) == {1, 2}
+    assert tree.is_occupied((5, 5), exclude=1)
+    assert not tree.is_occupied((70, -3), exclude=3)
+    assert tree.query_radius((70, -3), 1) == [3]
+
+
+def test_benchmark_runs_both_indexes():
+    rows = spatial_benchmark.run(entities=200, size=64, queries=20)
+
+    assert {(row["distribution"], row["index"]) for row in rows} == {
+        (dist, index)
+        for dist in ("uniform", "clustered")
+        for index in ("SpatialGrid", "Quadtree")
+    }
+    by_key = {(row["distribution"], row["index"]): row["found"] for row in rows}
+    assert by_key[("clustered", "SpatialGrid")] == by_key[("clustered", "Quadtree")]
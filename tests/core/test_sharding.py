@@ -0,0 +1,105 @@
+from functools import partial
+
+import yaml
+
+from agent_world.bootstrap import bootstrap
+from agent_world.core.components.health import Health
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.position import Position
+from agent_world.core.entity_manager import entity_index
+from agent_world.core.sharding import ShardLayout, ShardedWorld
+
+
+def _config(tmp_path, size=(20, 10)):
+    cfg = {"world": {"size": list(size)}, "llm": {"mode": "offline"}}
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump(cfg))
+    return path
+
+
+def _sharded(tmp_path, processes=False):
+    layout = ShardLayout(20, 10, cols=2, rows=1, halo=2)
+    return ShardedWorld(layout, partial(bootstrap, _config(tmp_path)), processes=processes)
+
+
+def test_layout_edges_follow_cells():
+    layout = ShardLayout(100, 50, cols=3, rows=2, cell_size=8, halo=1)
+
+    assert layout.count == 6
+    for shard in range(layout.count):
+        x0, y0, x1, y1 = layout.bounds(shard)
+        assert x0 % 8 == 0 and y0 % 8 == 0
+        assert layout.shard_at(x0, y0) == shard
+        assert layout.shard_at(x1 - 1, y1 - 1) == shard
+    assert list(layout.shards_at([0, 99, 0], [0, 0, 49])) == [0, 2, 3]
+    assert layout.neighbours(0) == [1, 3, 4]
+
+    ranges = [layout.index_range(shard) for shard in range(layout.count)]
+    for shard, (first, last) in enumerate(ranges):
+        assert layout.shard_of_index(first) == shard
+        assert layout.shard_of_index(last) == shard
+        if shard:
+            assert first == ranges[shard - 1][1] + 1
+
+
+def test_entity_migrates_across_border_with_same_id(tmp_path):
+    with _sharded(tmp_path) as world:
+        eid = world.spawn(
+            Position(8, 5),
+            Physics(mass=1.0, vx=1.0, vy=0.0, friction=1.0),
+            Health(cur=7, max=10),
+        )
+        assert entity_index(eid) <= world.layout.index_range(0)[1]
+
+        world.step(4)
+
+        snapshot = world.snapshot()
+        assert list(snapshot) == [eid]
+        assert snapshot[eid]["Position"]["x"] == 12
+        assert snapshot[eid]["Health"]["cur"] == 7
+        assert world.entity_count() == 1
+        right = world._shards[1].worker
+        assert right.world.entity_manager.has_entity(eid)
+        assert eid not in world._shards[0].worker.snapshot()
+
+
+def test_border_entities_appear_as_ghosts_next_door(tmp_path):
+    with _sharded(tmp_path) as world:
+        eid = world.spawn(Position(9, 5))
+
+        world.step(2)
+
+        right = world._shards[1].worker
+        assert eid in right.ghosts
+        assert right.world.spatial_index.query_radius((9, 5), 0) == [eid]
+        # ghosts are not owned by the shard holding them
+        assert eid not in right.snapshot()
+        assert list(world.snapshot()) == [eid]
+        assert world.entity_counts == [1, 0]
+
+
+def test_destroyed_migrant_slot_is_recycled_by_origin(tmp_path):
+    with _sharded(tmp_path) as world:
+        eid = world.spawn(Position(9, 5), Physics(mass=1.0, vx=1.0, vy=0.0, friction=1.0))
+        world.step(2)
+        right = world._shards[1].worker
+        assert right.world.entity_manager.has_entity(eid)
+
+        right.world.command_buffer.destroy_entity(eid)
+        world.step(2)
+
+        left = world._shards[0].worker.world.entity_manager
+        assert left.is_stale(eid)
+        reused = world.spawn(Position(1, 1))
+        assert entity_index(reused) == entity_index(eid)
+        assert reused != eid
+
+
+def test_shards_run_in_worker_processes(tmp_path):
+    with _sharded(tmp_path, processes=True) as world:
+        eid = world.spawn(Position(8, 5), Physics(mass=1.0, vx=1.0, vy=0.0, friction=1.0))
+        world.step(4)
+
+        snapshot = world.snapshot()
+        assert snapshot[eid]["Position"]["x"] == 12
+        assert world.entity_counts == [0, 1]
@@ -0,0 +1,80 @@
+from agent_world.core.world import World
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.position import Position
+from agent_world.core.components.health import Health
+from agent_world.persistence.serializer import world_to_dict, world_from_dict
+
+
+def _world():
+    world = World((5, 5))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    return world
+
+
+def test_managers_share_one_store():
+    world = _world()
+    em = world.entity_manager
+    cm = world.component_manager
+    eid = em.create_entity()
+    cm.add_component(eid, Position(1, 2))
+
+    assert em._entity_components is cm._components
+    assert em.components(eid)["Position"] is cm.get_component(eid, Position)
+
+
+def test_destroy_entity_clears_component_indexes():
+    world = _world()
+    em = world.entity_manager
+    cm = world.component_manager
+    eid = em.create_entity()
+    cm.add_component(eid, Position(0, 0))
+    cm.add_component(eid, Health(cur=1, max=1))
+
+    em.destroy_entity(eid)
+
+    assert cm.get_component(eid, Position) is None
+    assert list(cm.query(Position)) == []
+    assert cm.entities_with(Health) == set()
+
+
+def test_binding_keeps_components_added_before_linking():
+    world = World((5, 5))
+    cm = ComponentManager()
+    cm.add_component(1, Position(3, 3))
+    world.component_manager = cm
+    world.entity_manager = EntityManager()
+
+    assert world.entity_manager.all_entities[1]["Position"] == Position(3, 3)
+    assert [eid for eid, _ in cm.query(Position)] == [1]
+
+
+def test_snapshot_reflects_component_manager_changes():
+    world = _world()
+    eid = world.entity_manager.create_entity()
+    world.component_manager.add_component(eid, Position(4, 4))
+
+    data = world_to_dict(world)
+    assert "Position" in data["entities"][str(eid)]
+
+    loaded = world_from_dict(data)
+    em = loaded.entity_manager
+    cm = loaded.component_manager
+    assert em._entity_components is cm._components
+    assert cm.get_component(eid, Position) == Position(4, 4)
+
+
+def test_adding_to_a_destroyed_id_does_not_revive_it():
+    world = _world()
+    em = world.entity_manager
+    cm = world.component_manager
+    eid = em.create_entity()
+    em.destroy_entity(eid)
+
+    cm.add_component(eid, Position(1, 1))
+    cm.add_component(em.create_entity() + 1000, Health(cur=1, max=1))
+
+    assert not em.has_entity(eid) and em.is_stale(eid)
+    assert cm.get_component(eid, Position) is None
+    assert list(cm.query(Position)) == [] and cm.entities_with(Health) == set()
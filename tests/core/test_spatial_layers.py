@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+from agent_world.ai.llm.prompt_builder import _layers_of
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.ai_state import AIState
+from agent_world.core.components.health import Health
+from agent_world.core.components.position import Position
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.spatial.layers import AGENT_LAYER, ITEM_LAYER, LayerBinding, is_alive
+from agent_world.systems.combat.combat_system import CombatSystem
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.systems.interaction.pickup import Tag
+
+
+def _bound(cell_size=2):
+    index = SpatialGrid(cell_size)
+    cm = ComponentManager()
+    binding = LayerBinding(
+        index,
+        {Tag: lambda tag: tag.name, AIState: lambda _state: AGENT_LAYER},
+        layers=(ITEM_LAYER, AGENT_LAYER),
+        guards={AGENT_LAYER: is_alive},
+    )
+    binding.bind(cm)
+    return index, cm, binding
+
+
+def test_layer_queries_return_members_only():
+    index, cm, _binding = _bound()
+    index.insert(1, (0, 0))
+    index.insert(2, (1, 0))
+    index.insert(3, (5, 5))
+    cm.add_component(1, Tag("item"))
+    cm.add_component(2, Tag("tree"))
+    cm.add_component(3, Tag("item"))
+
+    assert index.has_layer(ITEM_LAYER) and index.has_layer("tree")
+    assert sorted(index.query_radius((0, 0), 10, layer=ITEM_LAYER)) == [1, 3]
+    assert index.query_radius((0, 0), 2, layer="tree") == [2]
+    assert index.query_radius((0, 0), 2, layer="missing") == []
+    assert set(index.occupants((0, 0), layer=ITEM_LAYER)) == {1}
+    assert not index.occupants((1, 0), layer=ITEM_LAYER)
+
+    offsets, ids = index.query_radius_many([(0, 0), (5, 5)], 1, layer=ITEM_LAYER)
+    assert list(offsets) == [0, 1, 2] and list(ids) == [1, 3]
+    nearest, _dist = index.k_nearest([(4, 4)], 1, layer=ITEM_LAYER)
+    assert nearest[0, 0] == 3
+
+
+def test_layers_follow_component_changes_and_moves():
+    index, cm, _binding = _bound()
+    cm.add_component(7, Tag("item"))  # joins before being placed
+    assert index.query_radius((3, 3), 0, layer=ITEM_LAYER) == []
+    index.insert(7, (3, 3))
+    assert index.query_radius((3, 3), 0, layer=ITEM_LAYER) == [7]
+
+    index.move(7, (8, 8))
+    index.move_many([(7, (9, 8))])
+    assert index.query_radius((9, 8), 0, layer=ITEM_LAYER) == [7]
+    assert index.query_radius((3, 3), 1, layer=ITEM_LAYER) == []
+
+    index.resize(4)
+    assert index.query_radius((9, 8), 1, layer=ITEM_LAYER) == [7]
+
+    # Leaving the map keeps membership; losing the tag drops it
+    index.remove(7)
+    assert index.query_radius((9, 8), 1, layer=ITEM_LAYER) == []
+    index.insert(7, (9, 8))
+    assert index.query_radius((9, 8), 1, layer=ITEM_LAYER) == [7]
+    cm.remove_component(7, Tag)
+    assert index.query_radius((9, 8), 1, layer=ITEM_LAYER) == []
+    assert index.query_radius((9, 8), 1) == [7]
+
+
+def test_rebind_seeds_layers_from_existing_components():
+    index, cm, binding = _bound()
+    loaded = ComponentManager()
+    loaded.add_component(4, AIState(personality="calm"))
+    loaded.add_component(5, Tag("item"))
+    binding.bind(loaded)
+    index.rebuild([4, 5], [1, 2], [1, 2])
+
+    assert index.query_radius((0, 0), 5, layer=AGENT_LAYER) == [4]
+    assert index.query_radius((0, 0), 5, layer=ITEM_LAYER) == [5]
+    # The old manager no longer drives the index
+    cm.add_component(4, Tag("item"))
+    assert index.query_radius((0, 0), 5, layer=ITEM_LAYER) == [5]
+
+
+def test_dead_agents_leave_the_agent_layer(tmp_path):
+    index, cm, binding = _bound()
+    em = EntityManager()
+    cm.bind_entity_manager(em)
+    attacker, victim = em.create_entity(), em.create_entity()
+    for eid, pos in ((attacker, (0, 0)), (victim, (1, 0))):
+        cm.add_component(eid, Position(*pos))
+        cm.add_component(eid, Health(cur=15, max=15))
+        cm.add_component(eid, AIState(personality="calm"))
+        index.insert(eid, pos)
+    world = SimpleNamespace(
+        entity_manager=em,
+        component_manager=cm,
+        spatial_index=index,
+        spatial_layers=binding,
+        persistent_event_log_path=tmp_path / "events.log",
+    )
+    assert sorted(index.query_radius((0, 0), 2, layer=AGENT_LAYER)) == [attacker, victim]
+
+    CombatSystem(world).attack(attacker, victim)
+    assert AGENT_LAYER in _layers_of(world, victim, cm)
+    CombatSystem(world).attack(attacker, victim)
+
+    assert index.query_radius((0, 0), 2, layer=AGENT_LAYER) == [attacker]
+    assert AGENT_LAYER not in _layers_of(world, victim, cm)
+
+    # A loaded save does not put dead agents back
+    binding.bind(cm)
+    assert index.query_radius((0, 0), 2, layer=AGENT_LAYER) == [attacker]
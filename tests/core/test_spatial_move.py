@@ -0,0 +1,41 @@
+import pytest
+
+from agent_world.core.spatial.quadtree import Quadtree
+from agent_world.core.spatial.spatial_index import SpatialGrid
+
+
+@pytest.mark.parametrize("index_cls", [SpatialGrid, Quadtree])
+def test_move_updates_queries(index_cls):
+    index = index_cls(4)
+    index.insert(1, (1, 1))
+    index.insert(2, (9, 9))
+
+    index.move(1, (2, 2))
+    index.move_many([(2, (10, 1)), (3, (5, 5))])
+
+    assert index.query_radius((2, 2), 0) == [1]
+    assert index.query_radius((1, 1), 0) == []
+    assert index.query_radius((10, 1), 0) == [2]
+    assert index.query_radius((9, 9), 0) == []
+    assert index.query_radius((5, 5), 0) == [3]
+
+
+def test_move_within_cell_leaves_cell_sets_alone():
+    grid = SpatialGrid(8)
+    grid.insert(1, (0, 0))
+    cell = grid._cells[(0, 0)]
+
+    grid.move_many([(1, (7, 7))])
+
+    assert grid._cells[(0, 0)] is cell
+    assert grid._entity_pos[1] == (7, 7)
+
+
+def test_move_to_new_cell_drops_empty_cell():
+    grid = SpatialGrid(4)
+    grid.insert(1, (0, 0))
+
+    grid.move(1, (4, 0))
+
+    assert (0, 0) not in grid._cells
+    assert grid._cells[(1, 0)] == {1}
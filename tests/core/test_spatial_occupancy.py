@@ -0,0 +1,42 @@
+from agent_world.core.spatial.spatial_index import SpatialGrid
+
+
+def test_occupancy_tracks_exact_tiles():
+    grid = SpatialGrid(4)
+    grid.insert(1, (1, 1))
+    grid.insert_many([(2, (1, 1)), (3, (2, 1))])
+
+    assert set(grid.occupants((1, 1))) == {1, 2}
+    assert set(grid.occupants((2, 1))) == {3}
+    assert not grid.occupants((3, 3))
+
+    grid.move(2, (3, 3))
+    grid.remove(3)
+
+    assert set(grid.occupants((1, 1))) == {1}
+    assert set(grid.occupants((3, 3))) == {2}
+    assert not grid.occupants((2, 1))
+    assert (2, 1) not in grid._occupancy
+
+
+def test_is_occupied_can_ignore_one_entity():
+    grid = SpatialGrid(1)
+    grid.insert(1, (0, 0))
+
+    assert grid.is_occupied((0, 0))
+    assert not grid.is_occupied((0, 0), exclude=1)
+    assert not grid.is_occupied((5, 5))
+
+    grid.insert(2, (0, 0))
+    assert grid.is_occupied((0, 0), exclude=1)
+
+
+def test_rebuild_resets_occupancy():
+    grid = SpatialGrid(2)
+    grid.insert(9, (4, 4))
+
+    grid.rebuild([1, 2], [0, 3], [0, 3])
+
+    assert not grid.occupants((4, 4))
+    assert set(grid.occupants((3, 3))) == {2}
+    assert grid.is_occupied((0, 0), exclude=2)
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from agent_world.bootstrap import bootstrap
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.systems.ability import ability_system
+from agent_world.systems.ability.ability_system import AbilitySystem
+from agent_world.systems.ability.cooldowns import CooldownManager
+
+
+class _Counter:
+    def __init__(self, interval=1, phase=None):
+        self.interval = interval
+        if phase is not None:
+            self.phase = phase
+        self.ticks = []
+
+    def update(self, tick):
+        self.ticks.append(tick)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_systems_run_on_their_interval_and_phase(workers):
+    sm = SystemsManager(max_workers=workers)
+    every = _Counter()
+    third = _Counter(interval=3, phase=1)
+    sm.register(every)
+    sm.register(third)
+    for tick in range(7):
+        sm.update(tick)
+    sm.shutdown()
+    assert every.ticks == list(range(7))
+    assert third.ticks == [1, 4]
+
+
+def test_unphased_systems_are_spread_across_ticks():
+    sm = SystemsManager()
+    a, b, c = _Counter(interval=2), _Counter(interval=2), _Counter(interval=4)
+    for system in (a, b, c):
+        sm.register(system)
+    rows = sm.schedule()
+    assert [row["phase"] for row in rows[:2]] == [0, 1]
+    for tick in range(8):
+        sm.update(tick)
+    # No tick runs both interval-2 systems
+    assert not set(a.ticks) & set(b.ticks)
+
+
+def test_set_schedule_overrides_declaration():
+    sm = SystemsManager()
+    system = _Counter(interval=5)
+    sm.register(system)
+    sm.set_schedule(system, 2, 1)
+    for tick in range(5):
+        sm.update(tick)
+    assert system.ticks == [1, 3]
+    with pytest.raises(ValueError):
+        sm.set_schedule(system, 0)
+
+
+def test_update_without_tick_uses_internal_counter():
+    sm = SystemsManager()
+
+    class NoArgs:
+        interval = 2
+        phase = 0
+        calls = 0
+
+        def update(self):
+            self.calls += 1
+
+    system = NoArgs()
+    sm.register(system)
+    for _ in range(4):
+        sm.update()
+    assert system.calls == 2
+
+
+def test_cooldowns_advance_by_elapsed_ticks():
+    cooldowns = CooldownManager()
+    cooldowns.set_cooldown(1, "Strike", 5)
+    cooldowns.tick(4)
+    assert not cooldowns.available(1, "Strike")
+    cooldowns.tick(4)
+    assert cooldowns.available(1, "Strike")
+
+
+class _Strike:
+    cooldown = 2
+
+    def can_use(self, caster_id, world, target_id=None):
+        return True
+
+    def execute(self, caster_id, world, target_id=None):
+        pass
+
+
+def test_ability_cooldowns_expire_between_rescans(tmp_path, monkeypatch):
+    monkeypatch.setattr(ability_system, "GLOBAL_ABILITY_EVENT_QUEUE", [])
+    world = SimpleNamespace(time_manager=SimpleNamespace(tick_counter=0))
+    abilities = AbilitySystem(world, search_dirs=[tmp_path])
+    abilities.abilities["Strike"] = _Strike()
+    sm = SystemsManager()
+    sm.register(abilities)
+    assert sm.schedule()[0]["interval"] == 5
+
+    used = []
+    for tick in range(7):
+        world.time_manager.tick_counter = tick
+        sm.update(world, tick)
+        used.append(abilities.use("Strike", 1))
+    assert used == [True, False, True, False, True, False, True]
+
+
+def test_system_intervals_come_from_config(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        yaml.dump(
+            {
+                "world": {"size": [10, 10], "system_intervals": {"TradingSystem": 2}},
+                "llm": {"mode": "offline"},
+            }
+        )
+    )
+    intervals = {
+        row["name"]: row["interval"] for row in bootstrap(config).systems_manager.schedule()
+    }
+
+    assert intervals["TradingSystem"] == 2
+    assert intervals["StealingSystem"] == 1
+    assert intervals["PerceptionSystem"] == 1
@@ -0,0 +1,87 @@
+import logging
+import time
+
+import pytest
+
+from agent_world.core.systems_manager import SystemsManager
+from agent_world.core.system_timing import SystemTimings
+from agent_world.core.world import World
+from agent_world.gui.renderer import Renderer
+from agent_world.utils.cli import commands
+
+
+class Fast:
+    def update(self, tick):
+        pass
+
+
+class Slow:
+    def update(self, tick):
+        time.sleep(0.002)
+
+
+def test_percentiles_come_from_the_ring_buffer():
+    timings = SystemTimings(history=4)
+    for seconds in (0.1, 0.001, 0.002, 0.003, 0.004):
+        timings.record("S", seconds)
+        timings.end_tick(0, 0.0)
+    (row,) = timings.report()
+    # The 0.1 sample fell out of the four-entry ring
+    assert row["samples"] == 4
+    assert row["max_ms"] == pytest.approx(4.0)
+    assert row["p50_ms"] == pytest.approx(2.5)
+    assert row["p99_ms"] <= row["max_ms"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_overrun_is_attributed_to_slowest_system(workers, caplog):
+    sm = SystemsManager(max_workers=workers)
+    sm.timings.budget = 0.001
+    sm.register(Fast())
+    sm.register(Slow())
+    with caplog.at_level(logging.WARNING):
+        sm.update(7)
+    sm.shutdown()
+
+    tick, total, name, seconds = sm.timings.overruns[-1]
+    assert (tick, name) == (7, "Slow")
+    assert total >= seconds >= 0.002
+    assert "Slow" in caplog.text
+    rows = {row["name"]: row for row in sm.timings.report()}
+    assert rows["Slow"]["overruns"] == 1
+    assert rows["Fast"]["overruns"] == 0
+    assert sm.timings.report()[0]["name"] == "Slow"
+
+
+def test_unregister_drops_samples():
+    sm = SystemsManager()
+    slow = Slow()
+    sm.register(slow)
+    sm.update(0)
+    sm.unregister(slow)
+    assert sm.timings.report() == []
+
+
+def test_systems_command_and_overlay(caplog):
+    world = World((5, 5))
+    world.systems_manager = SystemsManager()
+    world.systems_manager.register(Fast())
+    world.systems_manager.update(0)
+
+    with caplog.at_level(logging.INFO):
+        commands.execute("systems", [], world, {})
+    assert "Fast" in caplog.text
+
+    commands.execute("systems", ["overlay"], world, {})
+    assert world.systems_overlay is True
+
+    drawn = []
+
+    class FakeWindow:
+        def draw_text(self, text, x, y, colour=(255, 255, 255)):
+            drawn.append(text)
+
+    renderer = Renderer.__new__(Renderer)
+    renderer.window = FakeWindow()
+    renderer._render_system_timings(world)
+    assert drawn and drawn[0].startswith("Fast: ")
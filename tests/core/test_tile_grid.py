@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from agent_world.core.tile_grid import TileGrid
+from agent_world.core.world import World
+from agent_world.persistence.serializer import world_to_dict, world_from_dict
+from agent_world.systems.interaction.trading import _count_resources
+
+
+def test_spawn_resource_writes_kind_layer_and_shim():
+    world = World((6, 4))
+    world.spawn_resource("ore", 2, 1)
+
+    assert world.tiles.layer.dtype == np.uint8
+    assert world.tiles.kind_at(2, 1) == "ore"
+    assert world.tile_map[1][2] == {"kind": "ore", "glyph": "O", "colour": "yellow"}
+    assert world.tile_map[0][0] is None
+    assert len(world.tile_map) == 4 and len(world.tile_map[0]) == 6
+
+    with pytest.raises(ValueError):
+        world.spawn_resource("gold", 0, 0)
+
+
+def test_shim_assignment_registers_new_kinds():
+    grid = TileGrid(3, 3)
+    grid[2][1] = {"kind": "stone", "glyph": "S"}
+    grid[2][1] = {"kind": "stone", "glyph": "S"}
+    grid[0][0] = {"kind": "stone"}
+
+    assert grid.kinds() == [None, "stone"]
+    assert grid.tile_at(1, 2) == {"kind": "stone", "glyph": "S"}
+    grid[2][1] = None
+    assert grid.kind_at(1, 2) is None
+
+
+def test_count_resources_scans_the_layer():
+    world = World((10, 10))
+    for x, y in [(1, 1), (2, 2), (9, 9)]:
+        world.spawn_resource("wood", x, y)
+    world.spawn_resource("ore", 1, 2)
+
+    assert _count_resources(world, "wood", (1, 1), 1) == 2
+    assert _count_resources(world, "wood", (0, 0), 20) == 3
+    assert _count_resources(world, "stone", (0, 0), 20) == 0
+
+
+def test_tiles_roundtrip_and_legacy_rows_load():
+    world = World((5, 3))
+    world.spawn_resource("herbs", 4, 2)
+
+    data = world_to_dict(world)
+    assert isinstance(data["tile_map"]["layer"], str)
+    loaded = world_from_dict(data)
+    assert loaded.tiles.kind_at(4, 2) == "herbs"
+    assert np.array_equal(loaded.tiles.layer, world.tiles.layer)
+
+    legacy = dict(data)
+    rows = [[None] * 5 for _ in range(3)]
+    rows[1][0] = {"kind": "ore", "glyph": "O", "colour": "yellow"}
+    legacy["tile_map"] = rows
+    assert world_from_dict(legacy).tile_map[1][0]["kind"] == "ore"
+
+
+def test_sparse_legacy_map_accepts_every_resource_kind():
+    world = World((4, 4))
+    data = world_to_dict(world)
+    rows = [[None] * 4 for _ in range(4)]
+    rows[3][3] = {"kind": "wood", "glyph": "W", "colour": "green"}
+    data["tile_map"] = rows
+
+    loaded = world_from_dict(data)
+    loaded.spawn_resource("ore", 0, 0)
+    loaded.generate_resources(seed=1)
+    loaded.spawn_resource("herbs", 1, 0)
+
+    assert loaded.tiles.kind_at(1, 0) == "herbs"
+    assert set(loaded.tiles.kinds()) == {None, "wood", "ore", "herbs"}
+    assert world_from_dict(world_to_dict(loaded)).tiles.kind_at(1, 0) == "herbs"
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+from agent_world import run
+from agent_world.bootstrap import bootstrap
+from agent_world.run import populate, run_ticks
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _config(tmp_path, **world):
+    cfg = {"world": {"size": [10, 10], **world}, "llm": {"mode": "offline"}}
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.dump(cfg))
+    return path
+
+
+def test_run_ticks_advances_without_pacing(tmp_path):
+    world = bootstrap(config_path=_config(tmp_path))
+    world.persistent_event_log_path = tmp_path / "events.log"
+    # One tick per second would take minutes if the runner slept.
+    world.time_manager.tick_rate = 1.0
+    assert populate(world, 5) == 5
+
+    result = run_ticks(world, 50)
+
+    assert result["ticks"] == 50
+    assert world.time_manager.tick_counter == 50
+    assert result["seconds"] < 30
+    assert {row["name"] for row in result["systems"]} >= {"PhysicsSystem", "MovementSystem"}
+
+
+def test_headless_entry_point_never_imports_gui(tmp_path):
+    out = tmp_path / "result.json"
+    script = (
+        "import sys\n"
+        "from agent_world import run\n"
+        f"run.main(['--ticks', '20', '--headless', '--npcs', '3', "
+        f"'--config', {str(_config(tmp_path))!r}, '--json', {str(out)!r}])\n"
+        "loaded = [m for m in sys.modules if m == 'pygame' or m.startswith('agent_world.gui')]\n"
+        "assert not loaded, loaded\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert "ticks/s" in proc.stdout
+    assert json.loads(out.read_text())["ticks"] == 20
+
+
+def test_entry_point_shuts_the_worker_pool_down_when_setup_fails(tmp_path, monkeypatch):
+    built = []
+    monkeypatch.setattr(run, "bootstrap", lambda path: built.append(bootstrap(path)) or built[-1])
+
+    class _Independent:
+        reads = ()
+        writes = ()
+
+        def update(self):
+            pass
+
+    def _fail(world, npcs, seed=0):
+        sm = world.systems_manager
+        sm.register(_Independent())
+        sm.register(_Independent())
+        sm.update(world, 0)  # the two systems share a stage, starting the pool
+        assert sm._executor is not None
+        raise RuntimeError("spawn failed")
+
+    monkeypatch.setattr(run, "populate", _fail)
+    with pytest.raises(RuntimeError):
+        run.main(["--headless", "--npcs", "1", "--config", str(_config(tmp_path, system_workers=2))])
+
+    assert built[0].systems_manager._executor is None
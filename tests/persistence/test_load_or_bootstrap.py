@@ -0,0 +1,49 @@
+import yaml
+
+from agent_world.bootstrap import bootstrap, load_or_bootstrap
+from agent_world.core.components.health import Health
+from agent_world.core.components.physics import Physics
+from agent_world.core.components.position import Position
+from agent_world.persistence.save_load import save_world
+
+
+def test_loaded_save_populates_spatial_index(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(yaml.dump({"world": {"size": [20, 20]}, "llm": {"mode": "offline"}}))
+    world = bootstrap(config)
+    em, cm = world.entity_manager, world.component_manager
+    placed = {}
+    for i in range(5):
+        eid = em.create_entity()
+        cm.add_component(eid, Position(i, 2 * i))
+        cm.add_component(eid, Health(cur=5, max=5))
+        placed[eid] = (i, 2 * i)
+    save_path = tmp_path / "save.json.gz"
+    save_world(world, save_path)
+
+    loaded = load_or_bootstrap(save_path, config)
+
+    assert sorted(eid for eid, _pos in loaded.component_manager.query(Position)) == sorted(placed)
+    assert len(loaded.spatial_index) == 5
+    for eid, pos in placed.items():
+        assert loaded.spatial_index.query_radius(pos, 0) == [eid]
+        assert loaded.component_manager.get_component(eid, Position).x == pos[0]
+
+
+def test_loaded_managers_take_the_configured_limits(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        yaml.dump({"world": {"size": [20, 20], "max_entities": 200}, "llm": {"mode": "offline"}})
+    )
+    world = bootstrap(config)
+    eid = world.entity_manager.create_entity()
+    world.component_manager.add_component(eid, Physics(mass=1.0, vx=0.0, vy=0.0, friction=0.5))
+    save_path = tmp_path / "save.json.gz"
+    save_world(world, save_path)
+
+    loaded = load_or_bootstrap(save_path, config)
+
+    assert loaded.entity_manager.max_entities == 200
+    assert len(loaded.entity_manager._generations) == 201
+    assert len(loaded.component_manager.columns(Physics)._entities) >= 200
+    assert loaded.component_manager._capacity == 200
@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.ai_state import AIState
+from agent_world.systems.ai.behavior_tree_system import BehaviorTreeSystem
+
+
+class _EchoTree:
+    def run(self, agent_id, world):
+        return f"WAIT {agent_id}"
+
+
+def test_agents_are_processed_in_id_order():
+    cm = ComponentManager()
+    # Inserted so that set iteration order differs from id order
+    for eid in (9, 1, 17, 4):
+        cm.add_component(eid, AIState(personality="calm"))
+    world = SimpleNamespace(entity_manager=object(), component_manager=cm, raw_actions_with_actor=[])
+
+    BehaviorTreeSystem(world, default_tree=_EchoTree()).update(0)
+
+    assert [eid for eid, _action in world.raw_actions_with_actor] == [1, 4, 9, 17]
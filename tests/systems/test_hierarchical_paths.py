@@ -0,0 +1,94 @@
+import random
+
+import pytest
+import yaml
+
+from agent_world.bootstrap import bootstrap
+from agent_world.systems.movement import pathfinding
+from agent_world.systems.movement.hierarchical import HierarchicalPathfinder
+from agent_world.systems.movement.pathfinding import ObstacleGrid, grid_a_star
+
+
+@pytest.fixture(autouse=True)
+def _default_search():
+    yield
+    pathfinding.set_path_search(None)
+    pathfinding.clear_obstacles()
+
+
+def _random_grid(size, density, seed):
+    rng = random.Random(seed)
+    grid = ObstacleGrid(size, size)
+    grid.update((x, y) for x in range(size) for y in range(size) if rng.random() < density)
+    return grid, rng
+
+
+def _assert_walkable(path, start, goal, grid, size):
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+    assert all(tile not in grid and 0 <= tile[0] < size and 0 <= tile[1] < size for tile in path)
+
+
+def test_paths_are_valid_and_close_to_shortest():
+    grid, rng = _random_grid(64, 0.2, seed=1)
+    finder = HierarchicalPathfinder(grid, (64, 64), cluster_size=8)
+    free = [(x, y) for x in range(64) for y in range(64) if (x, y) not in grid]
+
+    for _ in range(30):
+        start, goal = rng.choice(free), rng.choice(free)
+        path = finder.path(start, goal)
+        best = grid_a_star(start, goal, grid)
+        if not best:
+            assert path == []
+            continue
+        _assert_walkable(path, start, goal, grid, 64)
+        assert len(path) <= 1.5 * len(best)
+
+
+def test_sealed_goal_fails_without_searching_the_map():
+    grid = ObstacleGrid(64, 64)
+    grid.update([(40, 41), (42, 41), (41, 40), (41, 42)])
+    finder = HierarchicalPathfinder(grid, (64, 64), cluster_size=8)
+
+    assert finder.path((0, 0), (41, 41)) == []
+    assert finder.path((41, 41), (0, 0)) == []
+    # Rejected before the abstract search touched any cluster
+    assert len(finder._dirty) == finder.cols * finder.rows
+
+
+def test_obstacle_changes_update_only_nearby_clusters():
+    grid = ObstacleGrid(64, 64)
+    finder = HierarchicalPathfinder(grid, (64, 64), cluster_size=8)
+    finder.precompute()
+    assert not finder._dirty
+
+    # A wall along row 20 cuts the map in two; only its cluster row and
+    # the rows either side need new distances
+    grid.update((x, 20) for x in range(64))
+    finder.sync()
+    assert finder._dirty == {(cx, cy) for cx in range(8) for cy in (1, 2, 3)}
+    assert finder.path((3, 3), (60, 60)) == []
+
+    grid.discard((30, 20))
+    path = finder.path((3, 3), (60, 60))
+    assert (30, 20) in path
+    _assert_walkable(path, (3, 3), (60, 60), grid, 64)
+
+
+def test_bootstrap_routes_a_star_through_the_hierarchy(tmp_path):
+    cfg = {
+        "world": {"size": [300, 300], "path_cluster_size": 16},
+        "llm": {"mode": "offline"},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.dump(cfg))
+
+    world = bootstrap(config_path)
+
+    assert world.path_hierarchy is not None
+    assert world.path_hierarchy.cluster_size == 16
+    assert pathfinding.PATH_CACHE.search == world.path_hierarchy.path
+    pathfinding.set_obstacles((150, y) for y in range(300) if y != 7)
+    path = pathfinding.a_star((140, 200), (160, 200))
+    assert (150, 7) in path
@@ -0,0 +1,107 @@
+import pytest
+
+from agent_world.systems.movement import pathfinding
+from agent_world.systems.movement.pathfinding import ObstacleGrid, PathCache, grid_a_star
+
+
+@pytest.fixture(autouse=True)
+def _no_global_obstacles():
+    pathfinding.clear_obstacles()
+    yield
+    pathfinding.clear_obstacles()
+
+
+def _walled_grid():
+    # Vertical wall at x == 5 across the map with a single gap at y == 8
+    grid = ObstacleGrid(12, 12)
+    grid.update((5, y) for y in range(12) if y != 8)
+    return grid
+
+
+def test_repeated_queries_hit_the_cache():
+    cache = PathCache(_walled_grid())
+
+    first = cache.path((0, 0), (10, 0))
+    second = cache.path((0, 0), (10, 0))
+
+    assert first == second
+    assert (5, 8) in first
+    assert (cache.misses, cache.hits) == (1, 1)
+    second.append((99, 99))  # callers get their own copy
+    assert cache.path((0, 0), (10, 0)) == first
+
+
+def test_starting_on_a_cached_route_shares_its_suffix():
+    cache = PathCache(_walled_grid())
+    route = cache.path((0, 0), (10, 0))
+
+    midway = route[7]
+    assert cache.path(midway, (10, 0)) == route[7:]
+    assert cache.shared == 1 and cache.misses == 1
+
+
+def test_changes_only_invalidate_affected_paths():
+    grid = _walled_grid()
+    cache = PathCache(grid)
+    through_gap = cache.path((0, 0), (10, 0))
+    same_side = cache.path((0, 0), (3, 11))
+
+    # Blocking a far tile off both routes keeps both cached
+    grid.add((9, 11))
+    cache.path((0, 0), (10, 0))
+    cache.path((0, 0), (3, 11))
+    assert cache.misses == 2
+
+    # Opening a gap far from (0,0)->(3,11) cannot shorten it
+    grid.discard((5, 1))
+    assert cache.path((0, 0), (3, 11)) == same_side
+    assert cache.misses == 2
+    # ...but it shortens the route through the wall
+    shorter = cache.path((0, 0), (10, 0))
+    assert cache.misses == 3
+    assert len(shorter) < len(through_gap)
+    assert shorter == grid_a_star((0, 0), (10, 0), grid)
+
+    # Blocking a tile on the cached route forces a new search
+    grid.add(shorter[4])
+    rerouted = cache.path((0, 0), (10, 0))
+    assert cache.misses == 4
+    assert shorter[4] not in rerouted
+
+
+def test_unreachable_goal_is_cached_until_something_opens():
+    grid = ObstacleGrid(6, 6)
+    grid.update([(1, 2), (3, 2), (2, 1), (2, 3)])
+    cache = PathCache(grid)
+
+    assert cache.path((0, 0), (2, 2)) == []
+    grid.add((0, 5))
+    assert cache.path((0, 0), (2, 2)) == []
+    assert cache.misses == 1
+    grid.discard((2, 1))
+    assert cache.path((0, 0), (2, 2))[-2:] == [(2, 1), (2, 2)]
+    assert cache.misses == 2
+
+
+def test_set_obstacles_only_records_real_changes():
+    pathfinding.set_obstacles([(1, 1), (2, 2)])
+    version = pathfinding.OBSTACLES.version
+
+    pathfinding.set_obstacles([(2, 2), (3, 3)])
+
+    changes = pathfinding.OBSTACLES.changes_since(version)
+    assert sorted(changes) == [((1, 1), False), ((3, 3), True)]
+    pathfinding.remove_obstacle((2, 2))
+    assert pathfinding.OBSTACLES.changes_since(version)[-1] == ((2, 2), False)
+    pathfinding.clear_obstacles()
+    assert pathfinding.OBSTACLES.changes_since(version) is None
+
+
+def test_a_star_facade_goes_through_the_global_cache():
+    pathfinding.set_obstacles([(1, 0)])
+    before = pathfinding.PATH_CACHE.hits
+
+    path = pathfinding.a_star((0, 0), (2, 0))
+
+    assert pathfinding.a_star((0, 0), (2, 0)) == path
+    assert pathfinding.PATH_CACHE.hits == before + 1
@@ -0,0 +1,126 @@
+import pytest
+
+from agent_world.systems.movement import pathfinding
+from agent_world.systems.movement.pathfinding import ObstacleGrid, PathCache, a_star, grid_a_star, jps
+from agent_world.utils.benchmarks.pathfinding import legacy_a_star, maze
+
+
+@pytest.fixture(autouse=True)
+def _no_global_obstacles():
+    pathfinding.clear_obstacles()
+    yield
+    pathfinding.clear_obstacles()
+
+
+def _assert_walkable(path, start, goal, obstacles):
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+    assert not any(tile in obstacles for tile in path)
+
+
+def test_obstacle_grid_behaves_like_a_set():
+    grid = ObstacleGrid(4, 4)
+    grid.update([(1, 1), (2, 3)])
+    grid.add((10, -2))  # off the map: kept, but never searched
+    grid.discard((7, 7))
+
+    assert (1, 1) in grid and (10, -2) in grid
+    assert (0, 0) not in grid and (50, 50) not in grid and "x" not in grid
+    assert sorted(grid) == [(1, 1), (2, 3), (10, -2)]
+    assert len(grid) == 3
+    grid.discard((1, 1))
+    assert (1, 1) not in grid and len(grid) == 2
+    grid.clear()
+    assert not grid and list(grid) == []
+
+
+def test_unsized_grid_routes_around_a_wall_on_its_edge():
+    grid = ObstacleGrid()
+    grid.update((2, y) for y in range(5))
+
+    for search in (jps, grid_a_star):
+        path = search((0, 2), (4, 2), grid)
+        _assert_walkable(path, (0, 2), (4, 2), grid)
+        # Around the top or bottom end of the wall, one row past it
+        assert len(path) - 1 == 10
+    assert jps((0, 0), (2, 2), grid) == []
+
+
+def test_searches_stay_on_a_sized_map():
+    grid = ObstacleGrid(5, 5)
+    grid.update((2, y) for y in range(5))
+    bitmap = len(grid._bits)
+
+    for search in (jps, grid_a_star):
+        assert search((0, 2), (4, 2), grid) == []
+        assert search((0, 2), (900, -900), grid) == []
+    grid.discard((2, 4))
+    for search in (jps, grid_a_star):
+        path = search((0, 2), (4, 2), grid)
+        _assert_walkable(path, (0, 2), (4, 2), grid)
+        assert all(0 <= x < 5 and 0 <= y < 5 for x, y in path)
+    assert len(grid._bits) == bitmap
+
+
+def test_resize_keeps_obstacles_and_invalidates_cached_paths():
+    grid = ObstacleGrid()
+    grid.update((2, y) for y in range(5))
+    cache = PathCache(grid)
+    assert len(cache.path((0, 2), (4, 2))) - 1 == 10
+
+    grid.resize((5, 5))
+
+    assert sorted(grid) == [(2, y) for y in range(5)]
+    assert cache.path((0, 2), (4, 2)) == []
+    grid.resize((5, 3))
+    assert len(grid) == 5 and (2, 4) in grid
+    assert cache.path((0, 0), (4, 2)) == []
+
+
+def test_misses_use_jps_only_on_maze_like_maps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pathfinding, "jps", lambda *args: calls.append("jps") or [])
+    monkeypatch.setattr(pathfinding, "grid_a_star", lambda *args: calls.append("a*") or [])
+    open_grid = ObstacleGrid(41, 41)
+    open_grid.add((20, 20))
+    maze_grid = ObstacleGrid(41, 41)
+    maze_grid.update(maze(41))
+
+    PathCache(open_grid).path((0, 0), (40, 40))
+    PathCache(maze_grid).path((1, 1), (39, 39))
+
+    assert calls == ["a*", "jps"]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_jps_matches_reference_lengths_on_a_maze(seed):
+    walls = maze(41, loops=0.1, seed=seed)
+    grid = ObstacleGrid(41, 41)
+    grid.update(walls)
+    free = sorted((x, y) for x in range(41) for y in range(41) if (x, y) not in walls)
+
+    for start, goal in zip(free[::37], free[::-41]):
+        reference = legacy_a_star(start, goal, walls)
+        for search in (jps, grid_a_star):
+            path = search(start, goal, grid)
+            assert len(path) == len(reference)
+            _assert_walkable(path, start, goal, walls)
+
+
+def test_a_star_facade_uses_global_obstacles():
+    assert a_star((0, 0), (2, 1)) == [(0, 0), (1, 0), (2, 0), (2, 1)]
+
+    pathfinding.set_obstacles([(1, 0)])
+    path = a_star((0, 0), (2, 0))
+    _assert_walkable(path, (0, 0), (2, 0), pathfinding.OBSTACLES)
+    assert len(path) == 5
+    assert a_star((0, 0), (1, 0)) == []
+
+
+def test_a_star_facade_has_no_path_off_the_map(monkeypatch):
+    monkeypatch.setattr(pathfinding, "OBSTACLES", ObstacleGrid(10, 10))
+
+    assert a_star((0, 0), (10, 0)) == []
+    assert a_star((-1, 3), (-1, 3)) == []
+    assert a_star((0, 0), (9, 0)) == [(x, 0) for x in range(10)]
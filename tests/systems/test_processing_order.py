@@ -0,0 +1,57 @@
+from agent_world.core.world import World
+from agent_world.core.entity_manager import EntityManager
+from agent_world.core.component_manager import ComponentManager
+from agent_world.core.components.inventory import Inventory
+from agent_world.core.components.position import Position
+from agent_world.core.spatial.spatial_index import SpatialGrid
+from agent_world.systems.interaction.trading import TradingSystem
+from agent_world.systems.movement import pathfinding
+from agent_world.systems.movement.movement_system import MovementSystem, Velocity
+
+
+def _world():
+    world = World((10, 10))
+    world.entity_manager = EntityManager()
+    world.component_manager = ComponentManager()
+    world.spatial_index = SpatialGrid(1)
+    return world
+
+
+def _reshuffle(cm, eid, component_cls):
+    # Swap-remove moves the last row into eid's slot; re-adding puts eid last
+    component = cm.remove_component(eid, component_cls)
+    cm.add_component(eid, component)
+
+
+def test_blocked_moves_are_resolved_in_id_order():
+    pathfinding.clear_obstacles()
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    occupant, first, second = (em.create_entity() for _ in range(3))
+    for eid, pos, vel in ((occupant, (5, 5), None), (first, (4, 5), (1, 0)), (second, (6, 5), (-1, 0))):
+        cm.add_component(eid, Position(*pos))
+        world.spatial_index.insert(eid, pos)
+        if vel is not None:
+            cm.add_component(eid, Velocity(*vel))
+    _reshuffle(cm, first, Velocity)
+    assert [eid for eid, _pos, _vel in cm.query(Position, Velocity)] == [second, first]
+
+    system = MovementSystem(world)
+    system.update(world, 0)
+
+    assert [event["entity"] for event in system.event_log] == [first, second]
+
+
+def test_lower_id_initiates_a_trade_whatever_the_row_order():
+    world = _world()
+    em, cm = world.entity_manager, world.component_manager
+    traders = [em.create_entity() for _ in range(3)]
+    for eid in traders:
+        cm.add_component(eid, Position(2, 2))
+        cm.add_component(eid, Inventory(capacity=4, items=[f"item{eid}"]))
+    _reshuffle(cm, traders[0], Inventory)
+
+    TradingSystem(world).update()
+
+    a, b, c = (cm.get_component(eid, Inventory).items for eid in traders)
+    assert (a, b, c) == ([f"item{traders[1]}"], [f"item{traders[0]}"], [f"item{traders[2]}"])